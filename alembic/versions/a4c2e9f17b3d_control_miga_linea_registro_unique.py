@@ -0,0 +1,64 @@
+"""control_miga_linea_registro_unique
+
+Revision ID: a4c2e9f17b3d
+Revises: 5ed8f628699f
+Create Date: 2026-02-03 10:12:41.208315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c2e9f17b3d'
+down_revision: Union[str, Sequence[str], None] = '5ed8f628699f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Si hay migas repetidas por (linea, registro) se conserva la más reciente;
+    # de lo contrario el índice único no se puede crear. Las demás se copian
+    # antes a control_miga_duplicadas para poder revisarlas o recuperarlas. La
+    # tabla sobrevive al downgrade: si ya existe, se agrega a ella.
+    if not sa.inspect(op.get_bind()).has_table('control_miga_duplicadas'):
+        op.create_table('control_miga_duplicadas',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('linea', sa.Integer(), nullable=False),
+        sa.Column('registro', sa.Integer(), nullable=False),
+        sa.Column('p_miga', sa.Float(), nullable=False),
+        sa.Column('porcentaje', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True)
+        )
+    op.execute(
+        """
+        WITH repetidas AS (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY linea, registro ORDER BY id DESC) AS orden
+            FROM control_miga
+        )
+        INSERT INTO control_miga_duplicadas (id, linea, registro, p_miga, porcentaje, created_at, updated_at)
+        SELECT id, linea, registro, p_miga, porcentaje, created_at, updated_at
+        FROM repetidas WHERE orden > 1
+        """
+    )
+    op.execute(
+        """
+        WITH repetidas AS (
+            SELECT id, ROW_NUMBER() OVER (PARTITION BY linea, registro ORDER BY id DESC) AS orden
+            FROM control_miga
+        )
+        DELETE FROM repetidas WHERE orden > 1
+        """
+    )
+    op.create_index('ux_control_miga_linea_registro', 'control_miga', ['linea', 'registro'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # No devuelve a control_miga las migas repetidas borradas en upgrade; siguen
+    # en control_miga_duplicadas, que se conserva para recuperarlas a mano.
+    op.drop_index('ux_control_miga_linea_registro', table_name='control_miga')
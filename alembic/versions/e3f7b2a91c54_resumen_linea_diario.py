@@ -0,0 +1,49 @@
+"""resumen_linea_diario
+
+Revision ID: e3f7b2a91c54
+Revises: a4c2e9f17b3d
+Create Date: 2026-10-18 23:30:12.514208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f7b2a91c54'
+down_revision: Union[str, Sequence[str], None] = 'a4c2e9f17b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Las tablas nacen vacías: el worker de resumen las llena desde el id 0 de
+    # cada tabla reg_linea_* en su primera pasada.
+    op.create_table(
+        'resumen_linea_diario',
+        sa.Column('linea', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('tipo', sa.String(length=10), nullable=False),
+        sa.Column('fecha_p', sa.Date(), nullable=False),
+        sa.Column('lote', sa.String(length=100), nullable=False),
+        sa.Column('registros', sa.Integer(), nullable=False),
+        sa.Column('peso_kg', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('linea', 'tipo', 'fecha_p', 'lote'),
+    )
+    op.create_table(
+        'resumen_linea_cursor',
+        sa.Column('linea', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('tipo', sa.String(length=10), nullable=False),
+        sa.Column('ultimo_id', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('linea', 'tipo'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('resumen_linea_cursor')
+    op.drop_table('resumen_linea_diario')
@@ -0,0 +1,74 @@
+"""
+Cliente ASGI mínimo para invocar la app en proceso, sin red ni dependencias
+extra. Mide desde que se entrega la petición hasta el último fragmento del
+body, es decir, incluye middlewares, validación, BD y serialización.
+"""
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+
+@dataclass
+class AsgiResponse:
+    status: int
+    body: bytes
+    elapsed: float
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class AsgiClient:
+    def __init__(self, app):
+        self.app = app
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        json_body: Optional[Any] = None,
+        params: Optional[dict] = None,
+    ) -> AsgiResponse:
+        body = json.dumps(json_body).encode() if json_body is not None else b""
+        headers = [(b"host", b"benchmark"), (b"content-length", str(len(body)).encode())]
+        if json_body is not None:
+            headers.append((b"content-type", b"application/json"))
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": urlencode(params or {}).encode(),
+            "root_path": "",
+            "headers": headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("benchmark", 80),
+        }
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return {"type": "http.disconnect"}
+
+        status = 500
+        chunks = []
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        start = time.perf_counter()
+        await self.app(scope, receive, send)
+        return AsgiResponse(status=status, body=b"".join(chunks), elapsed=time.perf_counter() - start)
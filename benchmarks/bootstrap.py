@@ -0,0 +1,94 @@
+"""
+Prepara el entorno de benchmarks: apunta `engine_main`/`engine_auth` a SQLite
+mediante variables de entorno y carga la aplicación.
+
+Debe importarse antes que cualquier módulo de `src`, porque `Settings` y los
+engines se crean al importar `src.shared.config`/`src.shared.database`.
+
+Variables:
+    BENCH_DB=memory        -> ambas bases en memoria (StaticPool)
+    BENCH_DB=<directorio>  -> main.db y auth.db en ese directorio
+                              (por defecto benchmarks/.data)
+"""
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DATA_DIR = ROOT / "benchmarks" / ".data"
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def _sqlite_urls() -> tuple[str, str]:
+    target = os.environ.get("BENCH_DB", str(DEFAULT_DATA_DIR))
+    if target == "memory":
+        return "sqlite://", "sqlite://"
+    data_dir = Path(target)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return f"sqlite:///{data_dir / 'main.db'}", f"sqlite:///{data_dir / 'auth.db'}"
+
+
+_main_url, _auth_url = _sqlite_urls()
+os.environ["DATABASE_URL"] = _main_url
+os.environ["AUTH_DATABASE_URL"] = _auth_url
+
+# Campos obligatorios de Settings que no se usan con URLs explícitas
+for _key in ("DB_HOST", "DB_NAME", "DB_USER", "DB_PASSWORD", "DB_DRIVER", "DB_TRUST_CERTIFICATE",
+             "AUTH_DB_HOST", "AUTH_DB_NAME", "AUTH_DB_USER", "AUTH_DB_PASSWORD", "AUTH_DB_DRIVER",
+             "AUTH_DB_TRUST_CERTIFICATE", "JWT_SECRET_KEY"):
+    os.environ.setdefault(_key, "benchmark")
+for _key in ("DB_PORT", "AUTH_DB_PORT", "JWT_EXPIRATION_MINUTES"):
+    os.environ.setdefault(_key, "0")
+# Los benchmarks miden la ruta caliente, no los logs de instrumentación
+os.environ.setdefault("SQL_SLOW_QUERY_MS", "60000")
+os.environ.setdefault("SQL_QUERY_BUDGET", "100000")
+os.environ.setdefault("SQL_NPLUSONE_THRESHOLD", "100000")
+
+from sqlalchemy import BigInteger  # noqa: E402
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
+
+
+@compiles(BigInteger, "sqlite")
+def _bigint_as_integer(type_, compiler, **kw):
+    # En SQLite solo INTEGER PRIMARY KEY es alias de rowid (autoincremental)
+    return "INTEGER"
+
+
+from src.shared.database import engine_main, engine_auth, BaseMain, BaseAuth  # noqa: E402
+
+# config.py carga .env con override=True: nunca correr contra una BD real
+for _engine in (engine_main, engine_auth):
+    if _engine.url.get_backend_name() != "sqlite":
+        raise RuntimeError(
+            f"Los benchmarks solo corren sobre SQLite y el engine apunta a {_engine.url!r}. "
+            "Revise DATABASE_URL/AUTH_DATABASE_URL en los archivos .env."
+        )
+
+
+def create_schema(drop: bool = False) -> None:
+    """Crea (o recrea) todas las tablas de ambas bases."""
+    import src.shared.models  # noqa: F401  registra los modelos
+    from src.modules.administracion_service.src.infrastructure.db import models as _admin_models  # noqa: F401
+
+    if drop:
+        BaseMain.metadata.drop_all(engine_main)
+        BaseAuth.metadata.drop_all(engine_auth)
+    BaseMain.metadata.create_all(engine_main)
+    BaseAuth.metadata.create_all(engine_auth)
+
+
+def load_app():
+    """Importa la app FastAPI con la autenticación reemplazada por un usuario fijo."""
+    from src.main import app
+    from src.shared.config import settings
+    from src.shared.security import get_current_user_data
+
+    app.dependency_overrides[get_current_user_data] = lambda: {
+        "user_id": 1,
+        "username": "benchmark",
+        "lineas": [str(n) for n in settings.lineas_produccion],
+        "turnos": [1, 2, 3],
+    }
+    return app
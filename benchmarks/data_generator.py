@@ -0,0 +1,328 @@
+"""
+Generador de datos sintéticos de producción para los benchmarks.
+
+Llena las seis tablas reg_linea_*_entrad y las seis reg_linea_*_salid, además
+de control_miga, control_tara, auditoria_logs, usuarios/sesiones_usuario,
+fm_gestion_operarios, fm_movimientos_operarios, fm_especies y
+fm_detalle_produccion, con volúmenes y distribuciones parecidas a las de
+planta: varios lotes por día y línea, parrillas numeradas correlativamente,
+pesos con ruido normal y algunos pesajes erróneos (tara sin descontar, doble
+pesaje).
+
+Uso:
+    python -m benchmarks.data_generator --weighings-per-table 500000 --days 90
+"""
+import argparse
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterable, Iterator, List
+
+from benchmarks.bootstrap import create_schema, engine_main, engine_auth
+
+from sqlalchemy import Table
+
+from src.modules.administracion_service.src.infrastructure.db.models import DetalleProduccionORM, EspeciesORM
+from src.modules.auth_service.src.infrastructure.db.models import AuditoriaLogORM, SesionUsuario, Usuario
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.models import (
+    ControlMigaOrm, ControlTaraOrm, LINEAS_ENTRADA_ORM, LINEAS_SALIDA_ORM,
+)
+from src.modules.management_service.src.infrastructure.db.models import OperariosORM, WorkerMovementORM
+from src.shared.config import settings
+
+ENTRADA_TABLES = {linea: model.__table__ for linea, model in LINEAS_ENTRADA_ORM.items()}
+SALIDA_TABLES = {linea: model.__table__ for linea, model in LINEAS_SALIDA_ORM.items()}
+LINEAS = tuple(settings.lineas_produccion)
+
+CHUNK_SIZE = 20_000
+START_DATE = date(2025, 1, 6)
+
+
+@dataclass
+class GenerationScale:
+    weighings_per_table: int = 50_000
+    days: int = 60
+    lotes_per_day: int = 4
+    operators: int = 240
+    miga_ratio: float = 0.10
+    audit_logs: int = 100_000
+    sessions: int = 20_000
+    movements: int = 50_000
+    anomaly_ratio: float = 0.002
+    seed: int = 20250106
+
+
+def _chunks(rows: Iterable[dict], size: int = CHUNK_SIZE) -> Iterator[List[dict]]:
+    chunk: List[dict] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _insert(engine, table: Table, rows: Iterable[dict]) -> int:
+    total = 0
+    with engine.begin() as conn:
+        for chunk in _chunks(rows):
+            conn.execute(table.insert(), chunk)
+            total += len(chunk)
+    return total
+
+
+def lote_code(fecha_p: date, linea: int, index: int) -> str:
+    return f"{fecha_p:%y%m%d}{linea}{index + 1:02d}"
+
+
+def operator_code(index: int) -> str:
+    return f"OP{index + 1:04d}"
+
+
+def _daily_plan(scale: GenerationScale) -> Iterator[tuple[date, int]]:
+    """(fecha_p, pesajes del día) repartiendo el volumen total entre los días."""
+    per_day, extra = divmod(scale.weighings_per_table, scale.days)
+    for day in range(scale.days):
+        yield START_DATE + timedelta(days=day), per_day + (1 if day < extra else 0)
+
+
+def _weight(rng: random.Random, mean: float, sd: float, scale: GenerationScale) -> float:
+    value = rng.gauss(mean, sd)
+    roll = rng.random()
+    if roll < scale.anomaly_ratio / 2:
+        value += 2.4  # tara sin descontar
+    elif roll < scale.anomaly_ratio:
+        value *= 2  # doble pesaje
+    return round(max(value, 0.1), 3)
+
+
+def entrada_rows(linea: int, scale: GenerationScale) -> Iterator[dict]:
+    rng = random.Random(scale.seed + linea)
+    for fecha_p, count in _daily_plan(scale):
+        shift_start = datetime.combine(fecha_p, datetime.min.time()) + timedelta(hours=6)
+        seconds_per_tray = (20 * 3600) / max(count, 1)
+        for i in range(count):
+            instante = shift_start + timedelta(seconds=i * seconds_per_tray)
+            lote_index = min(i * scale.lotes_per_day // max(count, 1), scale.lotes_per_day - 1)
+            yield {
+                "fecha_p": fecha_p,
+                "fecha": instante,
+                "peso_kg": _weight(rng, 28.0, 2.5, scale),
+                "turno": 1 + min(i * 3 // max(count, 1), 2),
+                "codigo_secuencia": str(i + 1),
+                "codigo_parrilla": str(i + 1),
+                "p_lote": lote_code(fecha_p, linea, lote_index),
+                "hora_inicio": instante.time().replace(microsecond=0),
+                "guid": str(uuid.UUID(int=rng.getrandbits(128))),
+            }
+
+
+def salida_rows(linea: int, scale: GenerationScale) -> Iterator[dict]:
+    rng = random.Random(scale.seed * 7 + linea)
+    operators_per_line = max(scale.operators // len(LINEAS), 1)
+    first_operator = LINEAS.index(linea) * operators_per_line
+    for fecha_p, count in _daily_plan(scale):
+        shift_start = datetime.combine(fecha_p, datetime.min.time()) + timedelta(hours=8)
+        seconds_per_tray = (20 * 3600) / max(count, 1)
+        for i in range(count):
+            instante = shift_start + timedelta(seconds=i * seconds_per_tray)
+            lote_index = min(i * scale.lotes_per_day // max(count, 1), scale.lotes_per_day - 1)
+            yield {
+                "fecha_p": fecha_p,
+                "fecha": instante,
+                "peso_kg": _weight(rng, 13.5, 1.6, scale),
+                "codigo_bastidor": str(rng.randint(1, 400)),
+                "p_lote": lote_code(fecha_p, linea, lote_index),
+                "codigo_parrilla": str(i + 1),
+                "codigo_obrero": operator_code(first_operator + rng.randrange(operators_per_line)),
+                "guid": str(uuid.UUID(int=rng.getrandbits(128))),
+            }
+
+
+def miga_rows(scale: GenerationScale) -> Iterator[dict]:
+    rng = random.Random(scale.seed + 100)
+    # Los ids de salida son 1..N porque las tablas se recrean antes de insertar
+    for linea in LINEAS:
+        for registro in range(1, scale.weighings_per_table + 1):
+            if rng.random() >= scale.miga_ratio:
+                continue
+            p_miga = round(rng.uniform(0.4, 2.0), 3)
+            yield {
+                "linea": linea,
+                "registro": registro,
+                "p_miga": p_miga,
+                "porcentaje": round(rng.uniform(0.85, 0.97), 3),
+                "created_at": datetime.combine(START_DATE, datetime.min.time()),
+                "updated_at": None,
+            }
+
+
+def audit_rows(scale: GenerationScale) -> Iterator[dict]:
+    rng = random.Random(scale.seed + 200)
+    user_snapshot = {"id_usuario": 1, "username": "benchmark", "is_active": True}
+    base = datetime.combine(START_DATE, datetime.min.time())
+    for i in range(scale.audit_logs):
+        linea = rng.choice(LINEAS)
+        peso = round(rng.gauss(13.5, 1.6), 3)
+        yield {
+            "modelo": f"reg_linea_{settings.lineas_produccion[linea]}_salida",
+            "entidad_id": str(rng.randint(1, scale.weighings_per_table)),
+            "accion": rng.choice(("UPDATE", "UPDATE", "UPDATE", "DELETE", "CREATE")),
+            "datos_anteriores": {"peso_kg": peso, "p_lote": "250106101"},
+            "datos_nuevos": {"peso_kg": round(peso - 0.4, 3), "p_lote": "250106101"},
+            "ejecutado_por_id": 1,
+            "ejecutado_por_json": user_snapshot,
+            "fecha": base + timedelta(seconds=i * (scale.days * 86400 / max(scale.audit_logs, 1))),
+        }
+
+
+def session_rows(scale: GenerationScale) -> Iterator[dict]:
+    base = datetime.combine(START_DATE, datetime.min.time())
+    for i in range(scale.sessions):
+        inicio = base + timedelta(minutes=i * 5)
+        yield {
+            "id_usuario": 1,
+            "token": f"benchmark-token-{i:08d}",
+            "refresh_token": None,
+            "fecha_inicio": inicio,
+            "fecha_expiracion": inicio + timedelta(hours=8),
+            "ip_address": "10.0.0.1",
+            "user_agent": "benchmark",
+            "created_at": inicio,
+            "updated_at": inicio,
+            "is_active": i >= scale.sessions - 50,
+        }
+
+
+def operator_rows(scale: GenerationScale) -> Iterator[dict]:
+    operators_per_line = max(scale.operators // len(LINEAS), 1)
+    for i in range(scale.operators):
+        yield {
+            "OPER_CODIGO": operator_code(i),
+            "OPER_ESTADO": "ACTIVO",
+            "OPER_FECCRE": datetime.combine(START_DATE, datetime.min.time()),
+            "OPER_TURNO": 1 + i % 3,
+            "OPER_AREA": 1 + i % 4,
+            "OPER_LINEA": LINEAS[min(i // operators_per_line, len(LINEAS) - 1)],
+        }
+
+
+def movement_rows(scale: GenerationScale) -> Iterator[dict]:
+    rng = random.Random(scale.seed + 300)
+    for i in range(scale.movements):
+        fecha_p = START_DATE + timedelta(days=rng.randrange(scale.days))
+        yield {
+            "linea": str(rng.choice(LINEAS)),
+            "fecha_p": fecha_p,
+            "tipo_movimiento": rng.choice(("ENTRADA", "SALIDA")),
+            "motivo": rng.choice(("Cambio de línea", "Permiso", "Baño", "Capacitación")),
+            "codigo_operario": operator_code(rng.randrange(scale.operators)),
+            "destino": None,
+            "hora": datetime.combine(fecha_p, datetime.min.time()) + timedelta(minutes=rng.randrange(1200)),
+            "observacion": None,
+        }
+
+
+def especie_rows() -> Iterator[dict]:
+    for i, (nombre, rendimiento, merma) in enumerate(
+        (("SKIPJACK", 0.46, 0.24), ("YELLOWFIN", 0.50, 0.22), ("BIGEYE", 0.49, 0.23))
+    ):
+        yield {
+            "especie_nombre": nombre,
+            "especie_familia": "ATUN",
+            "especie_rendimiento": rendimiento,
+            "especie_merm_coccion": merma,
+            "especie_rend_normal": rendimiento,
+        }
+
+
+def detalle_produccion_rows(scale: GenerationScale) -> Iterator[dict]:
+    rng = random.Random(scale.seed + 400)
+    for fecha_p, _ in _daily_plan(scale):
+        for linea in LINEAS:
+            for lote_index in range(scale.lotes_per_day):
+                yield {
+                    "DPRO_FECPROD": fecha_p,
+                    "DPRO_LOTE": lote_code(fecha_p, linea, lote_index),
+                    "DPRO_PMIGA": round(rng.uniform(20, 60), 2),
+                    "DPRO_PPANZA": round(rng.uniform(30, 90), 2),
+                    "DPRO_PDESPERDICIO": round(rng.uniform(80, 200), 2),
+                    "DPRO_LINEA": linea,
+                    "DPRO_TURNOX": 1,
+                }
+
+
+def generate(scale: GenerationScale, log: Callable[[str], None] = print) -> dict:
+    """Recrea el esquema y carga todos los datos sintéticos. Devuelve los conteos."""
+    create_schema(drop=True)
+    counts = {}
+
+    def load(label: str, engine, table: Table, rows: Iterable[dict]) -> None:
+        start = time.perf_counter()
+        counts[label] = _insert(engine, table, rows)
+        log(f"  {label:<28} {counts[label]:>10,} filas  {time.perf_counter() - start:6.1f}s")
+
+    now = datetime.combine(START_DATE, datetime.min.time())
+    load("usuarios", engine_auth, Usuario.__table__, [{
+        "id_usuario": 1, "username": "benchmark", "password_hash": "x", "is_superuser": True,
+        "created_at": now, "updated_at": now, "is_active": True,
+    }])
+    load("control_tara", engine_auth, ControlTaraOrm.__table__, [
+        {"nombre": "Bandeja", "descripcion": None, "peso_kg": 1.2, "is_active": True, "is_principal": True},
+        {"nombre": "Canasta", "descripcion": None, "peso_kg": 2.4, "is_active": True, "is_principal": False},
+    ])
+    for linea in LINEAS:
+        load(ENTRADA_TABLES[linea].name, engine_main, ENTRADA_TABLES[linea], entrada_rows(linea, scale))
+        load(SALIDA_TABLES[linea].name, engine_main, SALIDA_TABLES[linea], salida_rows(linea, scale))
+    load("control_miga", engine_auth, ControlMigaOrm.__table__, miga_rows(scale))
+    load("auditoria_logs", engine_auth, AuditoriaLogORM.__table__, audit_rows(scale))
+    load("sesiones_usuario", engine_auth, SesionUsuario.__table__, session_rows(scale))
+    load("fm_gestion_operarios", engine_main, OperariosORM.__table__, operator_rows(scale))
+    load("fm_movimientos_operarios", engine_main, WorkerMovementORM.__table__, movement_rows(scale))
+    load("fm_especies", engine_main, EspeciesORM.__table__, especie_rows())
+    load("fm_detalle_produccion", engine_main, DetalleProduccionORM.__table__, detalle_produccion_rows(scale))
+
+    for engine in (engine_main, engine_auth):
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+    return counts
+
+
+def scale_from_args(args: argparse.Namespace) -> GenerationScale:
+    return GenerationScale(
+        weighings_per_table=args.weighings_per_table,
+        days=args.days,
+        audit_logs=args.audit_logs,
+        sessions=args.sessions,
+        movements=args.movements,
+        seed=args.seed,
+    )
+
+
+def add_scale_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = GenerationScale()
+    parser.add_argument("--weighings-per-table", type=int, default=defaults.weighings_per_table,
+                        help="Pesajes por cada una de las 12 tablas reg_linea_*")
+    parser.add_argument("--days", type=int, default=defaults.days)
+    parser.add_argument("--audit-logs", type=int, default=defaults.audit_logs)
+    parser.add_argument("--sessions", type=int, default=defaults.sessions)
+    parser.add_argument("--movements", type=int, default=defaults.movements)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos de producción en SQLite.")
+    add_scale_arguments(parser)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    print(f"Generando datos en {engine_main.url} / {engine_auth.url}")
+    counts = generate(scale_from_args(args))
+    print(f"Total: {sum(counts.values()):,} filas en {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Microbenchmark de memoria y throughput de las entidades de dominio.
+
+Lee N pesajes de la línea 1 con `LineasSalidaRepository.get_all_by_filters`
+(entidad `@dataclass(slots=True)` construida posicionalmente) y con la misma
+sentencia mapeada a copias de LineasSalida como dataclass común (la entidad
+anterior) y como `slots=True, frozen=True`. Reporta filas/s, la memoria
+retenida por el listado (tracemalloc) y el tamaño por instancia.
+
+El caso congelado muestra por qué las entidades de línea no son frozen: el
+`__init__` de un dataclass congelado asigna cada campo con
+`object.__setattr__`, lo que en listados grandes cuesta más de lo que ahorra.
+
+Uso:
+    python -m benchmarks.entities --rows 100000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import astuple, fields, make_dataclass
+
+os.environ.setdefault("BENCH_DB", "memory")
+
+from benchmarks.bootstrap import create_schema, engine_main  # noqa: E402
+from benchmarks import data_generator  # noqa: E402
+
+from src.modules.lineas_entrada_salida_service.src.domain.entities import LineasSalida  # noqa: E402
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_shared import LineasFilters  # noqa: E402
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.models import LINEAS_SALIDA_ORM  # noqa: E402
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.repositories.lineas_salida_repository import (  # noqa: E402
+    LineasSalidaRepository, _STATEMENTS,
+)
+from src.shared.database import SessionLocalMain  # noqa: E402
+
+
+def _variant(name: str, **options):
+    return make_dataclass(name, [(f.name, f.type) for f in fields(LineasSalida)], **options)
+
+
+LineasSalidaDict = _variant("LineasSalidaDict")
+LineasSalidaFrozen = _variant("LineasSalidaFrozen", slots=True, frozen=True)
+
+
+def read_variant(db, filters: LineasFilters, entity):
+    stmt, params = _STATEMENTS.all(1, filters)
+    return [entity(*row) for row in db.execute(stmt, params)]
+
+
+def read_repository(db, filters: LineasFilters):
+    return LineasSalidaRepository(db).get_all_by_filters(filters, 1)
+
+
+def measure_time(fn, repeat: int) -> tuple[float, int]:
+    best, count = float("inf"), 0
+    for _ in range(repeat):
+        db = SessionLocalMain()
+        try:
+            start = time.perf_counter()
+            count = len(fn(db))
+            best = min(best, time.perf_counter() - start)
+        finally:
+            db.close()
+    return best, count
+
+
+def measure_memory(fn) -> tuple[int, int]:
+    """Devuelve (bytes retenidos por el resultado, pico durante la lectura)."""
+    db = SessionLocalMain()
+    try:
+        gc.collect()
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        result = fn(db)
+        after, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+        return after - before, peak - before
+    finally:
+        db.close()
+
+
+def instance_size(obj) -> int:
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memoria y throughput de entidades con y sin slots.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    create_schema(drop=True)
+    scale = data_generator.GenerationScale(weighings_per_table=args.rows, days=1)
+    data_generator._insert(engine_main, LINEAS_SALIDA_ORM[1].__table__, data_generator.salida_rows(1, scale))
+    filters = LineasFilters(fecha=data_generator.START_DATE)
+
+    cases = {
+        "dataclass": lambda db: read_variant(db, filters, LineasSalidaDict),
+        "slots": lambda db: read_repository(db, filters),
+        "slots+frozen": lambda db: read_variant(db, filters, LineasSalidaFrozen),
+    }
+    results = {}
+    for name, fn in cases.items():
+        elapsed, count = measure_time(fn, args.repeat)
+        retained, peak = measure_memory(fn)
+        results[name] = (count / elapsed, retained)
+        print(f"{name:<13} {count:>9,} filas  {count / elapsed:>12,.0f} filas/s  "
+              f"retenido {retained / 2**20:7.1f} MiB  pico {peak / 2**20:7.1f} MiB")
+
+    db = SessionLocalMain()
+    try:
+        sample = read_repository(db, filters)[0]
+    finally:
+        db.close()
+    plain = LineasSalidaDict(*astuple(sample))
+    print(f"\ntamaño por instancia (sin los valores): dataclass {instance_size(plain)} B, slots {instance_size(sample)} B")
+    base_rate, base_memory = results["dataclass"]
+    for name in ("slots", "slots+frozen"):
+        rate, memory = results[name]
+        print(f"{name:<13} throughput {rate / base_rate:5.2f}x  memoria {memory / base_memory:5.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Microbenchmark de la serialización de respuestas.
+
+Compara, para una página de N entidades LineasSalida, el camino anterior
+(`model_validate(...).model_dump(mode="json")` por fila, `convert_non_serializable`
+sobre el sobre completo y `JSONResponse` con el json de la stdlib) contra
+`validate_many` + `success_response` (una sola serialización con pydantic_core).
+
+Uso:
+    python -m benchmarks.json_response --rows 1000 --repeat 200
+"""
+import argparse
+import json
+import random
+import timeit
+from datetime import date, datetime, timedelta
+
+from benchmarks.bootstrap import ROOT  # noqa: F401  agrega la raíz al sys.path
+
+from fastapi.responses import JSONResponse
+
+from src.modules.lineas_entrada_salida_service.src.domain.entities import LineasSalida
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_salida import LineasSalidaResponse
+from src.shared.common.responses import convert_non_serializable, success_response, validate_many
+
+
+def sample_rows(count: int) -> list:
+    rng = random.Random(1)
+    base = datetime(2025, 1, 6, 6)
+    return [
+        LineasSalida(
+            id=i,
+            fecha_p=date(2025, 1, 6),
+            fecha=base + timedelta(seconds=i * 30),
+            peso_kg=round(rng.gauss(13.5, 1.6), 3),
+            codigo_bastidor=str(rng.randint(1, 400)),
+            p_lote="250106101",
+            codigo_parrilla=str(i),
+            codigo_obrero=f"OP{rng.randint(1, 240):04d}",
+            guid=f"{rng.getrandbits(128):032x}",
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def _envelope(data) -> dict:
+    return {"total_records": len(data), "total_pages": 1, "page": 1, "page_size": len(data), "data": data}
+
+
+def legacy_path(rows: list) -> bytes:
+    data = [LineasSalidaResponse.model_validate(d).model_dump(mode="json") for d in rows]
+    cleaned = convert_non_serializable(_envelope(data))
+    return JSONResponse(content={"success": True, "message": "ok", "data": cleaned}).body
+
+
+def fast_path(rows: list) -> bytes:
+    return success_response(data=_envelope(validate_many(LineasSalidaResponse, rows)), message="ok").body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Microbenchmark de serialización de respuestas.")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = sample_rows(args.rows)
+    legacy, fast = legacy_path(rows), fast_path(rows)
+    if json.loads(legacy) != json.loads(fast):
+        raise SystemExit("Las dos rutas producen JSON distinto")
+
+    results = {}
+    for name, fn in (("anterior", legacy_path), ("rápida", fast_path)):
+        best = min(timeit.repeat(lambda: fn(rows), number=1, repeat=args.repeat))
+        results[name] = best
+        print(f"{name:<10} {best * 1000:8.3f} ms por respuesta ({args.rows / best:,.0f} filas/s)")
+    print(f"mejora     {results['anterior'] / results['rápida']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Microbenchmark de lectura de los repositorios de líneas.
+
+Compara, sobre N pesajes de la línea 1, la lectura con instancias ORM
+(`query(orm_model).all()` + copia a la entidad, como se hacía antes) contra
+`get_all_by_filters` de los repositorios, que usan Core `select()` y mapean
+cada Row directamente a la entidad.
+
+Además mide páginas pequeñas (`get_paginated_by_filters`, 50 filas) armando la
+consulta en cada llamada contra las sentencias precompiladas de
+`LineStatementCache`, donde pesa el costo fijo por consulta.
+
+Uso:
+    python -m benchmarks.line_reads --rows 100000
+"""
+import argparse
+import os
+import time
+from dataclasses import fields
+
+os.environ.setdefault("BENCH_DB", "memory")
+
+from benchmarks.bootstrap import create_schema, engine_main  # noqa: E402
+from benchmarks import data_generator  # noqa: E402
+
+from src.modules.lineas_entrada_salida_service.src.domain.entities import LineasEntrada, LineasSalida  # noqa: E402
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_shared import LineasFilters  # noqa: E402
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.models import (  # noqa: E402
+    LINEAS_ENTRADA_ORM, LINEAS_SALIDA_ORM,
+)
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.repositories.lineas_entrada_repository import (  # noqa: E402
+    LineasEntradaRepository,
+)
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.repositories.lineas_salida_repository import (  # noqa: E402
+    LineasSalidaRepository,
+)
+from src.shared.database import SessionLocalMain  # noqa: E402
+
+from sqlalchemy import Index, and_, func, select  # noqa: E402
+
+LineaUnoEntradaORM = LINEAS_ENTRADA_ORM[1]
+LineaUnoSalidaORM = LINEAS_SALIDA_ORM[1]
+
+
+def orm_salida(db, filters: LineasFilters):
+    query = db.query(LineaUnoSalidaORM).filter(LineaUnoSalidaORM.fecha_p == filters.fecha)
+    return [
+        LineasSalida(
+            id=l.id, fecha_p=l.fecha_p, fecha=l.fecha, peso_kg=l.peso_kg, codigo_bastidor=l.codigo_bastidor,
+            p_lote=l.p_lote, codigo_parrilla=l.codigo_parrilla, codigo_obrero=l.codigo_obrero, guid=l.guid,
+        )
+        for l in query.order_by(LineaUnoSalidaORM.fecha_p.desc()).all()
+    ]
+
+
+def orm_entrada(db, filters: LineasFilters):
+    query = db.query(LineaUnoEntradaORM).filter(LineaUnoEntradaORM.fecha_p == filters.fecha)
+    return [
+        LineasEntrada(
+            id=l.id, fecha_p=l.fecha_p, fecha=l.fecha, peso_kg=l.peso_kg, turno=l.turno,
+            codigo_secuencia=l.codigo_secuencia, codigo_parrilla=l.codigo_parrilla, p_lote=l.p_lote,
+            hora_inicio=l.hora_inicio, guid=l.guid,
+        )
+        for l in query.order_by(LineaUnoEntradaORM.fecha_p.desc()).all()
+    ]
+
+
+def rebuilt_page(db, filters: LineasFilters, page: int, page_size: int):
+    """Página armando count y select en cada llamada (sin caché de sentencias)."""
+    table = LineaUnoSalidaORM.__table__
+    where = and_(table.c.fecha_p == filters.fecha, table.c.p_lote == filters.lote)
+    db.execute(select(func.count(table.c.id)).where(where)).scalar()
+    stmt = (
+        select(*(table.c[f.name] for f in fields(LineasSalida)))
+        .where(where)
+        .order_by(table.c.fecha_p.desc())
+        .limit(page_size)
+        .offset((page - 1) * page_size)
+    )
+    return [LineasSalida(*row) for row in db.execute(stmt)]
+
+
+def measure_calls(fn, calls: int) -> float:
+    db = SessionLocalMain()
+    try:
+        fn(db, 1)
+        start = time.perf_counter()
+        for i in range(calls):
+            fn(db, 1 + i % 10)
+        return calls / (time.perf_counter() - start)
+    finally:
+        db.close()
+
+
+def measure(fn, repeat: int) -> tuple[float, int]:
+    best, count = float("inf"), 0
+    for _ in range(repeat):
+        db = SessionLocalMain()
+        try:
+            start = time.perf_counter()
+            count = len(fn(db))
+            best = min(best, time.perf_counter() - start)
+        finally:
+            db.close()
+    return best, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lectura ORM vs Core en los repositorios de líneas.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--page-calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    create_schema(drop=True)
+    scale = data_generator.GenerationScale(weighings_per_table=args.rows, days=1)
+    data_generator._insert(engine_main, LineaUnoSalidaORM.__table__, data_generator.salida_rows(1, scale))
+    data_generator._insert(engine_main, LineaUnoEntradaORM.__table__, data_generator.entrada_rows(1, scale))
+    filters = LineasFilters(fecha=data_generator.START_DATE)
+
+    cases = {
+        "salida ORM": lambda db: orm_salida(db, filters),
+        "salida Core": lambda db: LineasSalidaRepository(db).get_all_by_filters(filters, 1),
+        "entrada ORM": lambda db: orm_entrada(db, filters),
+        "entrada Core": lambda db: LineasEntradaRepository(db).get_all_by_filters(filters, 1),
+    }
+    results = {}
+    for name, fn in cases.items():
+        elapsed, count = measure(fn, args.repeat)
+        results[name] = count / elapsed
+        print(f"{name:<14} {count:>9,} filas  {elapsed * 1000:9.1f} ms  {results[name]:>12,.0f} filas/s")
+    for tipo in ("salida", "entrada"):
+        print(f"mejora {tipo:<8} {results[f'{tipo} Core'] / results[f'{tipo} ORM']:6.2f}x")
+
+    # Con índice la consulta es barata y domina el costo fijo de armarla
+    table = LineaUnoSalidaORM.__table__
+    Index("ix_bench_fecha_lote", table.c.fecha_p, table.c.p_lote).create(engine_main)
+    page_filters = LineasFilters(fecha=data_generator.START_DATE, lote=data_generator.lote_code(data_generator.START_DATE, 1, 0))
+    rebuilt = measure_calls(lambda db, page: rebuilt_page(db, page_filters, page, 50), args.page_calls)
+    cached = measure_calls(
+        lambda db, page: LineasSalidaRepository(db).get_paginated_by_filters(page_filters, page, 50, 1), args.page_calls
+    )
+    print(f"\npágina de 50 (count + select), {args.page_calls:,} llamadas:")
+    print(f"  armada por llamada   {rebuilt:9,.0f} páginas/s")
+    print(f"  precompilada         {cached:9,.0f} páginas/s")
+    print(f"  mejora               {cached / rebuilt:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
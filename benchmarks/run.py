@@ -0,0 +1,238 @@
+"""
+Benchmark de los endpoints calientes de la API contra SQLite.
+
+Ejecuta la app FastAPI en proceso (sin red) y reporta, por escenario,
+throughput, percentiles de latencia p50/p95/p99 y errores. Los resultados se
+pueden guardar como línea base en JSON y comparar en ejecuciones posteriores.
+
+Ejemplos:
+    # Generar datos (una vez) y medir
+    python -m benchmarks.run --generate --weighings-per-table 500000
+
+    # Guardar línea base y comparar después de un cambio
+    python -m benchmarks.run --save-baseline antes
+    python -m benchmarks.run --compare antes --tolerance 0.15
+
+    # Todo en memoria, rápido
+    BENCH_DB=memory python -m benchmarks.run --generate --weighings-per-table 5000 --requests 100
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.bootstrap import ROOT, create_schema, load_app, engine_main, engine_auth
+from benchmarks.asgi_client import AsgiClient
+from benchmarks import data_generator
+
+BASELINE_DIR = ROOT / "benchmarks" / "baselines"
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    # Recibe el número de iteración y devuelve (path, body)
+    build: Callable[[int, "RunContext"], tuple]
+
+
+@dataclass
+class RunContext:
+    days: int
+    lotes_per_day: int
+
+    def fecha(self, i: int) -> str:
+        return (data_generator.START_DATE + timedelta(days=i % self.days)).isoformat()
+
+    def lote(self, i: int, linea: int) -> str:
+        fecha = data_generator.START_DATE + timedelta(days=i % self.days)
+        return data_generator.lote_code(fecha, linea, i % self.lotes_per_day)
+
+
+def _linea(i: int) -> int:
+    return data_generator.LINEAS[i % len(data_generator.LINEAS)]
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("salida_paginated", "POST", lambda i, ctx: (
+        f"/api/lineas-salida/{_linea(i)}/paginated",
+        {"page": 1 + i % 10, "page_size": 50, "fecha": ctx.fecha(i)},
+    )),
+    Scenario("salida_paginated_lote", "POST", lambda i, ctx: (
+        f"/api/lineas-salida/{_linea(i)}/paginated",
+        {"page": 1, "page_size": 100, "lote": ctx.lote(i, _linea(i))},
+    )),
+    Scenario("entrada_paginated", "POST", lambda i, ctx: (
+        f"/api/lineas-entrada/{_linea(i)}/paginated",
+        {"page": 1 + i % 10, "page_size": 50, "fecha": ctx.fecha(i)},
+    )),
+    Scenario("salida_total", "POST", lambda i, ctx: (
+        f"/api/lineas-salida/{_linea(i)}/total",
+        {"fecha": ctx.fecha(i)},
+    )),
+    Scenario("salida_miga_paginated", "POST", lambda i, ctx: (
+        f"/api/lineas-salida/{_linea(i)}/miga/paginated",
+        {"page": 1, "page_size": 50, "fecha": ctx.fecha(i)},
+    )),
+    Scenario("auditoria_paginated", "POST", lambda i, ctx: (
+        "/api/auditoria/paginated",
+        {"page": 1 + i % 20, "page_size": 50},
+    )),
+    Scenario("movimientos_paginated", "POST", lambda i, ctx: (
+        "/api/movimientos-empleado/paginated",
+        {"page": 1 + i % 20, "page_size": 50},
+    )),
+    Scenario("control_tara_list", "GET", lambda i, ctx: ("/api/control-tara/", None)),
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+async def run_scenario(client: AsgiClient, scenario: Scenario, ctx: RunContext,
+                       requests: int, concurrency: int, warmup: int) -> dict:
+    for i in range(warmup):
+        path, body = scenario.build(i, ctx)
+        await client.request(scenario.method, path, json_body=body)
+
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            path, body = scenario.build(i, ctx)
+            response = await client.request(scenario.method, path, json_body=body)
+            latencies.append(response.elapsed)
+            if response.status >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+def print_results(results: Dict[str, dict]) -> None:
+    header = f"{'escenario':<26}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errores':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(f"{name:<26}{r['throughput_rps']:>10.1f}{r['p50_ms']:>10.2f}"
+              f"{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['errors']:>9}")
+
+
+def save_baseline(name: str, results: Dict[str, dict], meta: dict) -> Path:
+    BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+    path = BASELINE_DIR / f"{name}.json"
+    path.write_text(json.dumps({"meta": meta, "scenarios": results}, indent=2, ensure_ascii=False))
+    return path
+
+
+def compare_with_baseline(name: str, results: Dict[str, dict], tolerance: float) -> List[str]:
+    """Devuelve las regresiones (p95 o throughput fuera de la tolerancia)."""
+    baseline = json.loads((BASELINE_DIR / f"{name}.json").read_text())["scenarios"]
+    regressions = []
+    print(f"\nComparación con línea base '{name}' (tolerancia {tolerance:.0%}):")
+    for scenario, current in results.items():
+        previous = baseline.get(scenario)
+        if previous is None:
+            print(f"  {scenario:<26} sin línea base")
+            continue
+        p95_delta = (current["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] if previous["p95_ms"] else 0.0
+        rps_delta = ((current["throughput_rps"] - previous["throughput_rps"]) / previous["throughput_rps"]
+                     if previous["throughput_rps"] else 0.0)
+        flag = ""
+        if p95_delta > tolerance or rps_delta < -tolerance or current["errors"] > previous["errors"]:
+            flag = "  <-- REGRESIÓN"
+            regressions.append(scenario)
+        print(f"  {scenario:<26} p95 {p95_delta:+7.1%}   req/s {rps_delta:+7.1%}{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark en proceso de los endpoints calientes.")
+    parser.add_argument("--generate", action="store_true", help="Regenerar los datos sintéticos antes de medir")
+    data_generator.add_scale_arguments(parser)
+    parser.add_argument("--requests", type=int, default=300, help="Peticiones medidas por escenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--scenario", action="append", help="Limitar a estos escenarios (repetible)")
+    parser.add_argument("--save-baseline", metavar="NOMBRE")
+    parser.add_argument("--compare", metavar="NOMBRE")
+    parser.add_argument("--tolerance", type=float, default=0.20)
+    parser.add_argument("--verbose", action="store_true", help="Mostrar la salida estándar de la app")
+    args = parser.parse_args(argv)
+
+    scale = data_generator.scale_from_args(args)
+    in_memory = engine_main.url.database in (None, "", ":memory:")
+    if args.generate or in_memory:
+        print(f"Generando datos ({scale.weighings_per_table:,} pesajes por tabla, {scale.days} días)...")
+        data_generator.generate(scale)
+    else:
+        create_schema()
+
+    app = load_app()
+    client = AsgiClient(app)
+    ctx = RunContext(days=scale.days, lotes_per_day=scale.lotes_per_day)
+    selected = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+
+    async def run_all() -> Dict[str, dict]:
+        results = {}
+        for scenario in selected:
+            results[scenario.name] = await run_scenario(
+                client, scenario, ctx, args.requests, args.concurrency, args.warmup
+            )
+        return results
+
+    # La app imprime trazas con print(): se descartan para no ensuciar el reporte
+    with contextlib.redirect_stdout(io.StringIO()) if not args.verbose else contextlib.nullcontext():
+        results = asyncio.run(run_all())
+    print()
+    print_results(results)
+
+    meta = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": {"main": str(engine_main.url), "auth": str(engine_auth.url)},
+        "weighings_per_table": scale.weighings_per_table,
+        "days": scale.days,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+    }
+    if args.save_baseline:
+        path = save_baseline(args.save_baseline, results, meta)
+        print(f"\nLínea base guardada en {path}")
+    if args.compare:
+        if compare_with_baseline(args.compare, results, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,10 +12,20 @@ from src.modules.administracion_service.src.infrastructure.api.routers.control_l
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.routers.control_tara_router import router as control_tara_router
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.routers.lineas_salida_router import router as lineas_salida_router
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.routers.lineas_entrada_router import router as lineas_entrada_router
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.routers.rendimiento_router import router as rendimiento_router
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.routers.productividad_router import router as productividad_router
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.routers.throughput_router import router as throughput_router
+from src.modules.lineas_entrada_salida_service.src.infrastructure.throughput_worker import configure_throughput
+from src.modules.lineas_entrada_salida_service.src.infrastructure.resumen_lineas_worker import configure_resumen_lineas
 from src.shared.common.responses import validation_error_response
 from src.shared.exceptions import DomainError
 from src.shared.common.exception_handlers import domain_exception_handler
 from src.shared.cors_config import configure_cors
+from src.shared.database import engine_main, engine_auth, engine_report, engine_replica
+from src.shared.jobs import configure_jobs
+from src.shared.read_replica import configure_read_replica
+from src.shared.sql_instrumentation import configure_sql_instrumentation
+from src.shared.http_metrics import configure_http_metrics
 from datetime import datetime
 
 from src.modules.management_service.src.infrastructure.api.routers.movimientos_empleado import (
@@ -50,6 +60,29 @@ app = FastAPI(
 configure_cors(app, "API Gateway")
 # --- FIN: CONFIGURACIÓN DE CORS ---
 
+# Conteo de consultas, Server-Timing y detección de N+1 por petición
+_engines = {"main": engine_main, "auth": engine_auth}
+if engine_report is not engine_main:
+    _engines["report"] = engine_report
+if engine_replica is not None:
+    _engines["replica"] = engine_replica
+configure_sql_instrumentation(app, _engines)
+
+# Lecturas de repositorio a la réplica, con read-your-writes tras una escritura
+configure_read_replica(app, engine_replica)
+
+# Métricas Prometheus (latencia por plantilla de ruta) en /metrics
+configure_http_metrics(app)
+
+# kg/hora en vivo por línea, agregado en memoria por un hilo de fondo
+configure_throughput(app)
+
+# Conteo y kg por (línea, día, lote) mantenidos en la base de auth por un hilo de fondo
+configure_resumen_lineas(app)
+
+# Reportes pesados en un pool acotado: /api/jobs/{id} para estado, descarga y cancelación
+configure_jobs(app)
+
 
 # Manejador global de excepciones de validación
 @app.exception_handler(RequestValidationError)
@@ -75,6 +108,9 @@ app.include_router(auditoria_logs, prefix="/api/auditoria", tags=["Auditoria de
 app.include_router(lineas_entrada_router, prefix="/api/lineas-entrada", tags=["Lineas Entrada"])
 app.include_router(lineas_salida_router, prefix="/api/lineas-salida", tags=["Lineas Salida"])
 app.include_router(control_tara_router, prefix="/api/control-tara", tags=["Control Tara"])
+app.include_router(rendimiento_router, prefix="/api/rendimiento", tags=["Rendimiento"])
+app.include_router(productividad_router, prefix="/api/productividad", tags=["Productividad"])
+app.include_router(throughput_router, prefix="/api/lineas", tags=["Throughput"])
 app.include_router(area_operarios_router, prefix="/api/administracion/area-operarios", tags=["Area Operarios"])
 app.include_router(control_lote_asiglinea_router, prefix="/api/administracion/control-lote", tags=["Control Lote"])
 app.include_router(especies_router, prefix="/api/administracion/especies", tags=["Especies"])
@@ -122,6 +158,17 @@ async def detailed_health_check():
     return health_status
 
 
+@app.get("/metrics/db-pool")
+async def db_pool_metrics():
+    """Métricas del pool de conexiones de cada engine"""
+    from src.shared.db_pool import pool_status
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "engines": {name: pool_status(engine) for name, engine in _engines.items()},
+    }
+
+
 @app.get("/services")
 async def get_services():
     """Endpoint que muestra los servicios disponibles"""
@@ -8,7 +8,9 @@ from src.modules.administracion_service.src.infrastructure.api.routers.lineas_ro
 from src.modules.administracion_service.src.infrastructure.api.routers.area_operarios_router import router as area_operarios_router
 from src.modules.administracion_service.src.infrastructure.api.routers.control_lote_asiglinea_router import router as control_lote_asiglinea_router
 from src.modules.administracion_service.src.infrastructure.api.routers.especies_router import router as especies_router
+from src.shared.common.exception_handlers import domain_exception_handler
 from src.shared.cors_config import configure_cors
+from src.shared.exceptions import DomainError
 
 app = FastAPI(
     title="Administración API",
@@ -19,6 +21,9 @@ app = FastAPI(
 # Configurar CORS
 configure_cors(app, "Administración Service")
 
+# Manejador global de excepciones de dominio
+app.add_exception_handler(DomainError, domain_exception_handler)
+
 app.include_router(area_operarios_router, prefix="/api/administracion/area-operarios", tags=["Area Operarios"])
 app.include_router(control_lote_asiglinea_router, prefix="/api/administracion/control-lote", tags=["Control Lote"])
 app.include_router(especies_router, prefix="/api/administracion/especies", tags=["Especies"])
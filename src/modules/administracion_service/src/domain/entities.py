@@ -62,7 +62,7 @@ class PlanningTurno:
     plnn_linea: Optional[str] = None
     plnn_hora_fin: Optional[datetime] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DetalleProduccion:
     dpro_id: int
     dpro_linea: int
@@ -12,8 +12,7 @@ from src.modules.administracion_service.src.infrastructure.db.repositories.area_
 from src.modules.auth_service.src.application.use_cases.audit_use_case import AuditUseCase
 from src.shared.base import get_db
 from src.shared.common.auditoria import get_audit_use_case
-from src.shared.common.responses import success_response, error_response
-from src.shared.exceptions import RepositoryError
+from src.shared.common.responses import success_response
 from src.shared.security import get_current_user_data
 
 router = APIRouter()
@@ -81,13 +80,8 @@ def remove_area(
         use_case: AreaOperariosUseCase = Depends(get_area_operarios_use_case),
         user_data: Dict[str, Any] = Depends(get_current_user_data)
 ):
-    try:
-        use_case.remove_area(area_id, user_data)
-        return success_response(
-            data={"id_area removida": area_id},
-            message="Area Operarios removida"
-        )
-    except RepositoryError as e:
-        return error_response(
-            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    use_case.remove_area(area_id, user_data)
+    return success_response(
+        data={"id_area removida": area_id},
+        message="Area Operarios removida"
+    )
@@ -103,13 +103,8 @@ def remove_lote(
         use_case: ControlLoteAsiglineaUseCase = Depends(get_control_lote_asiglinea_use_case),
         user_data: Dict[str, Any] = Depends(get_current_user_data)
 ):
-    try:
-        use_case.remove_lote(lote_id, user_data)
-        return success_response(
-            data=f"lote con id {lote_id} eliminado",
-            message="Lote eliminado correctamente"
-        )
-    except RepositoryError as e:
-        return error_response(
-            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    use_case.remove_lote(lote_id, user_data)
+    return success_response(
+        data=f"lote con id {lote_id} eliminado",
+        message="Lote eliminado correctamente"
+    )
@@ -84,17 +84,11 @@ def update_detalle(
     use_case: DetalleProduccionUseCase = Depends(get_detalle_produccion_use_case),
     user_data: Dict[str, Any] = Depends(get_current_user_data)
 ):
-    try:
-        updated = use_case.update(detalle_id, data, user_data)
-        return success_response(
-            data=updated,
-            message="Registro actualizado"
-        )
-    except RepositoryError as e:
-        return error_response(
-            message=str(e),
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    updated = use_case.update(detalle_id, data, user_data)
+    return success_response(
+        data=updated,
+        message="Registro actualizado"
+    )
 
 @router.delete("/{detalle_id}", status_code=status.HTTP_200_OK)
 def delete_detalle(
@@ -102,14 +96,8 @@ def delete_detalle(
     use_case: DetalleProduccionUseCase = Depends(get_detalle_produccion_use_case),
     user_data: Dict[str, Any] = Depends(get_current_user_data)
 ):
-    try:
-        use_case.remove(detalle_id, user_data)
-        return success_response(
-            data=f"Registro con id {detalle_id} eliminado",
-            message="Registro eliminado correctamente"
-        )
-    except RepositoryError as e:
-        return error_response(
-            message=str(e),
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    use_case.remove(detalle_id, user_data)
+    return success_response(
+        data=f"Registro con id {detalle_id} eliminado",
+        message="Registro eliminado correctamente"
+    )
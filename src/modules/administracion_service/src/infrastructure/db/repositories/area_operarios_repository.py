@@ -9,8 +9,10 @@ from src.modules.administracion_service.src.domain.entities import AreaOperarios
 from src.modules.administracion_service.src.infrastructure.api.schemas.area_operarios import AreaOperariosRequest
 from src.modules.administracion_service.src.infrastructure.db.models import AreaOperariosORM
 from src.shared.exceptions import RepositoryError, NotFoundError
+from src.shared.read_replica import lecturas_en_replica
 
 
+@lecturas_en_replica
 class AreaOperariosRepository(IAreaOperarioRepository):
 
     def __init__(self, db: Session):
@@ -93,8 +95,7 @@ class AreaOperariosRepository(IAreaOperarioRepository):
             )
 
             self.db.add(area_orm)
-            self.db.commit()
-            self.db.refresh(area_orm)
+            self.db.flush()
             return AreaOperarios(
                 area_id=area_orm.AREA_ID,
                 area_nombre=area_orm.AREA_NOMBRE,
@@ -104,7 +105,6 @@ class AreaOperariosRepository(IAreaOperarioRepository):
             )
 
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al crear el area de operarios.") from e
 
 
@@ -117,8 +117,7 @@ class AreaOperariosRepository(IAreaOperarioRepository):
 
             area_orm.AREA_NOMBRE = data.area_nombre
             area_orm.AREA_FECMOD = datetime.now()
-            self.db.commit()
-            self.db.refresh(area_orm)
+            self.db.flush()
 
             return AreaOperarios(
                 area_id=area_orm.AREA_ID,
@@ -129,7 +128,6 @@ class AreaOperariosRepository(IAreaOperarioRepository):
             )
 
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al actualizar el código de parrilla de la línea entrada.") from e
 
     def soft_delete(self, id: int) -> bool:
@@ -145,10 +143,8 @@ class AreaOperariosRepository(IAreaOperarioRepository):
 
 
             area_orm.AREA_ESTADO = "INACTIVO"
-            self.db.commit()
-            self.db.refresh(area_orm)
+            self.db.flush()
 
             return True
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al eliminar el area.") from e
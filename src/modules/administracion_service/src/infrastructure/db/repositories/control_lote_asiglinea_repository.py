@@ -12,8 +12,10 @@ from src.modules.administracion_service.src.infrastructure.api.schemas.control_l
     ControlLoteAsiglineaFilters, ControlLoteAsiglineaPagination, ControlLoteAsiglineaUpdate
 from src.modules.administracion_service.src.infrastructure.db.models import ControlLoteAsiglineaORM
 from src.shared.exceptions import RepositoryError, NotFoundError
+from src.shared.read_replica import lecturas_en_replica
 
 
+@lecturas_en_replica
 class ControlLoteAsiglineaRepository(IControlLoteAsiglineaRepository):
     def __init__(self, db: Session):
         self.db = db
@@ -135,8 +137,7 @@ class ControlLoteAsiglineaRepository(IControlLoteAsiglineaRepository):
             setattr(lote_orm, k, v)
 
         try:
-            self.db.commit()
-            self.db.refresh(lote_orm)
+            self.db.flush()
             return ControlLoteAsiglinea(
                 id=lote_orm.id,
                 fecha_p=lote_orm.fecha_p,
@@ -148,7 +149,6 @@ class ControlLoteAsiglineaRepository(IControlLoteAsiglineaRepository):
                 turno=lote_orm.turno
             )
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al actualizar el lote.") from e
 
     def remove(self, id: int) -> bool:
@@ -163,9 +163,8 @@ class ControlLoteAsiglineaRepository(IControlLoteAsiglineaRepository):
                 raise NotFoundError("Lote no encontrado.")
 
             self.db.delete(linea_orm)
-            self.db.commit()
+            self.db.flush()
             return True
 
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al eliminar el lote.") from e
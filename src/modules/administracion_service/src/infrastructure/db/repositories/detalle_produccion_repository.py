@@ -1,6 +1,8 @@
+from dataclasses import fields
+from operator import attrgetter
 from typing import Tuple, List, Optional
 
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
@@ -11,8 +13,20 @@ from src.modules.administracion_service.src.infrastructure.api.schemas.detalle_p
 )
 from src.modules.administracion_service.src.infrastructure.db.models import DetalleProduccionORM
 from src.shared.exceptions import RepositoryError, NotFoundError
+from src.shared.read_replica import lecturas_en_replica
 
+# Las columnas de fm_detalle_produccion son los campos de la entidad en mayúsculas;
+# se leen en el orden de DetalleProduccion para construirla posicionalmente.
+_ENTITY_COLUMNS = tuple(f.name.upper() for f in fields(DetalleProduccion))
+_orm_values = attrgetter(*_ENTITY_COLUMNS)
 
+
+def _to_domain(row) -> DetalleProduccion:
+    """Construye la entidad posicionalmente desde una Row o tupla en el orden de _ENTITY_COLUMNS."""
+    return DetalleProduccion(*row)
+
+
+@lecturas_en_replica
 class DetalleProduccionRepository(IDetalleProduccionRepository):
     def __init__(self, db: Session):
         self.db = db
@@ -61,16 +75,7 @@ class DetalleProduccionRepository(IDetalleProduccionRepository):
             if not orm:
                 return None
 
-            return DetalleProduccion(
-                dpro_id=orm.DPRO_ID,
-                dpro_fecprod=orm.DPRO_FECPROD,
-                dpro_lote=orm.DPRO_LOTE,
-                dpro_pmiga=orm.DPRO_PMIGA,
-                dpro_ppanza=orm.DPRO_PPANZA,
-                dpro_pdesperdicio=orm.DPRO_PDESPERDICIO,
-                dpro_linea=orm.DPRO_LINEA,
-                dpro_turnox=orm.DPRO_TURNOX
-            )
+            return _to_domain(_orm_values(orm))
         except SQLAlchemyError as e:
             raise RepositoryError("Error al obtener registro.") from e
 
@@ -84,7 +89,8 @@ class DetalleProduccionRepository(IDetalleProduccionRepository):
             if total_records == 0:
                 return [], 0
 
-            query = self.db.query(DetalleProduccionORM)
+            table = DetalleProduccionORM.__table__
+            query = select(*(table.c[name] for name in _ENTITY_COLUMNS))
             query = self._apply_filters(query, filters)
 
             query = query.order_by(
@@ -93,21 +99,9 @@ class DetalleProduccionRepository(IDetalleProduccionRepository):
             )
 
             offset = (paginated_filters.page - 1) * paginated_filters.page_size
-            rows = query.limit(paginated_filters.page_size).offset(offset).all()
-
-            entities = [
-                DetalleProduccion(
-                    dpro_id=r.DPRO_ID,
-                    dpro_fecprod=r.DPRO_FECPROD,
-                    dpro_lote=r.DPRO_LOTE,
-                    dpro_pmiga=r.DPRO_PMIGA,
-                    dpro_ppanza=r.DPRO_PPANZA,
-                    dpro_pdesperdicio=r.DPRO_PDESPERDICIO,
-                    dpro_linea=r.DPRO_LINEA,
-                    dpro_turnox=r.DPRO_TURNOX
-                )
-                for r in rows
-            ]
+            rows = self.db.execute(query.limit(paginated_filters.page_size).offset(offset))
+
+            entities = [_to_domain(row) for row in rows]
 
             return entities, total_records
 
@@ -125,20 +119,9 @@ class DetalleProduccionRepository(IDetalleProduccionRepository):
             setattr(orm, k.upper(), v)  # mapeo a columnas con mayúsculas
 
         try:
-            self.db.commit()
-            self.db.refresh(orm)
-            return DetalleProduccion(
-                dpro_id=orm.DPRO_ID,
-                dpro_fecprod=orm.DPRO_FECPROD,
-                dpro_lote=orm.DPRO_LOTE,
-                dpro_pmiga=orm.DPRO_PMIGA,
-                dpro_ppanza=orm.DPRO_PPANZA,
-                dpro_pdesperdicio=orm.DPRO_PDESPERDICIO,
-                dpro_linea=orm.DPRO_LINEA,
-                dpro_turnox=orm.DPRO_TURNOX
-            )
+            self.db.flush()
+            return _to_domain(_orm_values(orm))
         except SQLAlchemyError:
-            self.db.rollback()
             raise RepositoryError("Error al actualizar registro.")
 
     def remove(self, id: int) -> bool:
@@ -153,8 +136,7 @@ class DetalleProduccionRepository(IDetalleProduccionRepository):
 
         try:
             self.db.delete(orm)
-            self.db.commit()
+            self.db.flush()
             return True
         except SQLAlchemyError:
-            self.db.rollback()
             raise RepositoryError("Error al eliminar registro.")
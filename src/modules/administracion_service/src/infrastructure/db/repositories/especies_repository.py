@@ -10,8 +10,10 @@ from src.modules.administracion_service.src.infrastructure.api.schemas.especies
     EspeciesPaginated
 from src.modules.administracion_service.src.infrastructure.db.models import EspeciesORM
 from src.shared.exceptions import RepositoryError, NotFoundError
+from src.shared.read_replica import lecturas_en_replica
 
 
+@lecturas_en_replica
 class EspeciesRepository(IEspeciesRepository):
     def __init__(self, db: Session):
         self.db = db
@@ -123,8 +125,7 @@ class EspeciesRepository(IEspeciesRepository):
                 especies_kilos_horas_doble=data.especies_kilos_horas_doble
             )
             self.db.add(especie_orm)
-            self.db.commit()
-            self.db.refresh(especie_orm)
+            self.db.flush()
             return Especie(
                 especie_id=especie_orm.especie_id,
                 especie_nombre=especie_orm.especie_nombre,
@@ -141,7 +142,6 @@ class EspeciesRepository(IEspeciesRepository):
                 especies_kilos_horas_doble=especie_orm.especies_kilos_horas_doble
             )
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al crear la especie.") from e
 
     def update(self, data: EspeciesRequest, id: int):
@@ -154,8 +154,7 @@ class EspeciesRepository(IEspeciesRepository):
             setattr(especie_orm, k, v)
 
         try:
-            self.db.commit()
-            self.db.refresh(especie_orm)
+            self.db.flush()
             return Especie(
                 especie_id=especie_orm.especie_id,
                 especie_nombre=especie_orm.especie_nombre,
@@ -172,5 +171,4 @@ class EspeciesRepository(IEspeciesRepository):
                 especies_kilos_horas_doble=especie_orm.especies_kilos_horas_doble
             )
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al actualizar la especie.") from e
@@ -10,8 +10,10 @@ from src.modules.administracion_service.src.infrastructure.api.schemas.linea imp
     EstadoLineaEnum
 from src.modules.auth_service.src.infrastructure.db.models import LineaORM
 from src.shared.exceptions import RepositoryError, NotFoundError
+from src.shared.read_replica import lecturas_en_replica
 
 
+@lecturas_en_replica
 class LineaRepository(ILineaRepository):
     def __init__(self, db: Session):
         self.db = db
@@ -93,8 +95,7 @@ class LineaRepository(ILineaRepository):
             )
 
             self.db.add(linea_orm)
-            self.db.commit()
-            self.db.refresh(linea_orm)
+            self.db.flush()
             return Linea(
                 line_id=linea_orm.LINE_ID,
                 line_nombre=linea_orm.LINE_NOMBRE,
@@ -104,7 +105,6 @@ class LineaRepository(ILineaRepository):
                 line_planta=linea_orm.LINE_PLANTA
             )
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al crear la linea.") from e
 
     def update(self, data: LineaUpdate, id: int) -> Optional[Linea]:
@@ -121,8 +121,7 @@ class LineaRepository(ILineaRepository):
         linea_orm.LINE_FECMOD = datetime.now()
 
         try:
-            self.db.commit()
-            self.db.refresh(linea_orm)
+            self.db.flush()
             return Linea(
                 line_id=linea_orm.LINE_ID,
                 line_nombre=linea_orm.LINE_NOMBRE,
@@ -132,17 +131,14 @@ class LineaRepository(ILineaRepository):
                 line_planta=linea_orm.LINE_PLANTA
             )
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al actualizar la linea.") from e
 
     def soft_delete(self, id: int) -> bool:
         linea_orm = self.db.query(LineaORM).get(id)
         try:
             linea_orm.LINE_ESTADO = EstadoLineaEnum.INACTIVO
-            self.db.commit()
-            self.db.refresh(linea_orm)
+            self.db.flush()
 
             return True
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al eliminar la linea.") from e
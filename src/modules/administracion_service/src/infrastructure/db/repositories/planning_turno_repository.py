@@ -10,8 +10,10 @@ from src.modules.administracion_service.src.infrastructure.api.schemas.planning_
 )
 from src.modules.administracion_service.src.infrastructure.db.models import PlanningTurnoORM
 from src.shared.exceptions import RepositoryError, NotFoundError
+from src.shared.read_replica import lecturas_en_replica
 
 
+@lecturas_en_replica
 class PlanningTurnoRepository(IPlanningTurnoRepository):
     def __init__(self, db: Session):
         self.db = db
@@ -122,8 +124,7 @@ class PlanningTurnoRepository(IPlanningTurnoRepository):
             setattr(orm, k, v)
 
         try:
-            self.db.commit()
-            self.db.refresh(orm)
+            self.db.flush()
 
             return PlanningTurno(
                 plnn_id=orm.plnn_id,
@@ -133,7 +134,6 @@ class PlanningTurnoRepository(IPlanningTurnoRepository):
                 plnn_hora_fin=orm.plnn_hora_fin
             )
         except SQLAlchemyError:
-            self.db.rollback()
             raise RepositoryError("Error al actualizar registro.")
 
     def remove(self, id: int) -> bool:
@@ -148,9 +148,8 @@ class PlanningTurnoRepository(IPlanningTurnoRepository):
 
         try:
             self.db.delete(orm)
-            self.db.commit()
+            self.db.flush()
             return True
         except SQLAlchemyError:
-            self.db.rollback()
             raise RepositoryError("Error al eliminar registro.")
 
@@ -7,8 +7,10 @@ from src.modules.administracion_service.src.application.ports.planta import IPla
 from src.modules.administracion_service.src.domain.entities import Planta
 from src.modules.auth_service.src.infrastructure.db.models import PlantaORM
 from src.shared.exceptions import NotFoundError, RepositoryError
+from src.shared.read_replica import lecturas_en_replica
 
 
+@lecturas_en_replica
 class PlantaRepository(IPlantaRepository):
     def __init__(self, db: Session):
         self.db = db
@@ -7,8 +7,10 @@ from src.modules.administracion_service.src.application.ports.tipo_limpieza impo
 from src.modules.administracion_service.src.domain.entities import TipoLimpieza
 from src.modules.administracion_service.src.infrastructure.db.models import TipoLimpiezaORM
 from src.shared.exceptions import RepositoryError
+from src.shared.read_replica import lecturas_en_replica
 
 
+@lecturas_en_replica
 class TipoLimpiezaRepository(ITipoLimpiezaRepository):
     def __init__(self, db: Session):
         self.db = db
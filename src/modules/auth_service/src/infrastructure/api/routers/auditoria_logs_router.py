@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 from src.shared.base import get_auth_db # Usamos la DB de autenticación
-from src.shared.common.responses import success_response, error_response
+from src.shared.common.responses import success_response, error_response, validate_many
 from src.shared.exceptions import RepositoryError
 import traceback
 
@@ -52,10 +52,7 @@ def get_logs_paginated(
     try:
         pagination_result = use_case.get_logs_paginated_by_filters(pagination_params)
         
-        response_data = [
-            AuditoriaLogResponse.model_validate(log_orm).model_dump(mode="json")
-            for log_orm in pagination_result["data"]
-        ]
+        response_data = validate_many(AuditoriaLogResponse, pagination_result["data"])
         print(f"Datos transformados a response schema")
         
         response_data_with_meta = {
@@ -5,8 +5,11 @@ from typing import Dict, Any, List, Tuple
 from src.modules.auth_service.src.application.ports.auditoria_log_repository import IAuditoriaLogRepository
 from src.modules.auth_service.src.infrastructure.api.schemas.auditoria import AuditoriaLogFilters
 from src.modules.auth_service.src.infrastructure.db.models import AuditoriaLogORM
+from src.shared.count_cache import clave_filtros, count_cache, invalidar_totales
 from src.shared.exceptions import RepositoryError
 
+_SCOPE = ("auditoria",)
+
 class AuditoriaLogRepository(IAuditoriaLogRepository):
     
     def __init__(self, db: Session):
@@ -18,12 +21,13 @@ class AuditoriaLogRepository(IAuditoriaLogRepository):
         'log_data' es un diccionario que coincide con las columnas de AuditoriaLogORM.
         """
         try:
-            db_log = AuditoriaLogORM(**log_data)
-            self.db.add(db_log)
-            self.db.commit()
+            # Savepoint: si el log falla solo se descarta el log, no el
+            # resto de la unidad de trabajo de la petición.
+            with self.db.begin_nested():
+                self.db.add(AuditoriaLogORM(**log_data))
+            invalidar_totales(self.db, _SCOPE)
             return True
         except SQLAlchemyError as e:
-            self.db.rollback()
             # Loguear este error es importante, pero no deberíamos
             # fallar la petición principal del usuario si el log falla.
             print(f"Error al escribir en log de auditoría: {e}")
@@ -31,18 +35,18 @@ class AuditoriaLogRepository(IAuditoriaLogRepository):
 
     def create_logs_batch(self, logs_data: list[dict]) -> bool:
         """
-        Inserta múltiples registros de auditoría en un solo commit.
+        Inserta múltiples registros de auditoría en un solo flush.
         """
         try:
             logs = [AuditoriaLogORM(**log) for log in logs_data]
 
-            self.db.bulk_save_objects(logs)
-            self.db.commit()
+            with self.db.begin_nested():
+                self.db.bulk_save_objects(logs)
+            invalidar_totales(self.db, _SCOPE)
 
             return True
 
         except SQLAlchemyError as e:
-            self.db.rollback()
             print(f"Error al escribir logs de auditoría (batch): {e}")
             return False
 
@@ -62,13 +66,16 @@ class AuditoriaLogRepository(IAuditoriaLogRepository):
         return query
 
     def count_by_filters(self, filters: AuditoriaLogFilters) -> int:
-        """Cuenta logs según los filtros proporcionados."""
-        try:
-            query = self.db.query(func.count(AuditoriaLogORM.log_id))
-            query = self._apply_filters(query, filters)
-            return query.scalar() or 0
-        except SQLAlchemyError as e:
-            raise RepositoryError("Error al contar los logs de auditoría.") from e
+        """Cuenta logs según los filtros proporcionados (caché de totales compartida con /total)."""
+        def contar() -> int:
+            try:
+                query = self.db.query(func.count(AuditoriaLogORM.log_id))
+                query = self._apply_filters(query, filters)
+                return query.scalar() or 0
+            except SQLAlchemyError as e:
+                raise RepositoryError("Error al contar los logs de auditoría.") from e
+
+        return count_cache.get_or_compute(_SCOPE, clave_filtros(filters, AuditoriaLogFilters.model_fields), contar, db=self.db)
         
     def get_paginated_by_filters(
         self, filters: AuditoriaLogFilters, page: int, page_size: int
@@ -58,14 +58,11 @@ class LineaAsignadaRepository(ILineaAsignadaRepository):
         )
         try:
             self.db.add(db_asignacion)
-            self.db.commit()
-            self.db.refresh(db_asignacion)
+            self.db.flush()
             return db_asignacion
         except IntegrityError as e:
-            self.db.rollback()
             raise AlreadyExistsError("Asignación duplicada.") from e
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al asignar la línea.") from e
 
     def remover(self, id_usuario: int, id_linea_externa: int) -> bool:
@@ -83,8 +80,7 @@ class LineaAsignadaRepository(ILineaAsignadaRepository):
                 raise NotFoundError("Asignación no encontrada.")
                 
             self.db.delete(db_asignacion)
-            self.db.commit()
+            self.db.flush()
             return True
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al remover la línea.") from e
\ No newline at end of file
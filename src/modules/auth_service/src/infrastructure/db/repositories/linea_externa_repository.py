@@ -10,7 +10,9 @@ from src.modules.auth_service.src.domain.entities import LineaExterna
 from src.modules.auth_service.src.infrastructure.db.models import LineaORM 
 
 from src.shared.exceptions import RepositoryError
+from src.shared.read_replica import lecturas_en_replica
 
+@lecturas_en_replica
 class LineaExternaRepository(ILineaExternaRepository):
     
     def __init__(self, db: Session):
@@ -91,8 +91,7 @@ class PermisoModuloRepository(IPermisoModuloRepository):
         
         try:
             self.db.add(db_permiso)
-            self.db.commit()
-            self.db.refresh(db_permiso)
+            self.db.flush()
             
             # Cargar la relación con el rol
             return (
@@ -102,10 +101,8 @@ class PermisoModuloRepository(IPermisoModuloRepository):
                 .first()
             )
         except IntegrityError as e:
-            self.db.rollback()
             raise AlreadyExistsError(f"El rol ya tiene permisos asignados para el módulo '{permiso_data.modulo.value}'.") from e
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al crear el permiso de módulo.") from e
 
     def update(self, permiso_id: int, permiso_data: PermisoModuloUpdate) -> Optional[PermisoModulo]:
@@ -134,8 +131,7 @@ class PermisoModuloRepository(IPermisoModuloRepository):
                 setattr(db_permiso, field, value)
 
         try:
-            self.db.commit()
-            self.db.refresh(db_permiso)
+            self.db.flush()
             
             # Cargar la relación con el rol
             return (
@@ -145,14 +141,12 @@ class PermisoModuloRepository(IPermisoModuloRepository):
                 .first()
             )
         except IntegrityError as e:
-            self.db.rollback()
             if "uq_rol_modulo" in str(e.orig).lower() or "unique constraint" in str(e.orig).lower():
                 modulo_value = update_data.get('modulo', db_permiso.modulo)
                 modulo_name = modulo_value.value if hasattr(modulo_value, 'value') else modulo_value
                 raise AlreadyExistsError(f"El rol ya tiene permisos asignados para el módulo '{modulo_name}'.")
             raise RepositoryError("Error de integridad en la base de datos.") from e
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al actualizar el permiso de módulo.") from e
 
     def soft_delete(self, permiso_id: int) -> Optional[PermisoModulo]:
@@ -171,8 +165,7 @@ class PermisoModuloRepository(IPermisoModuloRepository):
         db_permiso.updated_at = datetime.now()
         
         try:
-            self.db.commit()
-            self.db.refresh(db_permiso)
+            self.db.flush()
             
             return db_permiso
         except SQLAlchemyError as e:
@@ -188,8 +181,7 @@ class PermisoModuloRepository(IPermisoModuloRepository):
                 "updated_at": datetime.now()
             })
             
-            self.db.commit()
+            self.db.flush()
             return True
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al eliminar los permisos de un rol.") from e
@@ -53,15 +53,12 @@ class RolRepository(IRolRepository):
             )
             
             self.db.add(db_rol)
-            self.db.commit()
-            self.db.refresh(db_rol)
+            self.db.flush()
             
             return db_rol
         except IntegrityError as e:
-            self.db.rollback()
             raise AlreadyExistsError(f"Ya existe un rol con el nombre '{rol_data.nombre}'.") from e
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al crear el rol.") from e
 
     def update(self, rol_id: int, rol_data: RolUpdate) -> Optional[Rol]:
@@ -82,16 +79,13 @@ class RolRepository(IRolRepository):
                 setattr(db_rol, field, value)
 
         try:
-            self.db.commit()
-            self.db.refresh(db_rol)
+            self.db.flush()
             return db_rol
         except IntegrityError as e:
-            self.db.rollback()
             if "unique constraint" in str(e.orig).lower() or "uq_" in str(e.orig).lower() or "nombre" in str(e.orig).lower():
                 raise AlreadyExistsError(f"Ya existe un rol con el nombre '{rol_data.nombre}'.")
             raise RepositoryError("Error de integridad en la base de datos.") from e
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al actualizar el rol.") from e
 
     def soft_delete(self, rol_id: int) -> Optional[Rol]:
@@ -109,11 +103,9 @@ class RolRepository(IRolRepository):
         db_rol.deleted_at = func.now()
         
         try:
-            self.db.commit()
-            self.db.refresh(db_rol)
+            self.db.flush()
             return db_rol
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("No se pudo eliminar el rol.") from e
 
     def get_with_permisos(self, rol_id: int) -> Optional[Rol]:
@@ -89,8 +89,7 @@ class SesionRepository(ISesionRepository):
         
         try:
             self.db.add(db_sesion)
-            self.db.commit()
-            self.db.refresh(db_sesion)
+            self.db.flush()
             
             return (
                 self.db.query(SesionUsuario)
@@ -99,10 +98,8 @@ class SesionRepository(ISesionRepository):
                 .first()
             )
         except IntegrityError as e:
-            self.db.rollback()
             raise AlreadyExistsError("El token de sesión ya existe.") from e
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al crear la sesión.") from e
 
     def update(self, sesion_id: int, update_data: dict) -> Optional[SesionUsuario]:
@@ -123,13 +120,11 @@ class SesionRepository(ISesionRepository):
             # Actualizar timestamp
             db_sesion.updated_at = datetime.now()
             
-            self.db.commit()
-            self.db.refresh(db_sesion)
+            self.db.flush()
             
             return db_sesion
             
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al actualizar la sesión.") from e
 
     def soft_delete(self, sesion_id: int) -> Optional[SesionUsuario]:
@@ -147,8 +142,7 @@ class SesionRepository(ISesionRepository):
         db_sesion.is_active = False
         db_sesion.updated_at = datetime.now()
         
-        self.db.commit()
-        self.db.refresh(db_sesion)
+        self.db.flush()
         
         return db_sesion
 
@@ -167,27 +161,24 @@ class SesionRepository(ISesionRepository):
         db_sesion.is_active = False
         db_sesion.updated_at = datetime.now()
         
-        self.db.commit()
-        self.db.refresh(db_sesion)
+        self.db.flush()
         
         return db_sesion
 
     def invalidate_all_by_usuario_id(self, usuario_id: int) -> bool:
         """Invalida  todas las sesiones de un usuario"""
         try:
-            self.db.query(SesionUsuario).filter(
-                SesionUsuario.id_usuario == usuario_id
-            ).filter(
-                SesionUsuario.is_active == True
-            ).update({
-                "is_active": False,
-                "updated_at": datetime.now()
-            })
-            
-            self.db.commit()
+            with self.db.begin_nested():
+                self.db.query(SesionUsuario).filter(
+                    SesionUsuario.id_usuario == usuario_id
+                ).filter(
+                    SesionUsuario.is_active == True
+                ).update({
+                    "is_active": False,
+                    "updated_at": datetime.now()
+                })
             return True
         except Exception:
-            self.db.rollback()
             return False
 
     def cleanup_expired_sessions(self) -> int:
@@ -202,8 +193,7 @@ class SesionRepository(ISesionRepository):
                 "updated_at": datetime.now()
             })
             
-            self.db.commit()
+            self.db.flush()
             return expired_count
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al limpiar las sesiones expiradas.") from e
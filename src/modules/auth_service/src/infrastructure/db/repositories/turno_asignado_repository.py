@@ -48,14 +48,11 @@ class TurnoAsignadoRepository(ITurnoAsignadoRepository):
         )
         try:
             self.db.add(db_asignacion)
-            self.db.commit()
-            self.db.refresh(db_asignacion)
+            self.db.flush()
             return db_asignacion
         except IntegrityError as e:
-            self.db.rollback()
             raise AlreadyExistsError("Asignación duplicada.") from e
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al asignar el turno.") from e
 
     def remover(self, id_usuario: int, id_turno_externo: int) -> bool:
@@ -73,8 +70,7 @@ class TurnoAsignadoRepository(ITurnoAsignadoRepository):
                 raise NotFoundError("Asignación de turno no encontrada.")
                 
             self.db.delete(db_asignacion)
-            self.db.commit()
+            self.db.flush()
             return True
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al remover el turno.") from e
\ No newline at end of file
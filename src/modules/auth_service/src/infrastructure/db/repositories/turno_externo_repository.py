@@ -11,7 +11,9 @@ from src.modules.auth_service.src.infrastructure.db.models import TurnoORM
 # (Ajusta la ruta a TurnoORM si es diferente)
 
 from src.shared.exceptions import RepositoryError
+from src.shared.read_replica import lecturas_en_replica
 
+@lecturas_en_replica
 class TurnoExternaRepository(ITurnoExternaRepository):
     
     def __init__(self, db: Session):
@@ -75,14 +75,11 @@ class UsuarioRepository(IUsuarioRepository):
             )
 
             self.db.add(db_usuario)
-            self.db.commit()
-            self.db.refresh(db_usuario)
+            self.db.flush()
             return db_usuario
         except IntegrityError as e:
-            self.db.rollback()
             raise AlreadyExistsError("El usuario ya existe.") from e
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al crear el usuario.") from e
 
     def update(self, usuario_id: int, usuario_data: UsuarioUpdate) -> Usuario:
@@ -94,18 +91,15 @@ class UsuarioRepository(IUsuarioRepository):
             setattr(usuario, field, value)
 
         try:
-            self.db.commit()
-            self.db.refresh(usuario)
+            self.db.flush()
             return usuario
         except IntegrityError as e:
-            self.db.rollback()
             if "unique constraint" in str(e.orig).lower():
                 raise AlreadyExistsError(
                     f"El usuario '{usuario_data.username}' ya existe."
                 )
             raise RepositoryError("Error de integridad en la base de datos.") from e
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error inesperado al actualizar el usuario.") from e
 
     def soft_delete(self, usuario_id: int) -> Usuario:
@@ -115,11 +109,9 @@ class UsuarioRepository(IUsuarioRepository):
         usuario.is_active = False
         usuario.deleted_at = func.now()
         try:
-            self.db.commit()
-            self.db.refresh(usuario)
+            self.db.flush()
             return usuario
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("No se pudo eliminar el usuario.") from e
 
     def authenticate(self, username: str, password: str) -> Optional[Usuario]:
@@ -133,9 +125,7 @@ class UsuarioRepository(IUsuarioRepository):
         usuario.last_login = datetime.now()
         usuario.updated_at = datetime.now()
         try:
-            self.db.commit()
-            self.db.refresh(usuario)
+            self.db.flush()
             return usuario
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("No se pudo actualizar el último login.") from e
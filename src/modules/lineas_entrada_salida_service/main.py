@@ -3,7 +3,17 @@ from fastapi import FastAPI
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.routers.control_tara_router import router as control_tara_router
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.routers.lineas_salida_router import router as lineas_salida_router
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.routers.lineas_entrada_router import router as lineas_entrada_router
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.routers.rendimiento_router import router as rendimiento_router
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.routers.productividad_router import router as productividad_router
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.routers.throughput_router import router as throughput_router
+from src.modules.lineas_entrada_salida_service.src.infrastructure.throughput_worker import configure_throughput
+from src.modules.lineas_entrada_salida_service.src.infrastructure.resumen_lineas_worker import configure_resumen_lineas
+from src.shared.common.exception_handlers import domain_exception_handler
 from src.shared.cors_config import configure_cors
+from src.shared.database import engine_replica
+from src.shared.exceptions import DomainError
+from src.shared.jobs import configure_jobs
+from src.shared.read_replica import configure_read_replica
 
 app = FastAPI(
     title="Lineas Entrada-Salida API",
@@ -14,9 +24,27 @@ app = FastAPI(
 # Configurar CORS}
 configure_cors(app, "Linea Entrada-Salida Service")
 
+# Manejador global de excepciones de dominio
+app.add_exception_handler(DomainError, domain_exception_handler)
+
+# kg/hora en vivo por línea, agregado en memoria por un hilo de fondo
+configure_throughput(app)
+
+# Conteo y kg por (línea, día, lote) mantenidos en la base de auth por un hilo de fondo
+configure_resumen_lineas(app)
+
+# Reportes pesados en un pool acotado: /api/jobs/{id} para estado, descarga y cancelación
+configure_jobs(app)
+
+# Lecturas de repositorio a la réplica, con read-your-writes tras una escritura
+configure_read_replica(app, engine_replica)
+
 app.include_router(lineas_entrada_router, prefix="/api/lineas-entrada", tags=["Lineas Entrada"])
 app.include_router(lineas_salida_router, prefix="/api/lineas-salida", tags=["Lineas Salida"])
 app.include_router(control_tara_router, prefix="/api/control-tara", tags=["Control Tara"])
+app.include_router(rendimiento_router, prefix="/api/rendimiento", tags=["Rendimiento"])
+app.include_router(productividad_router, prefix="/api/productividad", tags=["Productividad"])
+app.include_router(throughput_router, prefix="/api/lineas", tags=["Throughput"])
 
 @app.get("/health")
 async def health_check():
@@ -1,12 +1,13 @@
 from abc import ABC, abstractmethod
 from typing import Optional, List
 
-from src.modules.lineas_entrada_salida_service.src.domain.entities import ControlMiga
+from src.modules.lineas_entrada_salida_service.src.domain.entities import ControlMiga, ControlMigaUpsert
 
 
 class IControlMigaRepository(ABC):
     @abstractmethod
-    def create(self, linea_num: int, registro: int, p_miga: float, porcentaje: float) -> ControlMiga:
+    def create_many(self, linea_num: int, rows: list[tuple[int, float, float]]) -> List[ControlMiga]:
+        """rows: (registro, p_miga, porcentaje) por cada miga a insertar."""
         pass
 
     @abstractmethod
@@ -14,7 +15,8 @@ class IControlMigaRepository(ABC):
         pass
 
     @abstractmethod
-    def update(self, id: int, p_miga: float, porcentaje: float) -> Optional[ControlMiga]:
+    def upsert(self, linea_num: int, registro: int, p_miga: float, porcentaje: float) -> ControlMigaUpsert:
+        """Crea o actualiza la miga de (linea_num, registro) en una sola sentencia."""
         pass
 
     @abstractmethod
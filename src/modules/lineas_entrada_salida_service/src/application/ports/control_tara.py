@@ -18,6 +18,10 @@ class IControlTaraRepository(ABC):
     def get_by_id(self, tara_id: int) -> Optional[ControlTara]:
         pass
 
+    @abstractmethod
+    def get_by_ids(self, tara_ids: list[int]) -> list[ControlTara]:
+        pass
+
     @abstractmethod
     def soft_delete(self, tara_id: int) -> bool:
         pass
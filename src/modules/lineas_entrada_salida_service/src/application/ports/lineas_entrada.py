@@ -1,7 +1,8 @@
 from abc import abstractmethod, ABC
+from datetime import date
 from typing import List, Tuple, Optional
 
-from src.modules.lineas_entrada_salida_service.src.domain.entities import LineasEntrada
+from src.modules.lineas_entrada_salida_service.src.domain.entities import LineasEntrada, SecuenciaEntrada
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_entrada import LineasEntradaUpdate
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_shared import \
     LineasFilters
@@ -34,4 +35,23 @@ class ILineasEntradaRepository(ABC):
 
     @abstractmethod
     def get_all_by_filters(self, filters: LineasFilters, linea_num: int) -> List[LineasEntrada]:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_incidencias_secuencia(self, linea_num: int, fecha: date, lote: Optional[str]) -> List[SecuenciaEntrada]:
+        """Pesajes del día con hueco, duplicado, desorden o código no numérico en secuencia o parrilla."""
+        pass
+
+    @abstractmethod
+    def get_secuencias_en_conflicto(
+            self, linea_num: int, fecha: date, lote: Optional[str], desde: int, hasta: int, valor: int
+    ) -> List[int]:
+        """Secuencias fuera de [desde, hasta] que ya están en [desde + valor, hasta + valor]."""
+        pass
+
+    @abstractmethod
+    def renumerar_secuencia(
+            self, linea_num: int, fecha: date, lote: Optional[str], desde: int, hasta: int, valor: int
+    ) -> List[Tuple[int, str, str]]:
+        """Suma `valor` a secuencia y parrilla de las secuencias [desde, hasta]; devuelve (id, secuencia, parrilla)."""
+        pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Tuple, List, Optional
+from typing import Any, Iterator, Mapping, Tuple, List, Optional
 
 from src.modules.lineas_entrada_salida_service.src.domain.entities import LineasSalida
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_shared import LineasFilters
@@ -16,10 +16,19 @@ class ILineasSalidaRepository(ABC):
     def get_by_id(self, linea_id: int, linea_num: int) -> Optional[LineasSalida]:
         pass
 
+    @abstractmethod
+    def get_by_ids(self, linea_num: int, ids: list[int]) -> List[LineasSalida]:
+        pass
+
     @abstractmethod
     def get_all_by_filters(self, filters: LineasFilters, linea_num: int) -> List[LineasSalida]:
         pass
 
+    @abstractmethod
+    def iter_all_by_filters(self, filters: LineasFilters, linea_num: int,
+                            chunk_size: int) -> Iterator[List[LineasSalida]]:
+        pass
+
     @abstractmethod
     def update(self, linea_id: int, linea_salida_data: LineasSalidaUpdate, linea_num: int) -> Optional[LineasSalida]:
         pass
@@ -50,4 +59,14 @@ class ILineasSalidaRepository(ABC):
 
     @abstractmethod
     def update_lote_by_ids(self, linea_num: int, ids: list[int], lote: str) -> list[LineasSalida]:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def agregar_tara_batch(
+            self, linea_num: int, tara_kg: float, ids: Optional[list[int]], filtros: Mapping[str, Any]
+    ) -> list[Tuple[LineasSalida, Optional[float]]]:
+        """
+        Resta la tara a los registros de `ids`, o a los que cumplan `filtros`
+        ({columna: valor}), en un solo UPDATE; devuelve (registro actualizado, peso anterior).
+        """
+        pass
@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from typing import Any, Mapping, Optional, Tuple
+
+import numpy as np
+
+
+class IPesosRepository(ABC):
+    """
+    Lectura columnar de peso_kg de una tabla de línea (entrada o salida).
+
+    `filtros` es {columna: valor} por igualdad (fecha_p, p_lote, codigo_obrero),
+    con las claves siempre en ese orden.
+    """
+    tipo: str
+
+    @abstractmethod
+    def get_version(self, linea_num: int, filtros: Mapping[str, Any]) -> Tuple[Optional[int], int, float]:
+        """(max id, registros, suma de peso_kg) de la selección; cambia con cualquier alta, baja o edición."""
+        pass
+
+    @abstractmethod
+    def get_pesos(self, linea_num: int, filtros: Mapping[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Ids (int64) y pesos (float64) de la selección, en arreglos alineados."""
+        pass
+
+    @abstractmethod
+    def get_rango(self, linea_num: int, filtros: Mapping[str, Any]) -> Tuple[int, Optional[float], Optional[float]]:
+        """(registros con peso, mínimo, máximo) de la selección."""
+        pass
+
+    @abstractmethod
+    def get_buckets(
+            self, linea_num: int, filtros: Mapping[str, Any], minimo: float, ancho: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Índices de bucket floor((peso - minimo) / ancho) presentes y su conteo."""
+        pass
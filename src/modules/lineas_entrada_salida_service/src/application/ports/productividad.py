@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import List, Tuple, Dict
+
+from src.modules.lineas_entrada_salida_service.src.domain.entities import ProductividadOperario, OperarioAsignacion
+
+
+class IProductividadRepository(ABC):
+    @abstractmethod
+    def get_ranking(
+            self, fecha_desde: date, fecha_hasta: date, lineas: list[int], orden: str, page: int, page_size: int
+    ) -> Tuple[List[ProductividadOperario], int]:
+        """Página del ranking de operarios ordenado por `orden` y total de operarios rankeados."""
+        pass
+
+    @abstractmethod
+    def get_asignaciones(self, codigos: list[str]) -> Dict[str, OperarioAsignacion]:
+        pass
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import List, Optional
+
+from src.modules.lineas_entrada_salida_service.src.domain.entities import TotalesLote, SubproductosLote, \
+    LinajeParrilla
+
+
+class IRendimientoRepository(ABC):
+    @abstractmethod
+    def get_totales_entrada(self, fecha_desde: date, fecha_hasta: date, lineas: list[int]) -> List[TotalesLote]:
+        pass
+
+    @abstractmethod
+    def get_totales_salida(self, fecha_desde: date, fecha_hasta: date, lineas: list[int]) -> List[TotalesLote]:
+        pass
+
+    @abstractmethod
+    def get_subproductos(self, fecha_desde: date, fecha_hasta: date, lineas: list[int]) -> List[SubproductosLote]:
+        pass
+
+    @abstractmethod
+    def get_linaje_parrillas(self, linea_num: int, p_lote: str, fecha_p: Optional[date]) -> List[LinajeParrilla]:
+        pass
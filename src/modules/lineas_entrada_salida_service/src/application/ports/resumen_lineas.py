@@ -0,0 +1,65 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+from src.modules.lineas_entrada_salida_service.src.domain.entities import TotalesLote
+
+
+class IResumenLineasRepository(ABC):
+    """Resumen diario por (linea, tipo, fecha_p, lote) y su cursor por tabla, en la base de auth."""
+
+    @abstractmethod
+    def get_cursor(self, tipo: str, linea_num: int) -> Optional[int]:
+        pass
+
+    @abstractmethod
+    def get_cursores(self, tipo: str, lineas: list[int]) -> Dict[int, int]:
+        pass
+
+    @abstractmethod
+    def avanzar_cursor(self, tipo: str, linea_num: int, anterior: Optional[int], nuevo: int) -> bool:
+        pass
+
+    @abstractmethod
+    def sumar(self, tipo: str, totales: Sequence[TotalesLote]) -> None:
+        pass
+
+    @abstractmethod
+    def reemplazar_desde(self, tipo: str, linea_num: int, fecha_desde: date, totales: Sequence[TotalesLote]) -> None:
+        pass
+
+    @abstractmethod
+    def contar(self, tipo: str, linea_num: int, fecha_desde: date, fecha_hasta: date,
+               lotes: Optional[List[str]]) -> int:
+        pass
+
+    @abstractmethod
+    def get_totales(self, tipo: str, lineas: list[int], fecha_desde: date, fecha_hasta: date) -> List[TotalesLote]:
+        pass
+
+
+class IResumenFuenteRepository(ABC):
+    """Lecturas sobre las tablas reg_linea_* que alimentan el resumen y completan lo aún no volcado."""
+
+    @abstractmethod
+    def get_max_id(self, tipo: str, linea_num: int) -> int:
+        pass
+
+    @abstractmethod
+    def get_totales_por_ids(self, tipo: str, linea_num: int, desde_id: int, hasta_id: int) -> List[TotalesLote]:
+        pass
+
+    @abstractmethod
+    def get_totales_desde_fecha(self, tipo: str, linea_num: int, fecha_desde: date,
+                                hasta_id: int) -> List[TotalesLote]:
+        pass
+
+    @abstractmethod
+    def contar_nuevos(self, tipo: str, linea_num: int, desde_id: int, fecha_desde: date, fecha_hasta: date,
+                      lotes: Optional[List[str]]) -> int:
+        pass
+
+    @abstractmethod
+    def get_totales_nuevos(self, tipo: str, desde_ids: Dict[int, int], fecha_desde: date,
+                           fecha_hasta: date) -> List[TotalesLote]:
+        pass
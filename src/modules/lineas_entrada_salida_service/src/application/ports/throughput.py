@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Tuple
+
+import numpy as np
+
+
+class IThroughputRepository(ABC):
+    """
+    Lectura incremental de pesajes para el throughput en vivo. Los pesajes se
+    devuelven como arreglos alineados (ids int64, minuto desde epoch int64,
+    peso_kg float64) ordenados por id.
+    """
+
+    @abstractmethod
+    def get_max_id(self, tipo: str, linea_num: int) -> int:
+        pass
+
+    @abstractmethod
+    def get_desde(
+            self, tipo: str, linea_num: int, desde: datetime, hasta_id: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Pesajes con fecha >= desde e id <= hasta_id (resincronización)."""
+        pass
+
+    @abstractmethod
+    def get_nuevos(
+            self, tipo: str, linea_num: int, ultimo_id: int, limite: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Hasta `limite` pesajes con id > ultimo_id."""
+        pass
@@ -6,33 +6,35 @@ from typing import Optional, Dict, Any
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_salida import PanzaRequest
 from src.modules.auth_service.src.application.use_cases.audit_use_case import AuditUseCase
 from src.modules.lineas_entrada_salida_service.src.application.ports.lineas_entrada import ILineasEntradaRepository
-from src.modules.lineas_entrada_salida_service.src.domain.entities import LineasEntrada
+from src.modules.lineas_entrada_salida_service.src.application.use_cases.resumen_lineas_use_case import \
+    ResumenLineasUseCase
+from src.modules.lineas_entrada_salida_service.src.domain.entities import LineasEntrada, SecuenciaEntrada
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_entrada import \
-    LineasEntradaPaginatedResponse, LineasEntradaUpdate, LineasEntradaResponse
+    LineasEntradaPaginatedResponse, LineasEntradaUpdate, LineasEntradaResponse, SecuenciaFilters, \
+    RenumerarSecuenciaRequest
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_shared import \
     LineasPagination, LineasFilters
+from src.shared.config import settings
 from src.shared.exceptions import NotFoundError, ValidationError
 
 
 class LineasEntradaUseCase:
-    def __init__(self, lineas_entrada_repository: ILineasEntradaRepository, audit_use_case: AuditUseCase):
+    def __init__(self, lineas_entrada_repository: ILineasEntradaRepository, audit_use_case: AuditUseCase,
+                 resumen_lineas: Optional[ResumenLineasUseCase] = None):
         self.lineas_entrada_repository = lineas_entrada_repository
         self.audit_use_case = audit_use_case
+        self.resumen_lineas = resumen_lineas
 
     def _numero_en_letras(self, numero: int) -> str:
-        mapping = {
-            1: "uno",
-            2: "dos",
-            3: "tres",
-            4: "cuatro",
-            5: "cinco",
-            6: "seis"
-        }
-        return mapping.get(numero, "desconocido")
+        return settings.lineas_produccion.get(numero, "desconocido")
 
     def _modelo_auditoria(self, linea_num: int) -> str:
         return f"reg_linea_{self._numero_en_letras(linea_num)}_entrada"
 
+    def _ajustar_resumen(self, linea_num: int, anteriores: list, nuevas: list) -> None:
+        if self.resumen_lineas is not None:
+            self.resumen_lineas.ajustar("entrada", linea_num, anteriores, nuevas)
+
     def get_lineas_entrada_paginated_by_filters(self, filters: LineasPagination, linea_num: int) -> LineasEntradaPaginatedResponse:
         data, total_records = self.lineas_entrada_repository.get_paginated_by_filters(
             filters=filters,
@@ -57,6 +59,7 @@ class LineasEntradaUseCase:
     def update_linea_entrada(self, linea_id: int, linea_entrada_data: LineasEntradaUpdate, linea_num: int, user_data: Dict[str, Any]) -> Optional[LineasEntrada]:
         linea_entrada = self.lineas_entrada_repository.get_by_id(linea_id, linea_num)
         updated_linea_entrada = self.lineas_entrada_repository.update(linea_id, linea_entrada_data, linea_num)
+        self._ajustar_resumen(linea_num, [linea_entrada], [updated_linea_entrada])
         self.audit_use_case.log_action(
             accion="UPDATE",
             user_id=user_data.get("user_id"),
@@ -80,7 +83,9 @@ class LineasEntradaUseCase:
             datos_anteriores=LineasEntradaResponse.model_validate(linea_entrada).model_dump(mode="json")
         )
 
-        return self.lineas_entrada_repository.remove(linea_id, linea_num)
+        removed = self.lineas_entrada_repository.remove(linea_id, linea_num)
+        self._ajustar_resumen(linea_num, [linea_entrada], [])
+        return removed
 
     def update_codigo_parrilla(self, linea_id: int, linea_num: int, valor: int, user_data: Dict[str, Any]):
         linea = self.lineas_entrada_repository.get_by_id(linea_id, linea_num)
@@ -133,6 +138,7 @@ class LineasEntradaUseCase:
             })
 
         lineas_actualizadas = self.lineas_entrada_repository.agregar_panzas(items_para_actualizar)
+        self._ajustar_resumen(linea_num, lineas, lineas_actualizadas)
 
         logs_batch = []
         for updated_linea in lineas_actualizadas:
@@ -152,4 +158,112 @@ class LineasEntradaUseCase:
         return len(lineas_actualizadas)
 
     def count_lineas_entrada(self, filters: LineasFilters, linea_num: int) -> int:
-        return self.lineas_entrada_repository.count_by_filters(filters, linea_num)
\ No newline at end of file
+        if self.resumen_lineas is not None:
+            total = self.resumen_lineas.contar("entrada", linea_num, filters)
+            if total is not None:
+                return total
+        return self.lineas_entrada_repository.count_by_filters(filters, linea_num)
+
+    @staticmethod
+    def _incidencias(linea: SecuenciaEntrada, campo: str) -> list[Dict[str, Any]]:
+        valor = getattr(linea, campo)
+        anterior = getattr(linea, f"{campo}_anterior")
+        repeticiones = getattr(linea, f"repeticiones_{campo}")
+        base = {
+            "id": linea.id,
+            "fecha": linea.fecha,
+            "hora_inicio": linea.hora_inicio,
+            "p_lote": linea.p_lote,
+            "campo": campo,
+            "codigo": getattr(linea, f"codigo_{campo}"),
+            "anterior": anterior,
+            "siguiente": getattr(linea, f"{campo}_siguiente"),
+            "repeticiones": repeticiones,
+        }
+        if valor is None:
+            return [{**base, "tipo": "invalido"}]
+
+        incidencias = []
+        if repeticiones > 1:
+            incidencias.append({**base, "tipo": "duplicado"})
+        if anterior is not None and valor - anterior > 1:
+            incidencias.append({**base, "tipo": "hueco", "faltantes": valor - anterior - 1})
+        elif anterior is not None and valor < anterior:
+            incidencias.append({**base, "tipo": "desorden"})
+        return incidencias
+
+    def analizar_secuencia(self, linea_num: int, filters: SecuenciaFilters) -> Dict[str, Any]:
+        lineas = self.lineas_entrada_repository.get_incidencias_secuencia(linea_num, filters.fecha, filters.lote)
+        data = [
+            incidencia
+            for linea in lineas
+            for campo in ("secuencia", "parrilla")
+            for incidencia in self._incidencias(linea, campo)
+        ]
+        conteo = {tipo: 0 for tipo in ("invalido", "duplicado", "hueco", "desorden")}
+        for incidencia in data:
+            conteo[incidencia["tipo"]] += 1
+
+        return {
+            "resumen": {
+                "linea": linea_num,
+                "fecha": filters.fecha,
+                "lote": filters.lote,
+                "incidencias": len(data),
+                "invalidos": conteo["invalido"],
+                "duplicados": conteo["duplicado"],
+                "huecos": conteo["hueco"],
+                "faltantes": sum(incidencia.get("faltantes") or 0 for incidencia in data),
+                "desordenes": conteo["desorden"],
+            },
+            "data": data,
+        }
+
+    def renumerar_secuencia(self, linea_num: int, data: RenumerarSecuenciaRequest, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        if data.valor == 0:
+            raise ValidationError("El valor no puede ser cero.")
+        if data.desde > data.hasta:
+            raise ValidationError("El inicio del rango no puede ser mayor que el final.")
+        if data.desde + data.valor < 1:
+            raise ValidationError("La renumeración dejaría códigos de secuencia menores que 1.")
+        conflictos = self.lineas_entrada_repository.get_secuencias_en_conflicto(
+            linea_num, data.fecha, data.lote, data.desde, data.hasta, data.valor
+        )
+        if conflictos:
+            raise ValidationError(
+                "La renumeración duplicaría secuencias que ya existen fuera del rango: "
+                f"{', '.join(map(str, conflictos))}."
+            )
+
+        actualizados = self.lineas_entrada_repository.renumerar_secuencia(
+            linea_num, data.fecha, data.lote, data.desde, data.hasta, data.valor
+        )
+        if not actualizados:
+            raise NotFoundError("No se encontraron registros en el rango de secuencia indicado.")
+
+        ids = sorted(linea_id for linea_id, _, _ in actualizados)
+        # Rango real: dentro de [desde, hasta] puede haber huecos en los extremos
+        secuencias = [int(secuencia) for _, secuencia, _ in actualizados]
+        nuevo_desde, nuevo_hasta = min(secuencias), max(secuencias)
+        rango = {"fecha": data.fecha.isoformat(), "lote": data.lote, "ids": ids}
+        # Un solo registro de auditoría para todo el rango, no uno por pesaje
+        self.audit_use_case.log_action(
+            accion="UPDATE",
+            user_id=user_data.get("user_id"),
+            modelo=self._modelo_auditoria(linea_num),
+            entidad_id=f"{data.fecha.isoformat()}:{nuevo_desde}-{nuevo_hasta}",
+            datos_nuevos={
+                **rango,
+                "desde": nuevo_desde,
+                "hasta": nuevo_hasta,
+                "valor": data.valor,
+                "registros": len(ids),
+            },
+            datos_anteriores={**rango, "desde": nuevo_desde - data.valor, "hasta": nuevo_hasta - data.valor},
+        )
+        return {
+            "registros": len(ids),
+            "desde": nuevo_desde,
+            "hasta": nuevo_hasta,
+            "ids": ids,
+        }
@@ -1,40 +1,41 @@
+from collections import Counter
+from dataclasses import replace
 from decimal import Decimal, ROUND_HALF_UP
 from math import ceil
-from typing import Optional, Dict, Any, List
+from typing import Iterator, Optional, Dict, Any, List
 import logging
 
+import numpy as np
+
 from src.modules.lineas_entrada_salida_service.src.application.ports.control_miga import IControlMigaRepository
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_salida import \
-    LineasSalidaMigaResponse, MigaResponse, LineasSalidaMigaPaginatedResponse, MigaRequest
+    LineasSalidaMigaResponse, MigaResponse, LineasSalidaMigaPaginatedResponse, MigaRequest, MigaBatchRequest
 from src.modules.auth_service.src.application.use_cases.audit_use_case import AuditUseCase
 from src.modules.lineas_entrada_salida_service.src.application.ports.control_tara import IControlTaraRepository
 from src.modules.lineas_entrada_salida_service.src.application.ports.lineas_salida import ILineasSalidaRepository
-from src.modules.lineas_entrada_salida_service.src.domain.entities import LineasSalida
+from src.modules.lineas_entrada_salida_service.src.application.use_cases.resumen_lineas_use_case import \
+    ResumenLineasUseCase
+from src.modules.lineas_entrada_salida_service.src.domain.entities import LineasSalida, ControlMiga
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_shared import LineasPagination, \
     LineasFilters
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_salida import \
-    LineasSalidaPaginatedResponse, LineasSalidaUpdate, LineasSalidaResponse, PanzaRequest
+    LineasSalidaPaginatedResponse, LineasSalidaUpdate, LineasSalidaResponse, PanzaRequest, TaraBatchRequest
+from src.shared.config import settings
 from src.shared.exceptions import NotFoundError, ValidationError
 
 
 class LineasSalidaUseCase:
     def __init__(self, lineas_salida_repository: ILineasSalidaRepository,
-                 control_tara_repository: IControlTaraRepository, audit_use_case: AuditUseCase, control_miga_repository: IControlMigaRepository):
+                 control_tara_repository: IControlTaraRepository, audit_use_case: AuditUseCase, control_miga_repository: IControlMigaRepository,
+                 resumen_lineas: Optional[ResumenLineasUseCase] = None):
         self.lineas_salida_repository = lineas_salida_repository
         self.control_tara_repository = control_tara_repository
         self.audit_use_case = audit_use_case
         self.control_miga_repository = control_miga_repository
+        self.resumen_lineas = resumen_lineas
 
     def _numero_en_letras(self, numero: int) -> str:
-        mapping = {
-            1: "uno",
-            2: "dos",
-            3: "tres",
-            4: "cuatro",
-            5: "cinco",
-            6: "seis"
-        }
-        return mapping.get(numero, "desconocido")
+        return settings.lineas_produccion.get(numero, "desconocido")
 
     def _empty_response(self, filters: LineasPagination) -> LineasSalidaMigaPaginatedResponse:
         return {
@@ -48,6 +49,10 @@ class LineasSalidaUseCase:
     def _modelo_auditoria(self, linea_num: int) -> str:
         return f"reg_linea_{self._numero_en_letras(linea_num)}_salida"
 
+    def _ajustar_resumen(self, linea_num: int, anteriores: list, nuevas: list) -> None:
+        if self.resumen_lineas is not None:
+            self.resumen_lineas.ajustar("salida", linea_num, anteriores, nuevas)
+
     def get_lineas_salida_paginated_by_filters(self, filters: LineasPagination,
                                                linea_num: int) -> LineasSalidaPaginatedResponse:
         data, total_records = self.lineas_salida_repository.get_paginated_by_filters(
@@ -133,11 +138,33 @@ class LineasSalidaUseCase:
         if not lineas:
             return self._empty_response(filters)
 
-        registro_ids = [linea.id for linea in lineas]
+        data_response = self._con_miga(lineas, linea_num)
 
+        actual_count = len(data_response)
+
+        return {
+            "total_records": actual_count,
+            "total_pages": ceil(total_records / filters.page_size),
+            "page": filters.page,
+            "page_size": filters.page_size,
+            "data": data_response
+        }
+
+    def iter_lineas_salida_miga_report(
+            self,
+            filters: LineasFilters,
+            linea_num: int,
+            chunk_size: int = 1000
+    ) -> Iterator[List[LineasSalidaMigaResponse]]:
+        """Reporte de miga completo (sin paginar), por bloques de `chunk_size` registros de línea."""
+        for lineas in self.lineas_salida_repository.iter_all_by_filters(filters, linea_num, chunk_size):
+            yield self._con_miga(lineas, linea_num)
+
+    def _con_miga(self, lineas: List[LineasSalida], linea_num: int) -> List[LineasSalidaMigaResponse]:
+        """Los registros que tienen miga, con su p_miga y porcentaje; el resto se omite."""
         migas_list = self.control_miga_repository.get_by_registros_bulk(
             linea_num=linea_num,
-            registros=registro_ids
+            registros=[linea.id for linea in lineas]
         )
 
         migas_map = {miga.registro: miga for miga in migas_list}
@@ -163,16 +190,7 @@ class LineasSalidaUseCase:
                         porcentaje=miga.porcentaje
                     )
                 )
-
-        actual_count = len(data_response)
-
-        return {
-            "total_records": actual_count,
-            "total_pages": ceil(total_records / filters.page_size),
-            "page": filters.page,
-            "page_size": filters.page_size,
-            "data": data_response
-        }
+        return data_response
 
     def get_linea_salida_by_id(self, linea_id: int, linea_num: int) -> Optional[LineasSalida]:
         return self.lineas_salida_repository.get_by_id(linea_id, linea_num)
@@ -181,6 +199,7 @@ class LineasSalidaUseCase:
                             user_data: Dict[str, Any]) -> Optional[LineasSalida]:
         linea_salida = self.lineas_salida_repository.get_by_id(linea_id, linea_num)
         updated_linea_salida = self.lineas_salida_repository.update(linea_id, linea_salida_data, linea_num)
+        self._ajustar_resumen(linea_num, [linea_salida], [updated_linea_salida])
         self.audit_use_case.log_action(
             accion="UPDATE",
             user_id=user_data.get("user_id"),
@@ -205,7 +224,9 @@ class LineasSalidaUseCase:
             datos_anteriores=LineasSalidaResponse.model_validate(linea_salida).model_dump(mode="json")
         )
 
-        return self.lineas_salida_repository.remove(linea_id, linea_num)
+        removed = self.lineas_salida_repository.remove(linea_id, linea_num)
+        self._ajustar_resumen(linea_num, [linea_salida], [])
+        return removed
 
     def agregar_tara(self, linea_id: int, linea_num: int, tara_id: int, user_data: Dict[str, Any]) -> Optional[
         LineasSalida]:
@@ -230,6 +251,7 @@ class LineasSalidaUseCase:
             linea_num,
             float(nuevo_peso)
         )
+        self._ajustar_resumen(linea_num, [linea], [updated_linea_salida])
 
         self.audit_use_case.log_action(
             accion="UPDATE",
@@ -242,6 +264,63 @@ class LineasSalidaUseCase:
 
         return updated_linea_salida
 
+    def agregar_tara_batch(self, linea_num: int, data: TaraBatchRequest, user_data: Dict[str, Any]) -> int:
+        """
+        Resta una tara a muchos registros con un solo UPDATE. El lote es
+        atómico: si algún peso no quedaría mayor que cero, o falta alguno de los
+        ids, se lanza la excepción y la unidad de trabajo revierte el UPDATE.
+        """
+        if data.ids is None and data.fecha is None and not data.lote:
+            raise ValidationError("Indique los ids o al menos la fecha o el lote de los registros.")
+        if data.ids is not None and (data.fecha is not None or data.lote):
+            raise ValidationError("Indique los ids o la fecha/lote, no ambos.")
+
+        tara = self.control_tara_repository.get_by_id(data.tara_id)
+        if tara is None:
+            raise NotFoundError("La tara no existe")
+
+        ids = sorted(set(data.ids)) if data.ids is not None else None
+        filtros = {}
+        if data.fecha is not None:
+            filtros["fecha_p"] = data.fecha
+        if data.lote:
+            filtros["p_lote"] = data.lote
+
+        actualizados = self.lineas_salida_repository.agregar_tara_batch(linea_num, tara.peso_kg, ids, filtros)
+        if not actualizados:
+            raise NotFoundError("No se encontraron registros con los filtros proporcionados.")
+        if ids is not None and len(actualizados) != len(ids):
+            encontrados = {linea.id for linea, _ in actualizados}
+            raise NotFoundError(f"Las líneas de salida no existen: {[i for i in ids if i not in encontrados]}")
+
+        no_positivos = sorted(linea.id for linea, _ in actualizados if linea.peso_kg is None or linea.peso_kg <= 0)
+        if no_positivos:
+            raise ValidationError(f"El peso debe quedar mayor que cero en los registros: {no_positivos}")
+
+        self._ajustar_resumen(
+            linea_num,
+            [replace(linea, peso_kg=peso_anterior) for linea, peso_anterior in actualizados],
+            [linea for linea, _ in actualizados],
+        )
+
+        logs_batch = []
+        for linea, peso_anterior in actualizados:
+            datos_nuevos = LineasSalidaResponse.model_validate(linea).model_dump(mode="json")
+            logs_batch.append({
+                "accion": "UPDATE",
+                "modelo": self._modelo_auditoria(linea_num),
+                "entidad_id": linea.id,
+                "datos_nuevos": datos_nuevos,
+                "datos_anteriores": {**datos_nuevos, "peso_kg": peso_anterior},
+            })
+
+        self.audit_use_case.log_actions_batch(
+            logs=logs_batch,
+            user_id=user_data.get("user_id")
+        )
+
+        return len(actualizados)
+
     def update_codigo_parrilla(self, linea_id: int, linea_num: int, valor: int, user_data: Dict[str, Any]):
         linea = self.lineas_salida_repository.get_by_id(linea_id, linea_num)
 
@@ -261,6 +340,10 @@ class LineasSalidaUseCase:
         return updated
 
     def count_lineas_salida(self, filters: LineasFilters, linea_num: int) -> int:
+        if self.resumen_lineas is not None:
+            total = self.resumen_lineas.contar("salida", linea_num, filters)
+            if total is not None:
+                return total
         return self.lineas_salida_repository.count_by_filters(filters, linea_num)
 
     def get_all_by_filters(self, filters: LineasFilters, linea_num: int) -> List[LineasSalida]:
@@ -298,6 +381,7 @@ class LineasSalidaUseCase:
             })
 
         lineas_actualizadas = self.lineas_salida_repository.agregar_panzas(items_para_actualizar)
+        self._ajustar_resumen(linea_num, lineas, lineas_actualizadas)
 
         logs_batch = []
         for updated_linea in lineas_actualizadas:
@@ -321,13 +405,16 @@ class LineasSalidaUseCase:
         if not lote:
             raise ValidationError("El lote no puede estar vacío.")
 
-        lineas_anteriores = {
-            l.id: LineasSalidaResponse.model_validate(l).model_dump(mode="json")
-            for l in self.lineas_salida_repository.get_all_by_filters(
+        previas = [
+            l for l in self.lineas_salida_repository.get_all_by_filters(
                 LineasFilters(),
                 linea_num
             )
             if l.id in ids
+        ]
+        lineas_anteriores = {
+            l.id: LineasSalidaResponse.model_validate(l).model_dump(mode="json")
+            for l in previas
         }
 
         updated = self.lineas_salida_repository.update_lote_by_ids(
@@ -335,6 +422,7 @@ class LineasSalidaUseCase:
             ids=ids,
             lote=lote
         )
+        self._ajustar_resumen(linea_num, previas, updated)
 
         logs = []
         for linea in updated:
@@ -354,7 +442,7 @@ class LineasSalidaUseCase:
 
         return len(updated)
 
-    def create_miga(self, linea_num: int, data: MigaRequest, user_data: Dict[str, Any]) -> LineasSalidaMigaResponse:
+    def _validar_miga(self, data: MigaRequest) -> None:
         if data is None:
             raise ValidationError("Los datos de la miga no pueden estar vacios")
 
@@ -364,51 +452,23 @@ class LineasSalidaUseCase:
         if data.linea_id is None:
             raise ValidationError("El campo linea_id no puede ser nulo")
 
-        miga = self.control_miga_repository.get_by_registro(linea_num, data.linea_id)
-
-        if miga:
-            raise ValidationError("La miga ya existe")
-
-        linea_registro = self.lineas_salida_repository.get_by_id(data.linea_id,linea_num)
-
-        if linea_registro is None:
-            raise NotFoundError("La línea de salida no existe")
-
+    def _porcentaje_miga(self, linea_registro: LineasSalida, data: MigaRequest) -> float:
         if data.tara_id is not None:
             tara = self.control_tara_repository.get_by_id(data.tara_id)
-            if tara is not None:
-                porcentaje = round(
-                    ((linea_registro.peso_kg - tara.peso_kg) -
-                     (data.p_miga - tara.peso_kg)) / linea_registro.peso_kg,
-                    3
-                )
-            else:
+            if tara is None:
                 raise NotFoundError("La tara no existe")
-        else:
-            porcentaje = round(
-                (linea_registro.peso_kg - data.p_miga) / linea_registro.peso_kg,
+            return round(
+                ((linea_registro.peso_kg - tara.peso_kg) -
+                 (data.p_miga - tara.peso_kg)) / linea_registro.peso_kg,
                 3
             )
-
-        nueva_miga = self.control_miga_repository.create(linea_num, data.linea_id, data.p_miga, porcentaje)
-
-        miga_response = MigaResponse(
-            id = nueva_miga.id,
-            linea = nueva_miga.linea,
-            registro = nueva_miga.registro,
-            p_miga = nueva_miga.p_miga,
-            porcentaje = nueva_miga.porcentaje,
-        )
-
-        self.audit_use_case.log_action(
-            accion="CREATE",
-            user_id=user_data.get("user_id"),
-            modelo="control_miga",
-            entidad_id=nueva_miga.id,
-            datos_nuevos=MigaResponse.model_validate(miga_response).model_dump(mode="json")
+        return round(
+            (linea_registro.peso_kg - data.p_miga) / linea_registro.peso_kg,
+            3
         )
 
-        response = LineasSalidaMigaResponse(
+    def _miga_response(self, linea_registro: LineasSalida, miga: ControlMiga) -> LineasSalidaMigaResponse:
+        return LineasSalidaMigaResponse(
             id = linea_registro.id,
             fecha_p = linea_registro.fecha_p,
             fecha = linea_registro.fecha,
@@ -418,89 +478,131 @@ class LineasSalidaUseCase:
             codigo_parrilla = linea_registro.codigo_parrilla,
             codigo_obrero = linea_registro.codigo_obrero,
             guid = linea_registro.guid,
-            p_miga = nueva_miga.p_miga,
-            porcentaje = nueva_miga.porcentaje,
+            p_miga = miga.p_miga,
+            porcentaje = miga.porcentaje,
         )
 
-        return response
+    def create_miga(self, linea_num: int, data: MigaRequest, user_data: Dict[str, Any]) -> LineasSalidaMigaResponse:
+        self._validar_miga(data)
 
-    def update_miga(self, linea_num: int, data: MigaRequest, user_data: Dict[str, Any]) -> LineasSalidaMigaResponse:
-        if data is None:
-            raise ValidationError("Los datos de la miga no pueden estar vacios")
+        linea_registro = self.lineas_salida_repository.get_by_id(data.linea_id,linea_num)
 
-        if data.p_miga is None:
-            raise ValidationError("El campo p_miga no puede ser nulo")
+        if linea_registro is None:
+            raise NotFoundError("La línea de salida no existe")
 
-        if data.linea_id is None:
-            raise ValidationError("El campo linea_id no puede ser nulo")
+        porcentaje = self._porcentaje_miga(linea_registro, data)
 
-        miga = self.control_miga_repository.get_by_registro(linea_num, data.linea_id)
+        # El MERGE inserta o actualiza en una sola sentencia; si la miga ya
+        # existía (incluso si otro inspector la registró un instante antes) se
+        # rechaza y la unidad de trabajo revierte la actualización.
+        resultado = self.control_miga_repository.upsert(linea_num, data.linea_id, data.p_miga, porcentaje)
 
-        if miga is None:
-            raise NotFoundError("La miga no existe")
+        if resultado.anterior is not None:
+            raise ValidationError("La miga ya existe")
+
+        nueva_miga = resultado.actual
+
+        self.audit_use_case.log_action(
+            accion="CREATE",
+            user_id=user_data.get("user_id"),
+            modelo="control_miga",
+            entidad_id=nueva_miga.id,
+            datos_nuevos=MigaResponse.model_validate(nueva_miga).model_dump(mode="json")
+        )
+
+        return self._miga_response(linea_registro, nueva_miga)
+
+    def create_migas_batch(self, linea_num: int, data: MigaBatchRequest,
+                           user_data: Dict[str, Any]) -> list[LineasSalidaMigaResponse]:
+        """
+        Registra varias migas de una línea en una sola operación. El lote es
+        atómico: si algún registro no cumple las validaciones no se inserta
+        ninguno.
+        """
+        items = data.items
+        registros = [item.linea_id for item in items]
+
+        repetidos = sorted(r for r, veces in Counter(registros).items() if veces > 1)
+        if repetidos:
+            raise ValidationError(f"Registros repetidos en el lote: {repetidos}")
+
+        existentes = self.control_miga_repository.get_by_registros_bulk(linea_num, registros)
+        if existentes:
+            raise ValidationError(f"La miga ya existe para los registros: {sorted(m.registro for m in existentes)}")
+
+        lineas = {l.id: l for l in self.lineas_salida_repository.get_by_ids(linea_num, registros)}
+        faltantes = [r for r in registros if r not in lineas]
+        if faltantes:
+            raise NotFoundError(f"Las líneas de salida no existen: {faltantes}")
+
+        tara_ids = sorted({item.tara_id for item in items if item.tara_id is not None})
+        taras = {t.id: t for t in self.control_tara_repository.get_by_ids(tara_ids)} if tara_ids else {}
+        taras_faltantes = [t for t in tara_ids if t not in taras]
+        if taras_faltantes:
+            raise NotFoundError(f"Las taras no existen: {taras_faltantes}")
+
+        # Misma fórmula que create_miga, calculada para todo el lote a la vez
+        peso = np.array([lineas[r].peso_kg for r in registros], dtype=float)
+        p_miga = np.array([item.p_miga for item in items], dtype=float)
+        tara = np.array([taras[item.tara_id].peso_kg if item.tara_id is not None else 0.0 for item in items],
+                        dtype=float)
+
+        sin_peso = [registros[i] for i in np.flatnonzero(~(peso > 0))]
+        if sin_peso:
+            raise ValidationError(f"El peso de la línea debe ser mayor que cero en los registros: {sin_peso}")
+
+        porcentajes = np.round(((peso - tara) - (p_miga - tara)) / peso, 3)
+
+        creadas = self.control_miga_repository.create_many(
+            linea_num, list(zip(registros, p_miga.tolist(), porcentajes.tolist()))
+        )
+        migas = {m.registro: m for m in creadas}
+
+        logs_batch = []
+        response = []
+        for registro in registros:
+            miga = migas[registro]
+            linea = lineas[registro]
+            logs_batch.append({
+                "accion": "CREATE",
+                "modelo": "control_miga",
+                "entidad_id": miga.id,
+                "datos_nuevos": MigaResponse.model_validate(miga).model_dump(mode="json"),
+            })
+            response.append(self._miga_response(linea, miga))
+
+        self.audit_use_case.log_actions_batch(
+            logs=logs_batch,
+            user_id=user_data.get("user_id")
+        )
+
+        return response
+
+    def update_miga(self, linea_num: int, data: MigaRequest, user_data: Dict[str, Any]) -> LineasSalidaMigaResponse:
+        self._validar_miga(data)
 
         linea_registro = self.lineas_salida_repository.get_by_id(data.linea_id, linea_num)
 
         if linea_registro is None:
             raise NotFoundError("La línea de salida no existe")
 
-        if data.tara_id is not None:
-            tara = self.control_tara_repository.get_by_id(data.tara_id)
-            if tara is not None:
-                porcentaje = round(
-                    ((linea_registro.peso_kg - tara.peso_kg) -
-                     (data.p_miga - tara.peso_kg)) / linea_registro.peso_kg,
-                    3
-                )
-            else:
-                raise NotFoundError("La tara no existe")
-        else:
-            porcentaje = round(
-                (linea_registro.peso_kg - data.p_miga) / linea_registro.peso_kg,
-                3
-            )
+        porcentaje = self._porcentaje_miga(linea_registro, data)
 
-        miga_actualizada = self.control_miga_repository.update(miga.id, data.p_miga, porcentaje)
+        # Si no había miga el MERGE la habría insertado: se rechaza y se revierte
+        resultado = self.control_miga_repository.upsert(linea_num, data.linea_id, data.p_miga, porcentaje)
 
-        miga_actualizada = MigaResponse(
-            id = miga_actualizada.id,
-            linea = miga_actualizada.linea,
-            registro = miga_actualizada.registro,
-            p_miga = miga_actualizada.p_miga,
-            porcentaje = miga_actualizada.porcentaje,
-        )
+        if resultado.anterior is None:
+            raise NotFoundError("La miga no existe")
 
-        miga_anterior = MigaResponse(
-            id = miga.id,
-            linea = miga.linea,
-            registro = miga.registro,
-            p_miga = miga.p_miga,
-            porcentaje = miga.porcentaje,
-        )
+        miga_actualizada = resultado.actual
 
         self.audit_use_case.log_action(
             accion="UPDATE",
             user_id=user_data.get("user_id"),
             modelo="control_miga",
-            entidad_id=miga.id,
+            entidad_id=miga_actualizada.id,
             datos_nuevos=MigaResponse.model_validate(miga_actualizada).model_dump(mode="json"),
-            datos_anteriores=MigaResponse.model_validate(miga_anterior).model_dump(mode="json"),
-        )
-
-        response = LineasSalidaMigaResponse(
-            id = linea_registro.id,
-            fecha_p = linea_registro.fecha_p,
-            fecha = linea_registro.fecha,
-            peso_kg = linea_registro.peso_kg,
-            codigo_bastidor = linea_registro.codigo_bastidor,
-            p_lote = linea_registro.p_lote,
-            codigo_parrilla = linea_registro.codigo_parrilla,
-            codigo_obrero = linea_registro.codigo_obrero,
-            guid = linea_registro.guid,
-            p_miga = miga_actualizada.p_miga,
-            porcentaje = miga_actualizada.porcentaje,
+            datos_anteriores=MigaResponse.model_validate(resultado.anterior).model_dump(mode="json"),
         )
 
-        return response
-
-
+        return self._miga_response(linea_registro, miga_actualizada)
@@ -0,0 +1,174 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from src.modules.lineas_entrada_salida_service.src.application.ports.pesos import IPesosRepository
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.pesos import AnomaliasFilters, \
+    HistogramaFilters
+from src.shared.exceptions import ValidationError
+
+# Factor que hace el MAD comparable a la desviación estándar en datos normales
+_MAD_NORMAL = 0.6745
+# Respaldo cuando más de la mitad de los pesos coincide (MAD = 0): desviación
+# absoluta media escalada (Iglewicz y Hoaglin)
+_MEANAD_NORMAL = 0.7979
+
+ESTADISTICAS_CACHE_MAX = 128
+
+
+@dataclass(slots=True, frozen=True)
+class _Estadisticas:
+    ids: np.ndarray
+    pesos: np.ndarray
+    z: np.ndarray
+    mediana: float
+    mad: float
+    q1: float
+    q3: float
+
+
+# Estadísticas ya calculadas por (tipo, línea, fecha, lote, versión). La versión
+# (max id, registros, suma de pesos) cambia con cualquier alta, baja o tara, así
+# una entrada vieja nunca se vuelve a servir: solo deja de pedirse y sale por LRU.
+_cache: "OrderedDict[tuple, _Estadisticas]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _calcular(ids: np.ndarray, pesos: np.ndarray) -> _Estadisticas:
+    mediana = float(np.median(pesos))
+    desvios = np.abs(pesos - mediana)
+    mad = float(np.median(desvios))
+    if mad > 0:
+        z = _MAD_NORMAL * (pesos - mediana) / mad
+    else:
+        media_desvios = float(desvios.mean())
+        z = (
+            _MEANAD_NORMAL * (pesos - mediana) / media_desvios
+            if media_desvios > 0 else np.zeros_like(pesos)
+        )
+    q1, q3 = np.percentile(pesos, [25, 75])
+    return _Estadisticas(ids=ids, pesos=pesos, z=z, mediana=mediana, mad=mad, q1=float(q1), q3=float(q3))
+
+
+def _filtros(fecha=None, lote=None, codigo_obrero=None) -> Dict[str, Any]:
+    """Filtros activos por columna, en el orden que espera IPesosRepository."""
+    candidatos = (("fecha_p", fecha), ("p_lote", lote), ("codigo_obrero", codigo_obrero))
+    return {columna: valor for columna, valor in candidatos if valor}
+
+
+def _round(value: Optional[float], decimals: int = 3) -> Optional[float]:
+    return round(value, decimals) if value is not None else None
+
+
+class PesosUseCase:
+    """Estadística de peso_kg de una tabla de línea, calculada sobre arreglos NumPy."""
+
+    def __init__(self, pesos_repository: IPesosRepository):
+        self.pesos_repository = pesos_repository
+
+    def _estadisticas(self, linea_num: int, filters: AnomaliasFilters) -> Optional[_Estadisticas]:
+        filtros = _filtros(fecha=filters.fecha, lote=filters.lote)
+        version = self.pesos_repository.get_version(linea_num, filtros)
+        if version[1] == 0:
+            return None
+
+        clave = (self.pesos_repository.tipo, linea_num, filters.fecha, filters.lote, version)
+        with _cache_lock:
+            estadisticas = _cache.get(clave)
+            if estadisticas is not None:
+                _cache.move_to_end(clave)
+                return estadisticas
+
+        ids, pesos = self.pesos_repository.get_pesos(linea_num, filtros)
+        if pesos.size == 0:
+            return None
+        estadisticas = _calcular(ids, pesos)
+
+        with _cache_lock:
+            _cache[clave] = estadisticas
+            while len(_cache) > ESTADISTICAS_CACHE_MAX:
+                _cache.popitem(last=False)
+        return estadisticas
+
+    def detectar_anomalias(self, linea_num: int, filters: AnomaliasFilters) -> Dict[str, Any]:
+        est = self._estadisticas(linea_num, filters)
+        resumen = {
+            "linea": linea_num,
+            "fecha": filters.fecha,
+            "lote": filters.lote,
+            "registros": 0,
+            "mediana": None,
+            "mad": None,
+            "q1": None,
+            "q3": None,
+            "limite_inferior": None,
+            "limite_superior": None,
+            "anomalias": 0,
+        }
+        if est is None:
+            return {"resumen": resumen, "data": []}
+
+        iqr = est.q3 - est.q1
+        limite_inferior = est.q1 - filters.factor_iqr * iqr
+        limite_superior = est.q3 + filters.factor_iqr * iqr
+        fuera_iqr = (est.pesos < limite_inferior) | (est.pesos > limite_superior)
+        marcadas = (np.abs(est.z) > filters.umbral_z) | fuera_iqr
+
+        # Las más alejadas primero
+        idx = np.flatnonzero(marcadas)
+        idx = idx[np.argsort(-np.abs(est.z[idx]), kind="stable")]
+
+        data = [
+            {"id": linea_id, "peso_kg": peso, "z": z, "fuera_iqr": fuera}
+            for linea_id, peso, z, fuera in zip(
+                est.ids[idx].tolist(),
+                est.pesos[idx].tolist(),
+                np.round(est.z[idx], 3).tolist(),
+                fuera_iqr[idx].tolist(),
+            )
+        ]
+        resumen.update(
+            registros=int(est.pesos.size),
+            mediana=_round(est.mediana),
+            mad=_round(est.mad),
+            q1=_round(est.q1),
+            q3=_round(est.q3),
+            limite_inferior=_round(limite_inferior),
+            limite_superior=_round(limite_superior),
+            anomalias=len(data),
+        )
+        return {"resumen": resumen, "data": data}
+
+    def get_histograma(self, linea_num: int, filters: HistogramaFilters) -> Dict[str, Any]:
+        filtros = _filtros(
+            fecha=filters.fecha, lote=filters.lote, codigo_obrero=getattr(filters, "codigo_obrero", None)
+        )
+        if not filtros:
+            raise ValidationError("Indique al menos un filtro: fecha, lote u operario.")
+
+        registros, minimo, maximo = self.pesos_repository.get_rango(linea_num, filtros)
+        if registros == 0:
+            return {"linea": linea_num, "registros": 0, "minimo": None, "maximo": None, "bordes": [], "conteos": []}
+
+        # Mismo criterio que numpy.histogram: bins de igual ancho entre mínimo y
+        # máximo, el último cerrado; un rango nulo se abre medio kilo a cada lado
+        inicio, fin = (minimo - 0.5, maximo + 0.5) if minimo == maximo else (minimo, maximo)
+        bordes = np.linspace(inicio, fin, filters.bins + 1)
+        ancho = (fin - inicio) / filters.bins
+
+        buckets, conteos_bucket = self.pesos_repository.get_buckets(linea_num, filtros, inicio, ancho)
+        conteos = np.bincount(
+            np.clip(buckets, 0, filters.bins - 1), weights=conteos_bucket, minlength=filters.bins
+        ).astype(np.int64)
+
+        return {
+            "linea": linea_num,
+            "registros": registros,
+            "minimo": minimo,
+            "maximo": maximo,
+            "bordes": np.round(bordes, 3).tolist(),
+            "conteos": conteos.tolist(),
+        }
@@ -0,0 +1,58 @@
+from datetime import timedelta
+from math import ceil
+from typing import Dict, Any
+
+from src.modules.lineas_entrada_salida_service.src.application.ports.productividad import IProductividadRepository
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.productividad import ProductividadFilters
+from src.shared.config import settings
+from src.shared.exceptions import ValidationError
+
+# Igual que el rendimiento por lote: el ranking recorre hasta las seis tablas de salida
+PRODUCTIVIDAD_MAX_DIAS = 92
+
+
+class ProductividadUseCase:
+    """Ranking de operarios por kg, bandejas o kg/hora a partir de los pesajes de salida."""
+
+    def __init__(self, productividad_repository: IProductividadRepository):
+        self.productividad_repository = productividad_repository
+
+    def get_ranking_operarios(self, filters: ProductividadFilters) -> Dict[str, Any]:
+        if filters.fecha_desde > filters.fecha_hasta:
+            raise ValidationError("La fecha desde no puede ser mayor que la fecha hasta.")
+        if filters.fecha_hasta - filters.fecha_desde > timedelta(days=PRODUCTIVIDAD_MAX_DIAS):
+            raise ValidationError(f"El rango de fechas no puede superar {PRODUCTIVIDAD_MAX_DIAS} días.")
+
+        lineas = [filters.linea.value] if filters.linea else list(settings.lineas_produccion)
+        operarios, total_records = self.productividad_repository.get_ranking(
+            filters.fecha_desde, filters.fecha_hasta, lineas, filters.orden, filters.page, filters.page_size
+        )
+        # Turno, área y línea de toda la página en una sola consulta
+        asignaciones = self.productividad_repository.get_asignaciones([o.codigo_obrero for o in operarios])
+
+        data = []
+        for o in operarios:
+            asignacion = asignaciones.get(o.codigo_obrero)
+            data.append({
+                "ranking": o.ranking,
+                "codigo_obrero": o.codigo_obrero,
+                "dias": o.dias,
+                "bandejas": o.bandejas,
+                "peso_kg": round(o.peso_kg, 3),
+                "horas_activas": round(o.segundos_activos / 3600, 2),
+                "kg_hora": round(o.kg_hora, 3) if o.kg_hora is not None else None,
+                "turno_id": asignacion.turno_id if asignacion else None,
+                "turno": asignacion.turno if asignacion else None,
+                "area_id": asignacion.area_id if asignacion else None,
+                "area": asignacion.area if asignacion else None,
+                "linea_id": asignacion.linea_id if asignacion else None,
+                "linea": asignacion.linea if asignacion else None,
+            })
+
+        return {
+            "total_records": total_records,
+            "total_pages": ceil(total_records / filters.page_size) if total_records > 0 else 0,
+            "page": filters.page,
+            "page_size": filters.page_size,
+            "data": data,
+        }
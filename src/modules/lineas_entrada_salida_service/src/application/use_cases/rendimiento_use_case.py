@@ -0,0 +1,242 @@
+import math
+from datetime import date, timedelta
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from src.modules.administracion_service.src.application.ports.especies import IEspeciesRepository
+from src.modules.lineas_entrada_salida_service.src.domain.entities import TotalesLote
+from src.modules.lineas_entrada_salida_service.src.application.ports.rendimiento import IRendimientoRepository
+from src.modules.lineas_entrada_salida_service.src.application.use_cases.resumen_lineas_use_case import \
+    ResumenLineasUseCase
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.rendimiento import RendimientoFilters, \
+    LinajeFilters
+from src.shared.config import settings
+from src.shared.exceptions import NotFoundError, ValidationError
+
+# Rango máximo de consulta: las agregaciones recorren las 12 tablas de línea
+RENDIMIENTO_MAX_DIAS = 92
+
+
+def _optional(values: np.ndarray, decimals: int) -> list:
+    """Redondea y convierte NaN (sin dato) en None para la respuesta JSON."""
+    return [None if math.isnan(v) else v for v in np.round(values, decimals).tolist()]
+
+
+def _to_float(value) -> float:
+    return float(value) if value is not None else math.nan
+
+
+def _optional_scalar(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def _orden_parrilla(codigo: Optional[str]) -> tuple:
+    """Orden natural de codigo_parrilla ("2" antes que "10"); los nulos al final."""
+    if codigo is None:
+        return (2, 0, "")
+    return (0, int(codigo), codigo) if codigo.isdigit() else (1, 0, codigo)
+
+
+class RendimientoUseCase:
+    """
+    Conciliación de rendimiento por lote: salida kg ÷ entrada kg frente al
+    rendimiento esperado de la especie, y la merma implícita (lo que entró y no
+    salió como lomo, panza, miga ni desperdicio) frente a su merma de cocción.
+    """
+
+    def __init__(self, rendimiento_repository: IRendimientoRepository, especies_repository: IEspeciesRepository,
+                 resumen_lineas: Optional[ResumenLineasUseCase] = None):
+        self.rendimiento_repository = rendimiento_repository
+        self.especies_repository = especies_repository
+        self.resumen_lineas = resumen_lineas
+
+    def _totales(self, tipo: str, fecha_desde: date, fecha_hasta: date, lineas: list[int]) -> List[TotalesLote]:
+        """Totales por lote desde el resumen diario si está disponible; si no, desde las tablas de línea."""
+        if self.resumen_lineas is not None:
+            totales = self.resumen_lineas.get_totales(tipo, fecha_desde, fecha_hasta, lineas)
+            if totales is not None:
+                return totales
+        if tipo == "entrada":
+            return self.rendimiento_repository.get_totales_entrada(fecha_desde, fecha_hasta, lineas)
+        return self.rendimiento_repository.get_totales_salida(fecha_desde, fecha_hasta, lineas)
+
+    def get_rendimiento_lotes(self, filters: RendimientoFilters) -> Dict[str, Any]:
+        if filters.fecha_desde > filters.fecha_hasta:
+            raise ValidationError("La fecha desde no puede ser mayor que la fecha hasta.")
+        if filters.fecha_hasta - filters.fecha_desde > timedelta(days=RENDIMIENTO_MAX_DIAS):
+            raise ValidationError(f"El rango de fechas no puede superar {RENDIMIENTO_MAX_DIAS} días.")
+
+        especie = self.especies_repository.get_by_id(filters.especie_id)
+        if especie is None:
+            raise NotFoundError("La especie no existe")
+
+        lineas = [filters.linea.value] if filters.linea else list(settings.lineas_produccion)
+        args = (filters.fecha_desde, filters.fecha_hasta, lineas)
+        entradas = self._totales("entrada", *args)
+        salidas = self._totales("salida", *args)
+        subproductos = self.rendimiento_repository.get_subproductos(*args)
+
+        # Un índice por lote; las tres fuentes se vuelcan en arreglos alineados
+        claves = sorted(
+            {(t.fecha_p, t.p_lote, t.linea) for t in entradas} | {(t.fecha_p, t.p_lote, t.linea) for t in salidas},
+            key=lambda k: (k[0], k[2], k[1] or ""),
+        )
+        indice = {clave: i for i, clave in enumerate(claves)}
+        n = len(claves)
+
+        registros_entrada = np.zeros(n, dtype=np.int64)
+        registros_salida = np.zeros(n, dtype=np.int64)
+        entrada = np.zeros(n)
+        salida = np.zeros(n)
+        miga = np.zeros(n)
+        panza = np.zeros(n)
+        desperdicio = np.zeros(n)
+
+        for t in entradas:
+            i = indice[(t.fecha_p, t.p_lote, t.linea)]
+            registros_entrada[i] = t.registros
+            entrada[i] = t.peso_kg
+        for t in salidas:
+            i = indice[(t.fecha_p, t.p_lote, t.linea)]
+            registros_salida[i] = t.registros
+            salida[i] = t.peso_kg
+        for s in subproductos:
+            i = indice.get((s.fecha_p, s.p_lote, s.linea))
+            if i is not None:
+                miga[i] = s.p_miga
+                panza[i] = s.p_panza
+                desperdicio[i] = s.p_desperdicio
+
+        rendimiento_esperado = _to_float(especie.especie_rendimiento)
+        merma_esperada = _to_float(especie.especie_merm_coccion)
+
+        con_entrada = entrada > 0
+        rendimiento = np.divide(salida, entrada, out=np.full(n, np.nan), where=con_entrada)
+        merma = np.divide(entrada - salida - panza - miga - desperdicio, entrada,
+                          out=np.full(n, np.nan), where=con_entrada)
+        desviacion_rendimiento = rendimiento - rendimiento_esperado
+        desviacion_merma = merma - merma_esperada
+
+        # NaN (sin entrada o sin valor esperado) no cuenta como fuera de tolerancia
+        with np.errstate(invalid="ignore"):
+            fuera = (np.abs(desviacion_rendimiento) > filters.tolerancia) | (np.abs(desviacion_merma) > filters.tolerancia)
+
+        data = [
+            {
+                "fecha_p": fecha_p,
+                "p_lote": p_lote,
+                "linea": linea,
+                "registros_entrada": r_entrada,
+                "registros_salida": r_salida,
+                "entrada_kg": kg_entrada,
+                "salida_kg": kg_salida,
+                "p_miga": kg_miga,
+                "p_panza": kg_panza,
+                "p_desperdicio": kg_desperdicio,
+                "rendimiento": rend,
+                "desviacion_rendimiento": desv_rend,
+                "merma": mer,
+                "desviacion_merma": desv_mer,
+                "fuera_de_tolerancia": fuera_lote,
+            }
+            for (fecha_p, p_lote, linea), r_entrada, r_salida, kg_entrada, kg_salida, kg_miga, kg_panza,
+                kg_desperdicio, rend, desv_rend, mer, desv_mer, fuera_lote in zip(
+                claves,
+                registros_entrada.tolist(),
+                registros_salida.tolist(),
+                np.round(entrada, 3).tolist(),
+                np.round(salida, 3).tolist(),
+                np.round(miga, 3).tolist(),
+                np.round(panza, 3).tolist(),
+                np.round(desperdicio, 3).tolist(),
+                _optional(rendimiento, 4),
+                _optional(desviacion_rendimiento, 4),
+                _optional(merma, 4),
+                _optional(desviacion_merma, 4),
+                fuera.tolist(),
+            )
+        ]
+
+        # El rendimiento y la merma globales se ponderan por kg y solo con lotes que tienen entrada
+        total_entrada = float(entrada.sum())
+        total_salida = float(salida.sum())
+        salida_conciliada = float(salida[con_entrada].sum())
+        merma_conciliada = float((entrada - salida - panza - miga - desperdicio)[con_entrada].sum())
+
+        return {
+            "resumen": {
+                "especie_id": especie.especie_id,
+                "especie_nombre": especie.especie_nombre,
+                "rendimiento_esperado": _optional_scalar(rendimiento_esperado),
+                "merma_esperada": _optional_scalar(merma_esperada),
+                "lotes": n,
+                "lotes_fuera_de_tolerancia": int(fuera.sum()),
+                "entrada_kg": round(total_entrada, 3),
+                "salida_kg": round(total_salida, 3),
+                "rendimiento": round(salida_conciliada / total_entrada, 4) if total_entrada > 0 else None,
+                "merma": round(merma_conciliada / total_entrada, 4) if total_entrada > 0 else None,
+            },
+            "data": data,
+        }
+
+    def get_linaje_parrillas(self, linea_num: int, filters: LinajeFilters) -> Dict[str, Any]:
+        parrillas = sorted(
+            self.rendimiento_repository.get_linaje_parrillas(linea_num, filters.p_lote, filters.fecha_p),
+            key=lambda p: (p.fecha_p is None, p.fecha_p, _orden_parrilla(p.codigo_parrilla)),
+        )
+        n = len(parrillas)
+        entrada = np.fromiter((p.entrada_kg for p in parrillas), dtype=float, count=n)
+        salida = np.fromiter((p.salida_kg for p in parrillas), dtype=float, count=n)
+        con_entrada = np.fromiter((p.registros_entrada > 0 for p in parrillas), dtype=bool, count=n)
+        con_salida = np.fromiter((p.registros_salida > 0 for p in parrillas), dtype=bool, count=n)
+
+        # La pérdida solo tiene sentido si la parrilla se pesó a la entrada y a la salida
+        conciliada = con_entrada & con_salida
+        perdida_kg = np.where(conciliada, entrada - salida, np.nan)
+        validas = conciliada & (entrada > 0)
+        perdida = np.divide(perdida_kg, entrada, out=np.full(n, np.nan), where=validas)
+        rendimiento = np.divide(salida, entrada, out=np.full(n, np.nan), where=validas)
+
+        data = [
+            {
+                "fecha_p": p.fecha_p,
+                "p_lote": p.p_lote,
+                "codigo_parrilla": p.codigo_parrilla,
+                "registros_entrada": p.registros_entrada,
+                "registros_salida": p.registros_salida,
+                "entrada_kg": kg_entrada,
+                "salida_kg": kg_salida,
+                "perdida_kg": kg_perdida,
+                "perdida": perd,
+                "rendimiento": rend,
+                "estado": "conciliada" if ok else ("sin_salida" if p.registros_entrada else "sin_entrada"),
+            }
+            for p, kg_entrada, kg_salida, kg_perdida, perd, rend, ok in zip(
+                parrillas,
+                np.round(entrada, 3).tolist(),
+                np.round(salida, 3).tolist(),
+                _optional(perdida_kg, 3),
+                _optional(perdida, 4),
+                _optional(rendimiento, 4),
+                conciliada.tolist(),
+            )
+        ]
+
+        entrada_conciliada = float(entrada[validas].sum())
+        perdida_conciliada = float(np.nansum(perdida_kg))
+        return {
+            "resumen": {
+                "linea": linea_num,
+                "p_lote": filters.p_lote,
+                "fecha_p": filters.fecha_p,
+                "parrillas": n,
+                "parrillas_sin_salida": int((con_entrada & ~con_salida).sum()),
+                "parrillas_sin_entrada": int((con_salida & ~con_entrada).sum()),
+                "entrada_kg": round(float(entrada.sum()), 3),
+                "salida_kg": round(float(salida.sum()), 3),
+                "perdida_kg": round(perdida_conciliada, 3),
+                "perdida": round(float(perdida_kg[validas].sum()) / entrada_conciliada, 4) if entrada_conciliada > 0 else None,
+            },
+            "data": data,
+        }
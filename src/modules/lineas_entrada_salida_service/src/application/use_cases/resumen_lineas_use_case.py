@@ -0,0 +1,153 @@
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.modules.lineas_entrada_salida_service.src.application.ports.resumen_lineas import IResumenFuenteRepository, \
+    IResumenLineasRepository
+from src.modules.lineas_entrada_salida_service.src.domain.entities import TotalesLote
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_shared import LineasFilters
+
+# Filtros de LineasFilters que el resumen puede responder: su clave es (fecha_p, lote)
+_FILTROS_FECHA = ("fecha", "fecha_desde", "fecha_hasta")
+_FILTROS_RESUMIBLES = _FILTROS_FECHA + ("lote", "lotes")
+
+
+def _activo(value: Any) -> bool:
+    return value is not None and value != "" and value != []
+
+
+def _rango_resumen(filters: LineasFilters) -> Optional[Tuple[date, date, Optional[List[str]]]]:
+    """
+    (fecha_desde, fecha_hasta, lotes) equivalentes a los filtros, o None si el
+    resumen no alcanza para responderlos: sin filtro de fecha (las filas sin
+    fecha_p no se resumen) o con filtros de operario o de peso.
+    """
+    activos = {name for name in LineasFilters.model_fields if _activo(getattr(filters, name))}
+    if activos - set(_FILTROS_RESUMIBLES) or not activos & set(_FILTROS_FECHA):
+        return None
+
+    desde = [d for d in (filters.fecha, filters.fecha_desde) if d is not None]
+    hasta = [d for d in (filters.fecha, filters.fecha_hasta) if d is not None]
+    fecha_desde = max(desde) if desde else date.min
+    fecha_hasta = min(hasta) if hasta else date.max
+
+    lotes = None
+    if "lotes" in activos:
+        lotes = sorted(set(filters.lotes))
+    if "lote" in activos:
+        lotes = [filters.lote] if lotes is None or filters.lote in lotes else []
+    return fecha_desde, fecha_hasta, lotes
+
+
+def _sumar_totales(*grupos: Iterable[TotalesLote]) -> List[TotalesLote]:
+    acumulado: Dict[Tuple, List] = defaultdict(lambda: [0, 0.0])
+    for totales in grupos:
+        for total in totales:
+            valores = acumulado[(total.fecha_p, total.p_lote or None, total.linea)]
+            valores[0] += total.registros
+            valores[1] += total.peso_kg
+    return [
+        TotalesLote(fecha_p, p_lote, linea, registros, round(peso_kg, 3))
+        for (fecha_p, p_lote, linea), (registros, peso_kg) in acumulado.items()
+    ]
+
+
+class ResumenLineasUseCase:
+    """
+    Resumen diario por (linea, tipo, fecha_p, lote) en la base de auth.
+
+    El worker vuelca cada tabla reg_linea_* por tramos de id desde su cursor;
+    las ediciones hechas por la API (tara, panza, lote, bajas) ajustan el
+    resumen en la misma petición, solo para filas ya volcadas. Al leer, lo
+    posterior al cursor se completa desde la tabla de línea, que es un
+    recorrido corto por clave primaria.
+    """
+
+    def __init__(self, resumen_repository: IResumenLineasRepository, fuente_repository: IResumenFuenteRepository):
+        self.resumen_repository = resumen_repository
+        self.fuente_repository = fuente_repository
+
+    def sincronizar(self, tipo: str, linea_num: int, batch_size: int) -> bool:
+        """Vuelca el siguiente tramo de ids; devuelve True si la tabla quedó al día."""
+        cursor = self.resumen_repository.get_cursor(tipo, linea_num)
+        desde_id = cursor or 0
+        max_id = self.fuente_repository.get_max_id(tipo, linea_num)
+        hasta_id = min(max_id, desde_id + batch_size)
+
+        if hasta_id <= desde_id:
+            if cursor is None:
+                self.resumen_repository.avanzar_cursor(tipo, linea_num, None, desde_id)
+            return True
+
+        # El cursor se mueve primero: si otro proceso ya volcó este tramo, la
+        # condición sobre el valor leído falla y aquí no se suma nada
+        if not self.resumen_repository.avanzar_cursor(tipo, linea_num, cursor, hasta_id):
+            return True
+
+        totales = self.fuente_repository.get_totales_por_ids(tipo, linea_num, desde_id, hasta_id)
+        self.resumen_repository.sumar(tipo, totales)
+        return hasta_id >= max_id
+
+    def resincronizar(self, tipo: str, linea_num: int, fecha_desde: date) -> None:
+        """Recalcula desde `fecha_desde` lo ya volcado; corrige ediciones hechas fuera de la API."""
+        cursor = self.resumen_repository.get_cursor(tipo, linea_num)
+        # Reescribir el cursor con su mismo valor lo bloquea mientras se reemplaza
+        if cursor is None or not self.resumen_repository.avanzar_cursor(tipo, linea_num, cursor, cursor):
+            return
+
+        totales = self.fuente_repository.get_totales_desde_fecha(tipo, linea_num, fecha_desde, cursor)
+        self.resumen_repository.reemplazar_desde(tipo, linea_num, fecha_desde, totales)
+
+    def ajustar(self, tipo: str, linea_num: int, anteriores: Iterable[Any], nuevas: Iterable[Any]) -> None:
+        """
+        Resta las filas `anteriores` y suma las `nuevas` (entidades con id,
+        fecha_p, p_lote y peso_kg). Las filas posteriores al cursor se omiten:
+        el worker las volcará ya con sus valores finales.
+        """
+        cursor = self.resumen_repository.get_cursor(tipo, linea_num)
+        if not cursor:
+            return
+
+        deltas: Dict[Tuple, List] = defaultdict(lambda: [0, 0.0])
+        for signo, filas in ((-1, anteriores), (1, nuevas)):
+            for fila in filas:
+                if fila is None or fila.id > cursor or fila.fecha_p is None:
+                    continue
+                delta = deltas[(fila.fecha_p, fila.p_lote or None)]
+                delta[0] += signo
+                delta[1] += signo * (fila.peso_kg or 0.0)
+
+        ajustes = [
+            TotalesLote(fecha_p, p_lote, linea_num, registros, round(peso_kg, 3))
+            for (fecha_p, p_lote), (registros, peso_kg) in deltas.items()
+            if registros != 0 or abs(peso_kg) >= 0.0005
+        ]
+        self.resumen_repository.sumar(tipo, ajustes)
+
+    def contar(self, tipo: str, linea_num: int, filters: LineasFilters) -> Optional[int]:
+        """Total de registros para los filtros, o None si hay que contar sobre la tabla de línea."""
+        rango = _rango_resumen(filters)
+        if rango is None:
+            return None
+        cursor = self.resumen_repository.get_cursor(tipo, linea_num)
+        if cursor is None:
+            return None
+
+        fecha_desde, fecha_hasta, lotes = rango
+        if fecha_desde > fecha_hasta or lotes == []:
+            return 0
+        return (
+            self.resumen_repository.contar(tipo, linea_num, fecha_desde, fecha_hasta, lotes)
+            + self.fuente_repository.contar_nuevos(tipo, linea_num, cursor, fecha_desde, fecha_hasta, lotes)
+        )
+
+    def get_totales(self, tipo: str, fecha_desde: date, fecha_hasta: date,
+                    lineas: list[int]) -> Optional[List[TotalesLote]]:
+        """Totales por (fecha_p, p_lote, linea), o None si alguna línea aún no tiene resumen."""
+        cursores = self.resumen_repository.get_cursores(tipo, lineas)
+        if len(cursores) < len(set(lineas)):
+            return None
+
+        resumen = self.resumen_repository.get_totales(tipo, lineas, fecha_desde, fecha_hasta)
+        nuevos = self.fuente_repository.get_totales_nuevos(tipo, cursores, fecha_desde, fecha_hasta)
+        return _sumar_totales(resumen, nuevos)
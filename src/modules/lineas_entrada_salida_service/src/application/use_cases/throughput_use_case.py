@@ -0,0 +1,158 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from src.modules.lineas_entrada_salida_service.src.application.ports.throughput import IThroughputRepository
+
+TIPOS = ("entrada", "salida")
+
+
+def _minuto(instante: datetime) -> int:
+    return int(np.datetime64(instante.replace(tzinfo=None), "m").astype(np.int64))
+
+
+class _MinuteRing:
+    """
+    Buffer circular de kg y registros por minuto. El slot de un minuto es
+    minuto % tamaño; `minutos` guarda qué minuto ocupa cada slot, así un slot
+    viejo se recicla al llegar un minuto nuevo sin recorrer el buffer.
+    """
+    __slots__ = ("size", "minutos", "kg", "registros")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.minutos = np.full(size, -1, dtype=np.int64)
+        self.kg = np.zeros(size, dtype=np.float64)
+        self.registros = np.zeros(size, dtype=np.int64)
+
+    def add(self, minutos: np.ndarray, pesos: np.ndarray, minimo: int) -> None:
+        # Fuera de la ventana no se guarda: así dos minutos del lote nunca comparten slot
+        dentro = minutos >= minimo
+        minutos, pesos = minutos[dentro], pesos[dentro]
+        if minutos.size == 0:
+            return
+        slots = minutos % self.size
+        nuevos = np.unique(minutos)
+        nuevos_slots = nuevos % self.size
+        reciclar = self.minutos[nuevos_slots] < nuevos
+        self.minutos[nuevos_slots[reciclar]] = nuevos[reciclar]
+        self.kg[nuevos_slots[reciclar]] = 0.0
+        self.registros[nuevos_slots[reciclar]] = 0
+
+        vigentes = self.minutos[slots] == minutos
+        np.add.at(self.kg, slots[vigentes], pesos[vigentes])
+        np.add.at(self.registros, slots[vigentes], 1)
+
+    def totales(self, desde: int, hasta: int) -> Tuple[float, int]:
+        en_rango = (self.minutos >= desde) & (self.minutos <= hasta)
+        return float(self.kg[en_rango].sum()), int(self.registros[en_rango].sum())
+
+
+class _Estado:
+    __slots__ = ("ring", "ultimo_id", "ultimo_minuto")
+
+    def __init__(self, size: int):
+        self.ring = _MinuteRing(size)
+        self.ultimo_id = 0
+        self.ultimo_minuto: Optional[int] = None
+
+
+class ThroughputAggregator:
+    """
+    kg/hora en vivo por línea, mantenido en memoria.
+
+    `resync` reconstruye los buffers con las últimas `ventana_horas` y fija el
+    último id leído de cada tabla; `sync` solo lee los pesajes con id mayor. Tras
+    cada pasada se publica una instantánea ya calculada, de modo que `snapshot`
+    es una lectura de referencia O(1) que nunca toca la base.
+    """
+
+    def __init__(
+            self,
+            lineas: Iterable[int],
+            ventana_horas: int,
+            batch_size: int,
+            reloj: Callable[[], datetime],
+    ):
+        self.lineas = tuple(lineas)
+        self.ventana_horas = ventana_horas
+        self.batch_size = batch_size
+        self.reloj = reloj
+        self._size = ventana_horas * 60
+        self._estados: Dict[Tuple[str, int], _Estado] = {}
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Dict[str, Any]] = None
+
+    def resync(self, repository: IThroughputRepository) -> None:
+        ahora = self.reloj().replace(tzinfo=None)
+        desde = ahora - timedelta(hours=self.ventana_horas)
+        estados = {}
+        for tipo in TIPOS:
+            for linea_num in self.lineas:
+                estado = _Estado(self._size)
+                # El max id se toma antes de leer la ventana: lo que llegue
+                # después lo recoge la siguiente pasada incremental
+                estado.ultimo_id = repository.get_max_id(tipo, linea_num)
+                _, minutos, pesos = repository.get_desde(tipo, linea_num, desde, estado.ultimo_id)
+                self._acumular(estado, minutos, pesos, _minuto(desde))
+                estados[(tipo, linea_num)] = estado
+        with self._lock:
+            self._estados = estados
+            self._publicar(ahora)
+
+    def sync(self, repository: IThroughputRepository) -> None:
+        with self._lock:
+            sin_estado = not self._estados
+        if sin_estado:
+            self.resync(repository)
+            return
+
+        ahora = self.reloj().replace(tzinfo=None)
+        minimo = _minuto(ahora) - self._size + 1
+        with self._lock:
+            for (tipo, linea_num), estado in self._estados.items():
+                while True:
+                    ids, minutos, pesos = repository.get_nuevos(tipo, linea_num, estado.ultimo_id, self.batch_size)
+                    if ids.size == 0:
+                        break
+                    estado.ultimo_id = int(ids[-1])
+                    self._acumular(estado, minutos, pesos, minimo)
+                    if ids.size < self.batch_size:
+                        break
+            self._publicar(ahora)
+
+    @staticmethod
+    def _acumular(estado: _Estado, minutos: np.ndarray, pesos: np.ndarray, minimo: int) -> None:
+        estado.ring.add(minutos, pesos, minimo)
+        if minutos.size:
+            ultimo = int(minutos.max())
+            if estado.ultimo_minuto is None or ultimo > estado.ultimo_minuto:
+                estado.ultimo_minuto = ultimo
+
+    def _publicar(self, ahora: datetime) -> None:
+        actual = _minuto(ahora)
+        lineas = []
+        for linea_num in self.lineas:
+            item = {"linea": linea_num}
+            for tipo in TIPOS:
+                estado = self._estados[(tipo, linea_num)]
+                kg_hora, registros_hora = estado.ring.totales(actual - 59, actual)
+                kg_15, _ = estado.ring.totales(actual - 14, actual)
+                ultimo = estado.ultimo_minuto
+                item[tipo] = {
+                    "kg_hora": round(kg_hora, 3),
+                    "kg_hora_15m": round(kg_15 * 4, 3),
+                    "registros_hora": registros_hora,
+                    "ultimo_pesaje": (
+                        np.datetime64(ultimo, "m").astype(datetime) if ultimo is not None else None
+                    ),
+                    "ultimo_id": estado.ultimo_id,
+                }
+            lineas.append(item)
+        # Se reemplaza la referencia completa: los lectores nunca ven un estado a medias
+        self._snapshot = {"actualizado": ahora, "ventana_horas": self.ventana_horas, "lineas": lineas}
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        return self._snapshot
@@ -2,7 +2,10 @@ from dataclasses import dataclass
 from datetime import date, datetime, time
 from typing import Optional
 
-@dataclass
+# Las entidades de línea se crean por cientos de miles en los listados: llevan
+# slots pero no frozen, porque el __init__ de un dataclass congelado asigna cada
+# campo con object.__setattr__ y eso multiplica el costo de construcción.
+@dataclass(slots=True)
 class LineasEntrada:
     id: int
     fecha_p: Optional[date]
@@ -15,7 +18,7 @@ class LineasEntrada:
     hora_inicio: Optional[time]
     guid: Optional[str]
 
-@dataclass
+@dataclass(slots=True)
 class LineasSalida:
     id: int
     fecha_p: Optional[date]
@@ -36,7 +39,7 @@ class ControlTara:
     is_active: bool
     is_principal: bool
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ControlMiga:
     id: int
     linea: int
@@ -44,4 +47,81 @@ class ControlMiga:
     p_miga: float
     porcentaje: float
     created_at: Optional[datetime]
-    updated_at: Optional[datetime]
\ No newline at end of file
+    updated_at: Optional[datetime]
+
+@dataclass(slots=True, frozen=True)
+class ControlMigaUpsert:
+    """Resultado de un upsert de miga: `anterior` es None si la fila se insertó."""
+    anterior: Optional[ControlMiga]
+    actual: ControlMiga
+
+@dataclass(slots=True, frozen=True)
+class TotalesLote:
+    """Pesajes de una tabla de línea agregados por (fecha_p, p_lote, linea)."""
+    fecha_p: Optional[date]
+    p_lote: Optional[str]
+    linea: int
+    registros: int
+    peso_kg: float
+
+@dataclass(slots=True, frozen=True)
+class SubproductosLote:
+    """Miga, panza y desperdicio de fm_detalle_produccion agregados por lote."""
+    fecha_p: Optional[date]
+    p_lote: Optional[str]
+    linea: int
+    p_miga: float
+    p_panza: float
+    p_desperdicio: float
+
+@dataclass(slots=True, frozen=True)
+class LinajeParrilla:
+    """Entrada y salida de una parrilla dentro de un lote, unidas por (fecha_p, p_lote, codigo_parrilla)."""
+    fecha_p: Optional[date]
+    p_lote: Optional[str]
+    codigo_parrilla: Optional[str]
+    registros_entrada: int
+    entrada_kg: float
+    registros_salida: int
+    salida_kg: float
+
+@dataclass(slots=True, frozen=True)
+class ProductividadOperario:
+    """Pesajes de salida de un operario en un rango de fechas, con su puesto en el ranking."""
+    ranking: int
+    codigo_obrero: str
+    dias: int
+    bandejas: int
+    peso_kg: float
+    # Suma por día de (último pesaje - primer pesaje); no cuenta la noche entre días
+    segundos_activos: float
+    kg_hora: Optional[float]
+
+@dataclass(slots=True, frozen=True)
+class OperarioAsignacion:
+    """Turno, área y línea de un operario según fm_gestion_operarios."""
+    codigo: str
+    turno_id: Optional[int]
+    turno: Optional[str]
+    area_id: Optional[int]
+    area: Optional[str]
+    linea_id: Optional[int]
+    linea: Optional[str]
+
+@dataclass(slots=True, frozen=True)
+class SecuenciaEntrada:
+    """Pesaje de entrada con su secuencia y parrilla numéricas y las de sus vecinos en el día."""
+    id: int
+    fecha: Optional[datetime]
+    hora_inicio: Optional[time]
+    p_lote: Optional[str]
+    codigo_secuencia: Optional[str]
+    codigo_parrilla: Optional[str]
+    secuencia: Optional[int]
+    secuencia_anterior: Optional[int]
+    secuencia_siguiente: Optional[int]
+    repeticiones_secuencia: int
+    parrilla: Optional[int]
+    parrilla_anterior: Optional[int]
+    parrilla_siguiente: Optional[int]
+    repeticiones_parrilla: int
@@ -1,6 +1,6 @@
-from typing import Dict, Any
+from typing import Annotated, Dict, Any, Optional
 
-from fastapi import APIRouter, Depends, status, Path
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_salida import PanzaRequest
@@ -8,15 +8,25 @@ from src.modules.auth_service.src.application.use_cases.audit_use_case import Au
 from src.modules.lineas_entrada_salida_service.src.application.use_cases.lineas_entrada_use_case import \
     LineasEntradaUseCase
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_entrada import \
-    LineasEntradaResponse, LineasEntradaUpdate
+    LineasEntradaResponse, LineasEntradaUpdate, SecuenciaFilters, SecuenciaAnalisisResponse, \
+    RenumerarSecuenciaRequest, RenumerarSecuenciaResponse
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_shared import LineasPagination, \
-    UpdateCodigoParrillaRequest, LineasFilters
+    UpdateCodigoParrillaRequest, LineasFilters, linea_path
 from src.modules.lineas_entrada_salida_service.src.infrastructure.db.repositories.lineas_entrada_repository import \
     LineasEntradaRepository
-from src.shared.base import get_db
+from src.modules.lineas_entrada_salida_service.src.application.use_cases.pesos_use_case import PesosUseCase
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.pesos import AnomaliasFilters, \
+    AnomaliasResponse, HistogramaFilters, HistogramaResponse
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.repositories.pesos_repository import \
+    PesosRepository
+from src.modules.lineas_entrada_salida_service.src.application.use_cases.resumen_lineas_use_case import \
+    ResumenLineasUseCase
+from src.modules.lineas_entrada_salida_service.src.infrastructure.resumen_lineas_worker import \
+    get_resumen_lineas_use_case
+from src.shared.base import get_db, get_report_db
 from src.shared.common.auditoria import get_audit_use_case
-from src.shared.common.responses import success_response, error_response
-from src.shared.exceptions import RepositoryError, NotFoundError
+from src.shared.common.responses import success_response, error_response, validate_many
+from src.shared.exceptions import RepositoryError
 from src.shared.security import get_current_user_data
 
 router = APIRouter()
@@ -24,18 +34,35 @@ router = APIRouter()
 
 def get_lineas_entrada_use_case(
         db_externa: Session = Depends(get_db),
-        audit_uc: AuditUseCase = Depends(get_audit_use_case)
+        audit_uc: AuditUseCase = Depends(get_audit_use_case),
+        resumen_uc: Optional[ResumenLineasUseCase] = Depends(get_resumen_lineas_use_case)
 ) -> LineasEntradaUseCase:
     return LineasEntradaUseCase(
         lineas_entrada_repository=LineasEntradaRepository(db_externa),
+        audit_use_case=audit_uc,
+        resumen_lineas=resumen_uc
+    )
+
+
+def get_lineas_entrada_report_use_case(
+        db_report: Session = Depends(get_report_db),
+        audit_uc: AuditUseCase = Depends(get_audit_use_case)
+) -> LineasEntradaUseCase:
+    """Solo para endpoints de lectura: las tablas de línea se leen por el engine de reportes."""
+    return LineasEntradaUseCase(
+        lineas_entrada_repository=LineasEntradaRepository(db_report),
         audit_use_case=audit_uc
     )
 
 
+def get_pesos_entrada_use_case(db: Session = Depends(get_report_db)) -> PesosUseCase:
+    return PesosUseCase(pesos_repository=PesosRepository(db, "entrada"))
+
+
 @router.post("/{linea_num}/paginated", status_code=status.HTTP_200_OK)
 def get_all_lineas_entrada(
         pagination_params: LineasPagination,
-        linea_num: int = Path(..., ge=1, le=6, description="Número de Línea (1 al 6)"),
+        linea_num: int = linea_path(),
         use_case: LineasEntradaUseCase = Depends(get_lineas_entrada_use_case)
 ):
     try:
@@ -44,10 +71,7 @@ def get_all_lineas_entrada(
             linea_num=linea_num
         )
 
-        response_data = [
-            LineasEntradaResponse.model_validate(d).model_dump(mode="json")
-            for d in pagination_result["data"]
-        ]
+        response_data = validate_many(LineasEntradaResponse, pagination_result["data"])
 
         response_data_with_meta = {
             "total_records": pagination_result["total_records"],
@@ -68,11 +92,30 @@ def get_all_lineas_entrada(
         )
 
 
+# Antes de /{linea_num}/{linea_id}: si no, "histogram" se validaría como linea_id
+@router.get("/{linea_num}/histogram", response_model=HistogramaResponse, status_code=status.HTTP_200_OK)
+def get_histograma_entrada(
+        filters: Annotated[HistogramaFilters, Query()],
+        linea_num: int = linea_path(),
+        use_case: PesosUseCase = Depends(get_pesos_entrada_use_case)
+):
+    try:
+        result = use_case.get_histograma(linea_num, filters)
+        return success_response(
+            data=result,
+            message=f"Histograma de pesos de la linea {linea_num} entrada obtenido correctamente"
+        )
+    except RepositoryError as e:
+        return error_response(
+            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
 @router.get("/{linea_num}/{linea_id}", response_model=LineasEntradaResponse, status_code=status.HTTP_200_OK)
 def get_linea_entrada_by_id(
         linea_id: int,
         use_cases: LineasEntradaUseCase = Depends(get_lineas_entrada_use_case),
-        linea_num: int = Path(..., ge=1, le=6, description="Número de Línea (1 al 6)"),
+        linea_num: int = linea_path(),
 
 ):
     data = use_cases.get_linea_entrada_by_id(linea_id, linea_num)
@@ -91,23 +134,14 @@ def update_linea_entrada(
         linea_id: int,
         linea_entrada_data: LineasEntradaUpdate,
         use_cases: LineasEntradaUseCase = Depends(get_lineas_entrada_use_case),
-        linea_num: int = Path(..., ge=1, le=6, description="Número de Línea (1 al 6)"),
+        linea_num: int = linea_path(),
         user_data: Dict[str, Any] = Depends(get_current_user_data)
 ):
-    try:
-        updated_data = use_cases.update_linea_entrada(linea_id, linea_entrada_data, linea_num, user_data)
-        return success_response(
-            data=LineasEntradaResponse.model_validate(updated_data).model_dump(mode="json"),
-            message="Producción linea entrada actualizada"
-        )
-    except NotFoundError as e:
-        return error_response(
-            message=str(e), status_code=status.HTTP_404_NOT_FOUND
-        )
-    except RepositoryError as e:
-        return error_response(
-            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    updated_data = use_cases.update_linea_entrada(linea_id, linea_entrada_data, linea_num, user_data)
+    return success_response(
+        data=LineasEntradaResponse.model_validate(updated_data).model_dump(mode="json"),
+        message="Producción linea entrada actualizada"
+    )
 
 
 @router.delete("/{linea_num}/{linea_id}", status_code=status.HTTP_200_OK)
@@ -117,16 +151,11 @@ def remove_linea_entrada(
         use_cases: LineasEntradaUseCase = Depends(get_lineas_entrada_use_case),
         user_data: Dict[str, Any] = Depends(get_current_user_data)
 ):
-    try:
-        use_cases.remove_linea_entrada(linea_id, linea_num, user_data)
-        return success_response(
-            data={"id_linea_entrada_removida": linea_id},
-            message="Linea Entrada removida"
-        )
-    except RepositoryError as e:
-        return error_response(
-            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    use_cases.remove_linea_entrada(linea_id, linea_num, user_data)
+    return success_response(
+        data={"id_linea_entrada_removida": linea_id},
+        message="Linea Entrada removida"
+    )
 
 
 @router.patch("/{linea_num}/{linea_id}/update_cod_parrilla", response_model=LineasEntradaResponse,
@@ -138,20 +167,11 @@ def update_codigo_parrilla(
         use_case: LineasEntradaUseCase = Depends(get_lineas_entrada_use_case),
         user_data: Dict[str, Any] = Depends(get_current_user_data)
 ):
-    try:
-        updated_data = use_case.update_codigo_parrilla(linea_id, linea_num, data.valor, user_data)
-        return success_response(
-            data=LineasEntradaResponse.model_validate(updated_data).model_dump(mode="json"),
-            message="Código parrilla actualizado correctamente"
-        )
-    except NotFoundError as e:
-        return error_response(
-            message=str(e), status_code=status.HTTP_404_NOT_FOUND
-        )
-    except RepositoryError as e:
-        return error_response(
-            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    updated_data = use_case.update_codigo_parrilla(linea_id, linea_num, data.valor, user_data)
+    return success_response(
+        data=LineasEntradaResponse.model_validate(updated_data).model_dump(mode="json"),
+        message="Código parrilla actualizado correctamente"
+    )
 
 @router.put("/{linea_num}/agregar_panza", status_code=status.HTTP_200_OK)
 def agregar_panza(
@@ -185,4 +205,56 @@ def get_total_lineas_entrada_by_filters(
     except RepositoryError as e:
         return error_response(
             message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/{linea_num}/anomalias", response_model=AnomaliasResponse, status_code=status.HTTP_200_OK)
+def detectar_anomalias_entrada(
+        filters: AnomaliasFilters,
+        linea_num: int = linea_path(),
+        use_case: PesosUseCase = Depends(get_pesos_entrada_use_case)
+):
+    try:
+        result = use_case.detectar_anomalias(linea_num, filters)
+        return success_response(
+            data=result,
+            message=f"Pesajes atípicos de la linea {linea_num} entrada obtenidos correctamente"
+        )
+    except RepositoryError as e:
+        return error_response(
+            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@router.post("/{linea_num}/secuencia/analisis", response_model=SecuenciaAnalisisResponse,
+             status_code=status.HTTP_200_OK)
+def analizar_secuencia(
+        filters: SecuenciaFilters,
+        linea_num: int = linea_path(),
+        use_case: LineasEntradaUseCase = Depends(get_lineas_entrada_report_use_case)
+):
+    try:
+        result = use_case.analizar_secuencia(linea_num, filters)
+        return success_response(
+            data=result,
+            message=f"Análisis de secuencia de la linea {linea_num} entrada obtenido correctamente"
+        )
+    except RepositoryError as e:
+        return error_response(
+            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@router.put("/{linea_num}/secuencia/renumerar", response_model=RenumerarSecuenciaResponse,
+            status_code=status.HTTP_200_OK)
+def renumerar_secuencia(
+        data: RenumerarSecuenciaRequest,
+        linea_num: int = linea_path(),
+        use_case: LineasEntradaUseCase = Depends(get_lineas_entrada_use_case),
+        user_data: Dict[str, Any] = Depends(get_current_user_data)
+):
+    result = use_case.renumerar_secuencia(linea_num, data, user_data)
+    return success_response(
+        data=result,
+        message="Rango de secuencia renumerado correctamente"
+    )
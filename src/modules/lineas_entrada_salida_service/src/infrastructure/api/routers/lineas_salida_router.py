@@ -1,7 +1,7 @@
-from typing import Dict, Any
+from typing import Annotated, Dict, Any, Iterator, Optional
 import logging
 
-from fastapi import APIRouter, Depends, status, Path
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_salida import LineasSalidaMigaResponse
@@ -9,18 +9,29 @@ from src.modules.lineas_entrada_salida_service.src.infrastructure.db.repositorie
 from src.modules.auth_service.src.application.use_cases.audit_use_case import AuditUseCase
 from src.modules.lineas_entrada_salida_service.src.application.use_cases.lineas_salida_use_case import LineasSalidaUseCase
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_salida import TaraIdRequest, \
-    PanzaRequest, UpdateLoteRequest, MigaRequest
+    PanzaRequest, UpdateLoteRequest, MigaRequest, MigaBatchRequest, TaraBatchRequest
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_shared import LineasPagination, \
-    UpdateCodigoParrillaRequest, LineasFilters
+    UpdateCodigoParrillaRequest, LineasFilters, linea_path
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_salida import LineasSalidaResponse, \
     LineasSalidaUpdate
 from src.modules.lineas_entrada_salida_service.src.infrastructure.db.repositories.control_tara import ControlTaraRepository
 from src.modules.lineas_entrada_salida_service.src.infrastructure.db.repositories.lineas_salida_repository import \
     LineasSalidaRepository
-from src.shared.base import get_db, get_auth_db
+from src.modules.lineas_entrada_salida_service.src.application.use_cases.pesos_use_case import PesosUseCase
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.pesos import AnomaliasFilters, \
+    AnomaliasResponse, HistogramaSalidaFilters, HistogramaResponse
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.repositories.pesos_repository import \
+    PesosRepository
+from src.modules.lineas_entrada_salida_service.src.application.use_cases.resumen_lineas_use_case import \
+    ResumenLineasUseCase
+from src.modules.lineas_entrada_salida_service.src.infrastructure.resumen_lineas_worker import \
+    get_resumen_lineas_use_case
+from src.shared.base import get_db, get_auth_db, get_report_db, read_only_session
 from src.shared.common.auditoria import get_audit_use_case
-from src.shared.common.responses import success_response, error_response
-from src.shared.exceptions import RepositoryError, NotFoundError
+from src.shared.database import SessionLocalAuth, SessionLocalReport
+from src.shared.jobs import ColaLlena, job_data, job_runner
+from src.shared.common.responses import success_response, error_response, validate_many
+from src.shared.exceptions import RepositoryError
 from src.shared.security import get_current_user_data
 
 router = APIRouter()
@@ -29,20 +40,40 @@ router = APIRouter()
 def get_lineas_salida_use_case(
         db_externa: Session = Depends(get_db),
         db_auth: Session = Depends(get_auth_db),
-        audit_uc: AuditUseCase = Depends(get_audit_use_case)
+        audit_uc: AuditUseCase = Depends(get_audit_use_case),
+        resumen_uc: Optional[ResumenLineasUseCase] = Depends(get_resumen_lineas_use_case)
 ) -> LineasSalidaUseCase:
     return LineasSalidaUseCase(
         lineas_salida_repository=LineasSalidaRepository(db_externa),
         control_tara_repository=ControlTaraRepository(db_auth),
         control_miga_repository=ControlMigaRepository(db_auth),
+        audit_use_case=audit_uc,
+        resumen_lineas=resumen_uc
+    )
+
+
+def get_lineas_salida_report_use_case(
+        db_report: Session = Depends(get_report_db),
+        db_auth: Session = Depends(get_auth_db),
+        audit_uc: AuditUseCase = Depends(get_audit_use_case)
+) -> LineasSalidaUseCase:
+    """Solo para endpoints de lectura: las tablas de línea se leen por el engine de reportes."""
+    return LineasSalidaUseCase(
+        lineas_salida_repository=LineasSalidaRepository(db_report),
+        control_tara_repository=ControlTaraRepository(db_auth),
+        control_miga_repository=ControlMigaRepository(db_auth),
         audit_use_case=audit_uc
     )
 
 
+def get_pesos_salida_use_case(db: Session = Depends(get_report_db)) -> PesosUseCase:
+    return PesosUseCase(pesos_repository=PesosRepository(db, "salida"))
+
+
 @router.post("/{linea_num}/paginated", status_code=status.HTTP_200_OK)
 def get_all_lineas_salida(
         pagination_params: LineasPagination,
-        linea_num: int = Path(..., ge=1, le=6, description="Número de Línea (1 al 6)"),
+        linea_num: int = linea_path(),
         use_case: LineasSalidaUseCase = Depends(get_lineas_salida_use_case)
 ):
     try:
@@ -51,10 +82,7 @@ def get_all_lineas_salida(
             linea_num=linea_num
         )
 
-        response_data = [
-            LineasSalidaResponse.model_validate(d).model_dump(mode="json")
-            for d in pagination_result["data"]
-        ]
+        response_data = validate_many(LineasSalidaResponse, pagination_result["data"])
 
         response_data_with_meta = {
             "total_records": pagination_result["total_records"],
@@ -75,11 +103,30 @@ def get_all_lineas_salida(
         )
 
 
+# Antes de /{linea_num}/{linea_id}: si no, "histogram" se validaría como linea_id
+@router.get("/{linea_num}/histogram", response_model=HistogramaResponse, status_code=status.HTTP_200_OK)
+def get_histograma_salida(
+        filters: Annotated[HistogramaSalidaFilters, Query()],
+        linea_num: int = linea_path(),
+        use_case: PesosUseCase = Depends(get_pesos_salida_use_case)
+):
+    try:
+        result = use_case.get_histograma(linea_num, filters)
+        return success_response(
+            data=result,
+            message=f"Histograma de pesos de la linea {linea_num} salida obtenido correctamente"
+        )
+    except RepositoryError as e:
+        return error_response(
+            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
 @router.get("/{linea_num}/{linea_id}", response_model=LineasSalidaResponse, status_code=status.HTTP_200_OK)
 def get_linea_salida_by_id(
         linea_id: int,
         use_cases: LineasSalidaUseCase = Depends(get_lineas_salida_use_case),
-        linea_num: int = Path(..., ge=1, le=6, description="Número de Línea (1 al 6)"),
+        linea_num: int = linea_path(),
 
 ):
     data = use_cases.get_linea_salida_by_id(linea_id, linea_num)
@@ -98,23 +145,14 @@ def update_linea_salida(
         linea_id: int,
         linea_salida_data: LineasSalidaUpdate,
         use_cases: LineasSalidaUseCase = Depends(get_lineas_salida_use_case),
-        linea_num: int = Path(..., ge=1, le=6, description="Número de Línea (1 al 6)"),
+        linea_num: int = linea_path(),
         user_data: Dict[str, Any] = Depends(get_current_user_data)
 ):
-    try:
-        updated_data = use_cases.update_linea_salida(linea_id, linea_salida_data, linea_num, user_data)
-        return success_response(
-            data=LineasSalidaResponse.model_validate(updated_data).model_dump(mode="json"),
-            message="Producción linea salida actualizada"
-        )
-    except NotFoundError as e:
-        return error_response(
-            message=str(e), status_code=status.HTTP_404_NOT_FOUND
-        )
-    except RepositoryError as e:
-        return error_response(
-            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    updated_data = use_cases.update_linea_salida(linea_id, linea_salida_data, linea_num, user_data)
+    return success_response(
+        data=LineasSalidaResponse.model_validate(updated_data).model_dump(mode="json"),
+        message="Producción linea salida actualizada"
+    )
 
 
 @router.delete("/{linea_num}/{linea_id}", status_code=status.HTTP_200_OK)
@@ -124,15 +162,11 @@ def remove_linea_salida(
         use_cases: LineasSalidaUseCase = Depends(get_lineas_salida_use_case),
         user_data: Dict[str, Any] = Depends(get_current_user_data)
 ):
-    try:
-        use_cases.remove_linea_salida(linea_id, linea_num, user_data)
-        return success_response(
-            data={"id_linea_salida_removida": linea_id},
-            message="Linea Salida removida"
-        )
-    except RepositoryError as e:
-        return error_response(
-            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    use_cases.remove_linea_salida(linea_id, linea_num, user_data)
+    return success_response(
+        data={"id_linea_salida_removida": linea_id},
+        message="Linea Salida removida"
+    )
 
 
 @router.patch("/{linea_num}/{linea_id}/agregar_tara", response_model=LineasSalidaResponse,
@@ -144,20 +178,11 @@ def agregar_tara(
         use_case: LineasSalidaUseCase = Depends(get_lineas_salida_use_case),
         user_data: Dict[str, Any] = Depends(get_current_user_data)
 ):
-    try:
-        updated_data = use_case.agregar_tara(linea_id, linea_num, data.tara_id, user_data)
-        return success_response(
-            data=LineasSalidaResponse.model_validate(updated_data).model_dump(mode="json"),
-            message="Tara agregada correctamente"
-        )
-    except NotFoundError as e:
-        return error_response(
-            message=str(e), status_code=status.HTTP_404_NOT_FOUND
-        )
-    except RepositoryError as e:
-        return error_response(
-            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    updated_data = use_case.agregar_tara(linea_id, linea_num, data.tara_id, user_data)
+    return success_response(
+        data=LineasSalidaResponse.model_validate(updated_data).model_dump(mode="json"),
+        message="Tara agregada correctamente"
+    )
 
 
 @router.patch("/{linea_num}/{linea_id}/update_cod_parrilla", response_model=LineasSalidaResponse,
@@ -169,20 +194,11 @@ def update_codigo_parrilla(
         use_case: LineasSalidaUseCase = Depends(get_lineas_salida_use_case),
         user_data: Dict[str, Any] = Depends(get_current_user_data)
 ):
-    try:
-        updated_data = use_case.update_codigo_parrilla(linea_id, linea_num, data.valor, user_data)
-        return success_response(
-            data=LineasSalidaResponse.model_validate(updated_data).model_dump(mode="json"),
-            message="Código parrilla actualizado correctamente"
-        )
-    except NotFoundError as e:
-        return error_response(
-            message=str(e), status_code=status.HTTP_404_NOT_FOUND
-        )
-    except RepositoryError as e:
-        return error_response(
-            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    updated_data = use_case.update_codigo_parrilla(linea_id, linea_num, data.valor, user_data)
+    return success_response(
+        data=LineasSalidaResponse.model_validate(updated_data).model_dump(mode="json"),
+        message="Código parrilla actualizado correctamente"
+    )
 
 @router.post("/{linea_num}/total", status_code=status.HTTP_200_OK)
 def get_total_lineas_salida_by_filters(
@@ -218,6 +234,23 @@ def agregar_panza(
         message="Panza agregada correctamente a los registros"
     )
 
+@router.put("/{linea_num}/agregar_tara", status_code=status.HTTP_200_OK)
+def agregar_tara_batch(
+        data: TaraBatchRequest,
+        linea_num: int = linea_path(),
+        use_case: LineasSalidaUseCase = Depends(get_lineas_salida_use_case),
+        user_data: Dict[str, Any] = Depends(get_current_user_data)
+):
+    updated_count = use_case.agregar_tara_batch(
+        linea_num=linea_num,
+        data=data,
+        user_data=user_data
+    )
+    return success_response(
+        data=f"Se actualizaron {updated_count} registros",
+        message="Tara agregada correctamente a los registros"
+    )
+
 @router.put("/{linea_num}/update_lote", status_code=status.HTTP_200_OK)
 def update_lote_batch(
     linea_num: int,
@@ -225,23 +258,17 @@ def update_lote_batch(
     use_case: LineasSalidaUseCase = Depends(get_lineas_salida_use_case),
     user_data: Dict[str, Any] = Depends(get_current_user_data)
 ):
-    try:
-        updated_count = use_case.update_lote_batch(
-            linea_num=linea_num,
-            ids=data.ids,
-            lote=data.lote,
-            user_data=user_data
-        )
-
-        return success_response(
-            data=f"Se actualizaron {updated_count} registros",
-            message="Lote actualizado correctamente"
-        )
+    updated_count = use_case.update_lote_batch(
+        linea_num=linea_num,
+        ids=data.ids,
+        lote=data.lote,
+        user_data=user_data
+    )
 
-    except NotFoundError as e:
-        return error_response(str(e), status.HTTP_404_NOT_FOUND)
-    except RepositoryError as e:
-        return error_response(str(e), status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return success_response(
+        data=f"Se actualizaron {updated_count} registros",
+        message="Lote actualizado correctamente"
+    )
 
 @router.post("/{linea_num}/miga", response_model=LineasSalidaMigaResponse, status_code=status.HTTP_200_OK)
 def create_miga(
@@ -261,6 +288,24 @@ def create_miga(
         message="Miga agregada correctamente"
     )
 
+@router.post("/{linea_num}/miga/batch", status_code=status.HTTP_200_OK)
+def create_migas_batch(
+        data: MigaBatchRequest,
+        linea_num: int = linea_path(),
+        use_case: LineasSalidaUseCase = Depends(get_lineas_salida_use_case),
+        user_data: Dict[str, Any] = Depends(get_current_user_data)
+):
+    created = use_case.create_migas_batch(
+        linea_num=linea_num,
+        data=data,
+        user_data=user_data
+    )
+
+    return success_response(
+        data=validate_many(LineasSalidaMigaResponse, created),
+        message=f"Se agregaron {len(created)} migas correctamente"
+    )
+
 @router.put("/{linea_num}/miga", response_model=LineasSalidaMigaResponse, status_code=status.HTTP_200_OK)
 def update_miga(
         linea_num: int,
@@ -282,7 +327,7 @@ def update_miga(
 @router.post("/{linea_num}/miga/paginated", status_code=status.HTTP_200_OK)
 def get_all_lineas_salida_with_miga(
         pagination_params: LineasPagination,
-        linea_num: int = Path(..., ge=1, le=6, description="Número de Línea (1 al 6)"),
+        linea_num: int = linea_path(),
         use_case: LineasSalidaUseCase = Depends(get_lineas_salida_use_case)
 ):
     try:
@@ -291,10 +336,7 @@ def get_all_lineas_salida_with_miga(
             linea_num=linea_num
         )
 
-        response_data = [
-            LineasSalidaMigaResponse.model_validate(d).model_dump(mode="json")
-            for d in pagination_result["data"]
-        ]
+        response_data = validate_many(LineasSalidaMigaResponse, pagination_result["data"])
 
         response_data_with_meta = {
             "total_records": pagination_result["total_records"],
@@ -317,8 +359,8 @@ def get_all_lineas_salida_with_miga(
 @router.post("/{linea_num}/miga/paginated-report", status_code=status.HTTP_200_OK)
 def get_all_lineas_salida_with_miga_report(
         pagination_params: LineasPagination,
-        linea_num: int = Path(..., ge=1, le=6, description="Número de Línea (1 al 6)"),
-        use_case: LineasSalidaUseCase = Depends(get_lineas_salida_use_case)
+        linea_num: int = linea_path(),
+        use_case: LineasSalidaUseCase = Depends(get_lineas_salida_report_use_case)
 ):
     try:
         pagination_result = use_case.get_lineas_salida_miga_paginated_by_filters_report(
@@ -326,10 +368,7 @@ def get_all_lineas_salida_with_miga_report(
             linea_num=linea_num
         )
 
-        response_data = [
-            LineasSalidaMigaResponse.model_validate(d).model_dump(mode="json")
-            for d in pagination_result["data"]
-        ]
+        response_data = validate_many(LineasSalidaMigaResponse, pagination_result["data"])
 
         response_data_with_meta = {
             "total_records": pagination_result["total_records"],
@@ -347,4 +386,55 @@ def get_all_lineas_salida_with_miga_report(
     except RepositoryError as e:
         return error_response(
             message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+        )
+
+
+def _reporte_miga_filas(linea_num: int, filters: LineasFilters) -> Iterator[Dict[str, Any]]:
+    """Filas del reporte de miga completo; corre en el pool de trabajos, con sus propias sesiones."""
+    with read_only_session(SessionLocalReport) as db_report, read_only_session(SessionLocalAuth) as db_auth:
+        use_case = LineasSalidaUseCase(
+            lineas_salida_repository=LineasSalidaRepository(db_report),
+            control_tara_repository=ControlTaraRepository(db_auth),
+            control_miga_repository=ControlMigaRepository(db_auth),
+            audit_use_case=get_audit_use_case(db_auth)
+        )
+        for bloque in use_case.iter_lineas_salida_miga_report(filters, linea_num):
+            for fila in bloque:
+                yield fila.model_dump(mode="json")
+
+
+@router.post("/{linea_num}/miga/report-jobs", status_code=status.HTTP_202_ACCEPTED)
+def crear_reporte_miga_job(
+        filters: LineasFilters,
+        linea_num: int = linea_path()
+):
+    """Encola el reporte de miga completo (sin paginar); se consulta y descarga en /api/jobs/{id}."""
+    params = {"linea_num": linea_num, "filters": filters.model_dump(mode="json", exclude_none=True)}
+    try:
+        job = job_runner.submit("reporte_miga_salida", params, lambda: _reporte_miga_filas(linea_num, filters))
+    except ColaLlena as e:
+        return error_response(message=str(e), status_code=status.HTTP_429_TOO_MANY_REQUESTS)
+
+    return success_response(
+        data=job_data(job),
+        message=f"Reporte de miga de la linea {linea_num} salida encolado",
+        status_code=status.HTTP_202_ACCEPTED
+    )
+
+
+@router.post("/{linea_num}/anomalias", response_model=AnomaliasResponse, status_code=status.HTTP_200_OK)
+def detectar_anomalias_salida(
+        filters: AnomaliasFilters,
+        linea_num: int = linea_path(),
+        use_case: PesosUseCase = Depends(get_pesos_salida_use_case)
+):
+    try:
+        result = use_case.detectar_anomalias(linea_num, filters)
+        return success_response(
+            data=result,
+            message=f"Pesajes atípicos de la linea {linea_num} salida obtenidos correctamente"
+        )
+    except RepositoryError as e:
+        return error_response(
+            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+
+from src.modules.lineas_entrada_salida_service.src.application.use_cases.productividad_use_case import \
+    ProductividadUseCase
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.productividad import \
+    ProductividadFilters, ProductividadPaginatedResponse
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.repositories.productividad_repository import \
+    ProductividadRepository
+from src.shared.base import get_report_db
+from src.shared.common.responses import success_response, error_response
+from src.shared.exceptions import RepositoryError
+
+router = APIRouter()
+
+
+def get_productividad_use_case(db: Session = Depends(get_report_db)) -> ProductividadUseCase:
+    return ProductividadUseCase(productividad_repository=ProductividadRepository(db))
+
+
+@router.post("/operarios", response_model=ProductividadPaginatedResponse, status_code=status.HTTP_200_OK)
+def get_ranking_operarios(
+        filters: ProductividadFilters,
+        use_case: ProductividadUseCase = Depends(get_productividad_use_case)
+):
+    try:
+        result = use_case.get_ranking_operarios(filters)
+        return success_response(
+            data=result,
+            message="Ranking de productividad de operarios obtenido correctamente"
+        )
+    except RepositoryError as e:
+        return error_response(
+            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
@@ -0,0 +1,67 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+
+from src.modules.administracion_service.src.infrastructure.db.repositories.especies_repository import EspeciesRepository
+from src.modules.lineas_entrada_salida_service.src.application.use_cases.rendimiento_use_case import RendimientoUseCase
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.rendimiento import RendimientoFilters, \
+    RendimientoResponse, LinajeFilters, LinajeResponse
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.repositories.rendimiento_repository import \
+    RendimientoRepository
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_shared import linea_path
+from src.modules.lineas_entrada_salida_service.src.application.use_cases.resumen_lineas_use_case import \
+    ResumenLineasUseCase
+from src.modules.lineas_entrada_salida_service.src.infrastructure.resumen_lineas_worker import \
+    get_resumen_lineas_report_use_case
+from src.shared.base import get_report_db
+from src.shared.common.responses import success_response, error_response
+from src.shared.exceptions import RepositoryError
+
+router = APIRouter()
+
+
+def get_rendimiento_use_case(
+        db: Session = Depends(get_report_db),
+        resumen_uc: Optional[ResumenLineasUseCase] = Depends(get_resumen_lineas_report_use_case)
+) -> RendimientoUseCase:
+    return RendimientoUseCase(
+        rendimiento_repository=RendimientoRepository(db),
+        especies_repository=EspeciesRepository(db),
+        resumen_lineas=resumen_uc
+    )
+
+
+@router.post("/lotes", response_model=RendimientoResponse, status_code=status.HTTP_200_OK)
+def get_rendimiento_lotes(
+        filters: RendimientoFilters,
+        use_case: RendimientoUseCase = Depends(get_rendimiento_use_case)
+):
+    try:
+        result = use_case.get_rendimiento_lotes(filters)
+        return success_response(
+            data=result,
+            message="Rendimiento por lote obtenido correctamente"
+        )
+    except RepositoryError as e:
+        return error_response(
+            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@router.post("/{linea_num}/parrillas", response_model=LinajeResponse, status_code=status.HTTP_200_OK)
+def get_linaje_parrillas(
+        filters: LinajeFilters,
+        linea_num: int = linea_path(),
+        use_case: RendimientoUseCase = Depends(get_rendimiento_use_case)
+):
+    try:
+        result = use_case.get_linaje_parrillas(linea_num, filters)
+        return success_response(
+            data=result,
+            message=f"Linaje por parrilla del lote {filters.p_lote} obtenido correctamente"
+        )
+    except RepositoryError as e:
+        return error_response(
+            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, status
+
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.throughput import ThroughputResponse
+from src.modules.lineas_entrada_salida_service.src.infrastructure.throughput_worker import get_throughput_aggregator
+from src.shared.common.responses import success_response, error_response
+
+router = APIRouter()
+
+
+@router.get("/throughput", response_model=ThroughputResponse, status_code=status.HTTP_200_OK)
+def get_throughput():
+    # Solo lee la instantánea en memoria que publica el hilo de fondo
+    aggregator = get_throughput_aggregator()
+    snapshot = aggregator.snapshot() if aggregator is not None else None
+    if snapshot is None:
+        return error_response(
+            message="El throughput de las líneas aún no está disponible",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+    return success_response(
+        data=snapshot,
+        message="Throughput de las líneas obtenido correctamente"
+    )
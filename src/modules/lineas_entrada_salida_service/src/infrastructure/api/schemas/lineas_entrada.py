@@ -1,5 +1,5 @@
 from datetime import date, datetime, time
-from pydantic import BaseModel
+from pydantic import BaseModel, conint
 from typing import Optional, List
 
 
@@ -29,3 +29,57 @@ class LineasEntradaPaginatedResponse(BaseModel):
     page: int
     page_size: int
     data: List[LineasEntradaResponse]
+
+
+class SecuenciaFilters(BaseModel):
+    fecha: date
+    lote: Optional[str] = None
+
+
+class IncidenciaSecuenciaResponse(BaseModel):
+    id: int
+    fecha: Optional[datetime]
+    hora_inicio: Optional[time]
+    p_lote: Optional[str]
+    # "secuencia" o "parrilla"
+    campo: str
+    # "invalido", "duplicado", "hueco" o "desorden"
+    tipo: str
+    codigo: Optional[str]
+    anterior: Optional[int]
+    siguiente: Optional[int]
+    repeticiones: int
+    # Solo en huecos: códigos que faltan entre el anterior y este
+    faltantes: Optional[int] = None
+
+
+class SecuenciaResumenResponse(BaseModel):
+    linea: int
+    fecha: date
+    lote: Optional[str]
+    incidencias: int
+    invalidos: int
+    duplicados: int
+    huecos: int
+    faltantes: int
+    desordenes: int
+
+
+class SecuenciaAnalisisResponse(BaseModel):
+    resumen: SecuenciaResumenResponse
+    data: List[IncidenciaSecuenciaResponse]
+
+
+class RenumerarSecuenciaRequest(BaseModel):
+    fecha: date
+    lote: Optional[str] = None
+    desde: conint(ge=1)
+    hasta: conint(ge=1)
+    valor: int
+
+
+class RenumerarSecuenciaResponse(BaseModel):
+    registros: int
+    desde: int
+    hasta: int
+    ids: List[int]
@@ -2,8 +2,7 @@ from datetime import date, datetime
 from pydantic import BaseModel, Field
 from typing import Optional, List
 
-from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_shared import LineasFilters, \
-    LineaEnum
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_shared import LineaEnum
 
 
 class LineasSalidaResponse(BaseModel):
@@ -36,7 +35,20 @@ class LineasSalidaPaginatedResponse(BaseModel):
 class TaraIdRequest(BaseModel):
     tara_id: int
 
-class PanzaRequest(LineasFilters):
+# Mismo tope que MIGA_BATCH_MAX: el IN (...) de ids cabe en los 2100 parámetros de SQL Server
+TARA_BATCH_MAX = 1000
+
+class TaraBatchRequest(BaseModel):
+    tara_id: int
+    # Registros por id, o todos los de la fecha y/o lote indicados
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=TARA_BATCH_MAX)
+    fecha: Optional[date] = None
+    lote: Optional[str] = None
+
+class PanzaRequest(BaseModel):
+    # Solo fecha y lote: la panza se aplica siempre a un lote completo
+    fecha: Optional[date] = None
+    lote: Optional[str] = None
     peso_kg: float
 
 class UpdateLoteRequest(BaseModel):
@@ -58,6 +70,13 @@ class MigaRequest(BaseModel):
     tara_id: Optional[int]
     p_miga: float
 
+# Tope de filas por lote: mantiene los IN (...) del lote bajo el límite de
+# 2100 parámetros de SQL Server.
+MIGA_BATCH_MAX = 1000
+
+class MigaBatchRequest(BaseModel):
+    items: List[MigaRequest] = Field(..., min_length=1, max_length=MIGA_BATCH_MAX)
+
 class LineasSalidaMigaResponse(LineasSalidaResponse):
     p_miga: float
     porcentaje: float
@@ -1,14 +1,39 @@
 from datetime import date
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, conint
+from fastapi import Path
+from pydantic import BaseModel, Field, confloat, conint, model_validator
+
+from src.shared.config import settings
+
+LINEA_MAX = max(settings.lineas_produccion)
+
+# Tope de valores por lista: cada uno es un parámetro del IN (...) y SQL Server
+# admite 2100 por consulta.
+FILTRO_LISTA_MAX = 500
 
 
 class LineasFilters(BaseModel):
     fecha: Optional[date] = None
     lote: Optional[str] = None
     codigo_obrero: Optional[str] = None
+    # Rango inclusivo sobre fecha_p
+    fecha_desde: Optional[date] = None
+    fecha_hasta: Optional[date] = None
+    lotes: Optional[List[str]] = Field(None, max_length=FILTRO_LISTA_MAX)
+    # Solo aplica a las líneas de salida, las únicas que registran el operario
+    codigos_obrero: Optional[List[str]] = Field(None, max_length=FILTRO_LISTA_MAX)
+    peso_min: Optional[confloat(ge=0)] = None
+    peso_max: Optional[confloat(ge=0)] = None
+
+    @model_validator(mode="after")
+    def _validar_rangos(self):
+        if self.fecha_desde and self.fecha_hasta and self.fecha_desde > self.fecha_hasta:
+            raise ValueError("fecha_desde no puede ser posterior a fecha_hasta")
+        if self.peso_min is not None and self.peso_max is not None and self.peso_min > self.peso_max:
+            raise ValueError("peso_min no puede ser mayor que peso_max")
+        return self
 
 class LineasPagination(LineasFilters):
     page: conint(ge=1) = 1
@@ -17,10 +42,10 @@ class LineasPagination(LineasFilters):
 class UpdateCodigoParrillaRequest(BaseModel):
     valor: int
 
-class LineaEnum(int, Enum):
-    L1 = 1
-    L2 = 2
-    L3 = 3
-    L4 = 4
-    L5 = 5
-    L6 = 6
\ No newline at end of file
+# L1..Ln según las líneas configuradas en settings.LINEAS_PRODUCCION
+LineaEnum = Enum("LineaEnum", {f"L{numero}": numero for numero in settings.lineas_produccion}, type=int)
+
+
+def linea_path():
+    """Parámetro de ruta `linea_num` acotado a las líneas configuradas."""
+    return Path(..., ge=1, le=LINEA_MAX, description=f"Número de Línea (1 al {LINEA_MAX})")
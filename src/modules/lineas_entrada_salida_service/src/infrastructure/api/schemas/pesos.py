@@ -0,0 +1,62 @@
+from datetime import date
+from typing import Optional, List
+
+from pydantic import BaseModel, confloat, conint
+
+HISTOGRAMA_MAX_BINS = 200
+
+
+class AnomaliasFilters(BaseModel):
+    fecha: date
+    lote: Optional[str] = None
+    # z robusto (0.6745·|x - mediana| / MAD) a partir del cual se marca el pesaje
+    umbral_z: confloat(gt=0) = 3.5
+    # Cercas de Tukey: [Q1 - k·IQR, Q3 + k·IQR]
+    factor_iqr: confloat(gt=0) = 1.5
+
+
+class AnomaliaResponse(BaseModel):
+    id: int
+    peso_kg: float
+    z: float
+    fuera_iqr: bool
+
+
+class AnomaliasResumenResponse(BaseModel):
+    linea: int
+    fecha: date
+    lote: Optional[str]
+    registros: int
+    mediana: Optional[float]
+    mad: Optional[float]
+    q1: Optional[float]
+    q3: Optional[float]
+    limite_inferior: Optional[float]
+    limite_superior: Optional[float]
+    anomalias: int
+
+
+class AnomaliasResponse(BaseModel):
+    resumen: AnomaliasResumenResponse
+    data: List[AnomaliaResponse]
+
+
+class HistogramaFilters(BaseModel):
+    fecha: Optional[date] = None
+    lote: Optional[str] = None
+    bins: conint(ge=1, le=HISTOGRAMA_MAX_BINS) = 20
+
+
+class HistogramaSalidaFilters(HistogramaFilters):
+    # Solo las tablas de salida registran el operario
+    codigo_obrero: Optional[str] = None
+
+
+class HistogramaResponse(BaseModel):
+    linea: int
+    registros: int
+    minimo: Optional[float]
+    maximo: Optional[float]
+    # bins + 1 bordes; el bin i es [bordes[i], bordes[i + 1]) y el último es cerrado
+    bordes: List[float]
+    conteos: List[int]
@@ -0,0 +1,40 @@
+from datetime import date
+from typing import Optional, List, Literal
+
+from pydantic import BaseModel, conint
+
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_shared import LineaEnum
+
+
+class ProductividadFilters(BaseModel):
+    fecha_desde: date
+    fecha_hasta: date
+    # Sin línea se rankea sobre todas las tablas de salida configuradas
+    linea: Optional[LineaEnum] = None
+    orden: Literal["peso_kg", "bandejas", "kg_hora"] = "peso_kg"
+    page: conint(ge=1) = 1
+    page_size: conint(ge=1, le=500) = 20
+
+
+class ProductividadOperarioResponse(BaseModel):
+    ranking: int
+    codigo_obrero: str
+    dias: int
+    bandejas: int
+    peso_kg: float
+    horas_activas: float
+    kg_hora: Optional[float]
+    turno_id: Optional[int]
+    turno: Optional[str]
+    area_id: Optional[int]
+    area: Optional[str]
+    linea_id: Optional[int]
+    linea: Optional[str]
+
+
+class ProductividadPaginatedResponse(BaseModel):
+    total_records: int
+    total_pages: int
+    page: int
+    page_size: int
+    data: List[ProductividadOperarioResponse]
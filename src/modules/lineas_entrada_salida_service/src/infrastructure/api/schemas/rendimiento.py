@@ -0,0 +1,94 @@
+from datetime import date
+from typing import Optional, List, Literal
+
+from pydantic import BaseModel, confloat, constr
+
+from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_shared import LineaEnum
+
+
+class RendimientoFilters(BaseModel):
+    fecha_desde: date
+    fecha_hasta: date
+    # Las tablas de línea no registran la especie: se indica la que se procesó
+    especie_id: int
+    linea: Optional[LineaEnum] = None
+    # Desviación absoluta admitida (fracción, 0.02 = 2 puntos) antes de marcar el lote
+    tolerancia: confloat(ge=0, le=1) = 0.02
+
+
+class RendimientoLoteResponse(BaseModel):
+    fecha_p: Optional[date]
+    p_lote: Optional[str]
+    linea: int
+    registros_entrada: int
+    registros_salida: int
+    entrada_kg: float
+    salida_kg: float
+    p_miga: float
+    p_panza: float
+    p_desperdicio: float
+    rendimiento: Optional[float]
+    desviacion_rendimiento: Optional[float]
+    merma: Optional[float]
+    desviacion_merma: Optional[float]
+    fuera_de_tolerancia: bool
+
+    class Config:
+        from_attributes = True
+
+
+class RendimientoResumenResponse(BaseModel):
+    especie_id: int
+    especie_nombre: str
+    rendimiento_esperado: Optional[float]
+    merma_esperada: Optional[float]
+    lotes: int
+    lotes_fuera_de_tolerancia: int
+    entrada_kg: float
+    salida_kg: float
+    rendimiento: Optional[float]
+    merma: Optional[float]
+
+
+class RendimientoResponse(BaseModel):
+    resumen: RendimientoResumenResponse
+    data: List[RendimientoLoteResponse]
+
+
+class LinajeFilters(BaseModel):
+    p_lote: constr(strip_whitespace=True, min_length=1, max_length=100)
+    # Opcional: un mismo lote puede repartirse en varias fechas de producción
+    fecha_p: Optional[date] = None
+
+
+class LinajeParrillaResponse(BaseModel):
+    fecha_p: Optional[date]
+    p_lote: Optional[str]
+    codigo_parrilla: Optional[str]
+    registros_entrada: int
+    registros_salida: int
+    entrada_kg: float
+    salida_kg: float
+    # Solo para parrillas con entrada y salida; None si falta uno de los lados
+    perdida_kg: Optional[float]
+    perdida: Optional[float]
+    rendimiento: Optional[float]
+    estado: Literal["conciliada", "sin_salida", "sin_entrada"]
+
+
+class LinajeResumenResponse(BaseModel):
+    linea: int
+    p_lote: str
+    fecha_p: Optional[date]
+    parrillas: int
+    parrillas_sin_salida: int
+    parrillas_sin_entrada: int
+    entrada_kg: float
+    salida_kg: float
+    perdida_kg: float
+    perdida: Optional[float]
+
+
+class LinajeResponse(BaseModel):
+    resumen: LinajeResumenResponse
+    data: List[LinajeParrillaResponse]
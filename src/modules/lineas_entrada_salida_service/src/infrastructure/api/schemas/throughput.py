@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Optional, List
+
+from pydantic import BaseModel
+
+
+class ThroughputTablaResponse(BaseModel):
+    # kg de los últimos 60 minutos y de los últimos 15 minutos extrapolados a la hora
+    kg_hora: float
+    kg_hora_15m: float
+    registros_hora: int
+    ultimo_pesaje: Optional[datetime]
+    ultimo_id: int
+
+
+class ThroughputLineaResponse(BaseModel):
+    linea: int
+    entrada: ThroughputTablaResponse
+    salida: ThroughputTablaResponse
+
+
+class ThroughputResponse(BaseModel):
+    actualizado: datetime
+    ventana_horas: int
+    lineas: List[ThroughputLineaResponse]
@@ -0,0 +1,91 @@
+"""
+Índices de soporte para los filtros de las tablas reg_linea_*.
+
+Las tablas de línea viven en la base externa y Alembic no las migra; este
+comando crea los índices solo cuando el esquema es nuestro y hay que pedirlo
+explícitamente. Es idempotente: omite las tablas que no existen y los índices
+cuyas columnas clave ya encabezan otro índice de la tabla, con cualquier nombre.
+
+- (fecha_p, p_lote) en las doce tablas
+- (fecha_p, codigo_obrero) en las seis de salida, las únicas con operario
+
+peso_kg va como columna incluida (INCLUDE) en SQL Server y PostgreSQL, así los
+conteos, sumas y filtros de peso por día/lote se resuelven sin leer la tabla.
+
+Uso:
+    python -m src.modules.lineas_entrada_salida_service.src.infrastructure.db.line_indexes [--dry-run]
+"""
+import argparse
+from functools import lru_cache
+from typing import List, Tuple
+
+from sqlalchemy import Index, inspect
+from sqlalchemy.engine import Engine
+
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.models import (
+    LINEAS_ENTRADA_ORM, LINEAS_SALIDA_ORM,
+)
+
+_CLAVES = {
+    "entrada": (("fecha_p", "p_lote"),),
+    "salida": (("fecha_p", "p_lote"), ("fecha_p", "codigo_obrero")),
+}
+_INCLUIDAS = ["peso_kg"]
+
+
+@lru_cache(maxsize=None)
+def line_indexes() -> Tuple[Index, ...]:
+    """Definición de los índices; se arma una sola vez porque cada Index queda asociado a su tabla."""
+    indexes = []
+    for tipo, models in (("entrada", LINEAS_ENTRADA_ORM), ("salida", LINEAS_SALIDA_ORM)):
+        for orm_model in models.values():
+            table = orm_model.__table__
+            for claves in _CLAVES[tipo]:
+                indexes.append(Index(
+                    f"ix_{table.name}_{'_'.join(claves)}",
+                    *(table.c[columna] for columna in claves),
+                    mssql_include=_INCLUIDAS,
+                    postgresql_include=_INCLUIDAS,
+                ))
+    return tuple(indexes)
+
+
+def ensure_line_indexes(engine: Engine, dry_run: bool = False) -> List[Tuple[str, str]]:
+    """Crea los índices que falten y devuelve (índice, estado) por cada uno."""
+    inspector = inspect(engine)
+    resultado = []
+    for index in line_indexes():
+        tabla = index.table.name
+        if not inspector.has_table(tabla):
+            resultado.append((index.name, "tabla inexistente"))
+            continue
+
+        claves = [column.name for column in index.columns]
+        existente = next(
+            (e["name"] for e in inspector.get_indexes(tabla) if e["column_names"][:len(claves)] == claves),
+            None,
+        )
+        if existente is not None:
+            resultado.append((index.name, f"cubierto por {existente}"))
+            continue
+
+        if not dry_run:
+            index.create(engine, checkfirst=True)
+        resultado.append((index.name, "por crear" if dry_run else "creado"))
+    return resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Crea los índices de soporte de las tablas reg_linea_*.")
+    parser.add_argument("--dry-run", action="store_true", help="Solo muestra qué índices se crearían")
+    args = parser.parse_args()
+
+    from src.shared.database import engine_main
+
+    print(f"Índices de línea en {engine_main.url.render_as_string(hide_password=True)}")
+    for nombre, estado in ensure_line_indexes(engine_main, dry_run=args.dry_run):
+        print(f"  {nombre:<45} {estado}")
+
+
+if __name__ == "__main__":
+    main()
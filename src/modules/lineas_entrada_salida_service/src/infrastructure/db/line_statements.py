@@ -0,0 +1,144 @@
+"""
+Sentencias de lectura precompiladas para las tablas de línea.
+
+Para cada línea y cada combinación de filtros activos se construye una sola
+vez un `select()` con `bindparam` en lugar de valores literales. Así cada
+llamada reutiliza el mismo objeto de sentencia (y su cache key memoizada) y
+SQLAlchemy encuentra la forma ya compilada en su caché, en vez de rearmar la
+consulta y recalcular la clave en cada petición.
+
+Todos los filtros son sargables: igualdad, rangos (>=, <=) e IN sobre la
+columna desnuda, sin funciones que impidan usar un índice.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Sequence, Tuple, Union
+
+from sqlalchemy import and_, bindparam, func, select
+from sqlalchemy.sql import Select
+
+from src.shared.exceptions import RepositoryError
+
+PAGE_LIMIT = "_limit"
+PAGE_OFFSET = "_offset"
+
+# Operadores de filtro: cada uno recibe la columna y el nombre del bindparam.
+# "in" usa un bindparam expanding: la lista se despliega en IN (...) al ejecutar.
+OPERADORES = {
+    "eq": lambda column, name: column == bindparam(name),
+    "ge": lambda column, name: column >= bindparam(name),
+    "le": lambda column, name: column <= bindparam(name),
+    "in": lambda column, name: column.in_(bindparam(name, expanding=True)),
+}
+
+
+def _activo(value: Any) -> bool:
+    """Un filtro cuenta si trae valor; "" y [] equivalen a no filtrar (0 sí filtra)."""
+    if value is None:
+        return False
+    if isinstance(value, (str, list, tuple)):
+        return len(value) > 0
+    return True
+
+
+@dataclass(frozen=True)
+class _LineStatements:
+    count: Select
+    all: Select
+    page: Select
+
+
+class LineStatementCache:
+    """
+    Catálogo de sentencias por (línea, filtros activos).
+
+    - `models`: {numero_linea: clase ORM}
+    - `columns`: columnas a leer, en el orden de los campos de la entidad
+    - `filters`: {campo de LineasFilters: columna} para igualdad, o
+      {campo: (columna, operador)} con un operador de OPERADORES
+    - `all_order_by` / `page_order_by`: columnas para ORDER BY ... DESC
+
+    Las sentencias se arman la primera vez que se pide cada combinación de
+    filtros: con rangos y listas las combinaciones posibles son demasiadas
+    para precompilarlas todas al importar.
+    """
+
+    def __init__(
+        self,
+        tipo: str,
+        models: Mapping[int, type],
+        columns: Sequence[str],
+        filters: Mapping[str, Union[str, Tuple[str, str]]],
+        all_order_by: Sequence[str],
+        page_order_by: Sequence[str],
+    ):
+        self.tipo = tipo
+        self.models = dict(models)
+        self.filters: Dict[str, Tuple[str, str]] = {
+            name: (spec, "eq") if isinstance(spec, str) else tuple(spec) for name, spec in filters.items()
+        }
+        for name, (_, operador) in self.filters.items():
+            if operador not in OPERADORES:
+                raise ValueError(f"Operador de filtro '{operador}' no soportado para {name}.")
+        self.columns = tuple(columns)
+        self.all_order_by = tuple(all_order_by)
+        self.page_order_by = tuple(page_order_by)
+        self._statements: Dict[Tuple[int, Tuple[str, ...]], _LineStatements] = {}
+        self._lock = threading.Lock()
+
+    def _build(self, linea_num: int, active: Tuple[str, ...]) -> _LineStatements:
+        table_columns = self.models[linea_num].__table__.c
+        read_columns = [table_columns[name] for name in self.columns]
+        where = []
+        for name in active:
+            column, operador = self.filters[name]
+            where.append(OPERADORES[operador](table_columns[column], name))
+        base = select(*read_columns)
+        count = select(func.count(table_columns.id))
+        if where:
+            base = base.where(and_(*where))
+            count = count.where(and_(*where))
+        return _LineStatements(
+            count=count,
+            all=base.order_by(*(table_columns[c].desc() for c in self.all_order_by)),
+            page=base.order_by(*(table_columns[c].desc() for c in self.page_order_by))
+            .limit(bindparam(PAGE_LIMIT))
+            .offset(bindparam(PAGE_OFFSET)),
+        )
+
+    def model(self, linea_num: int) -> type:
+        orm_model = self.models.get(linea_num)
+        if not orm_model:
+            raise RepositoryError(f"Línea {self.tipo} {linea_num} no válida o no implementada.")
+        return orm_model
+
+    def _lookup(self, linea_num: int, filters: Any) -> Tuple[_LineStatements, Dict[str, Any]]:
+        self.model(linea_num)
+        params = {}
+        for name in self.filters:
+            value = getattr(filters, name, None)
+            if _activo(value):
+                params[name] = list(value) if isinstance(value, (list, tuple)) else value
+        # El orden de las claves sigue el de self.filters: una sola sentencia por combinación
+        key = (linea_num, tuple(params))
+        statements = self._statements.get(key)
+        if statements is None:
+            with self._lock:
+                statements = self._statements.get(key)
+                if statements is None:
+                    statements = self._statements[key] = self._build(linea_num, key[1])
+        return statements, params
+
+    def count(self, linea_num: int, filters: Any) -> Tuple[Select, Dict[str, Any]]:
+        statements, params = self._lookup(linea_num, filters)
+        return statements.count, params
+
+    def all(self, linea_num: int, filters: Any) -> Tuple[Select, Dict[str, Any]]:
+        statements, params = self._lookup(linea_num, filters)
+        return statements.all, params
+
+    def page(self, linea_num: int, filters: Any, page: int, page_size: int) -> Tuple[Select, Dict[str, Any]]:
+        statements, params = self._lookup(linea_num, filters)
+        params[PAGE_LIMIT] = page_size
+        params[PAGE_OFFSET] = (page - 1) * page_size
+        return statements.page, params
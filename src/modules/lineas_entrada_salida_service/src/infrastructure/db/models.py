@@ -1,170 +1,58 @@
-from sqlalchemy import Column, Integer, Date, DateTime, Float, String, Time, Boolean
+from typing import Dict
 
-from src.shared.database import _BaseAuth, _BaseMain
-
-#Lineas Entrada
-class LineaUnoEntradaORM(_BaseMain):
-    __tablename__ = "reg_linea_uno_entrad"
+from sqlalchemy import Column, Integer, Date, DateTime, Float, String, Time, Boolean, Index
 
-    id = Column(Integer, primary_key=True)
-    fecha_p = Column(Date)
-    fecha = Column(DateTime)
-    peso_kg = Column(Float)
-    turno = Column(Integer)
-    codigo_secuencia = Column(String(255))
-    codigo_parrilla = Column(String(255))
-    p_lote = Column(String(100))
-    hora_inicio = Column(Time)
-    guid = Column(String(255))
-
-class LineaDosEntradaORM(_BaseMain):
-    __tablename__ = "reg_linea_dos_entrad"
-
-    id = Column(Integer, primary_key=True)
-    fecha_p = Column(Date)
-    fecha = Column(DateTime)
-    peso_kg = Column(Float)
-    turno = Column(Integer)
-    codigo_secuencia = Column(String(255))
-    codigo_parrilla = Column(String(255))
-    p_lote = Column(String(100))
-    hora_inicio = Column(Time)
-    guid = Column(String(255))
-
-class LineaTresEntradaORM(_BaseMain):
-    __tablename__ = "reg_linea_tres_entrad"
-
-    id = Column(Integer, primary_key=True)
-    fecha_p = Column(Date)
-    fecha = Column(DateTime)
-    peso_kg = Column(Float)
-    turno = Column(Integer)
-    codigo_secuencia = Column(String(255))
-    codigo_parrilla = Column(String(255))
-    p_lote = Column(String(100))
-    hora_inicio = Column(Time)
-    guid = Column(String(255))
-
-class LineaCuatroEntradaORM(_BaseMain):
-    __tablename__ = "reg_linea_cuatro_entrad"
-
-    id = Column(Integer, primary_key=True)
-    fecha_p = Column(Date)
-    fecha = Column(DateTime)
-    peso_kg = Column(Float)
-    turno = Column(Integer)
-    codigo_secuencia = Column(String(255))
-    codigo_parrilla = Column(String(255))
-    p_lote = Column(String(100))
-    hora_inicio = Column(Time)
-    guid = Column(String(255))
-
-class LineaCincoEntradaORM(_BaseMain):
-    __tablename__ = "reg_linea_cinco_entrad"
-
-    id = Column(Integer, primary_key=True)
-    fecha_p = Column(Date)
-    fecha = Column(DateTime)
-    peso_kg = Column(Float)
-    turno = Column(Integer)
-    codigo_secuencia = Column(String(255))
-    codigo_parrilla = Column(String(255))
-    p_lote = Column(String(100))
-    hora_inicio = Column(Time)
-    guid = Column(String(255))
-
-class LineaSeisEntradaORM(_BaseMain):
-    __tablename__ = "reg_linea_seis_entrad"
-
-    id = Column(Integer, primary_key=True)
-    fecha_p = Column(Date)
-    fecha = Column(DateTime)
-    peso_kg = Column(Float)
-    turno = Column(Integer)
-    codigo_secuencia = Column(String(255))
-    codigo_parrilla = Column(String(255))
-    p_lote = Column(String(100))
-    hora_inicio = Column(Time)
-    guid = Column(String(255))
-
-#Lineas Salida
-class LineaUnoSalidaORM(_BaseMain):
-    __tablename__ = "reg_linea_uno_salid"
-
-    id = Column(Integer, primary_key=True)
-    fecha_p = Column(Date)
-    fecha = Column(DateTime)
-    peso_kg = Column(Float)
-    codigo_bastidor = Column(String(255))
-    p_lote = Column(String(100))
-    codigo_parrilla = Column(String(255))
-    codigo_obrero = Column(String(255))
-    guid = Column(String(255))
-
-class LineaDosSalidaORM(_BaseMain):
-    __tablename__ = "reg_linea_dos_salid"
-
-    id = Column(Integer, primary_key=True)
-    fecha_p = Column(Date)
-    fecha = Column(DateTime)
-    peso_kg = Column(Float)
-    codigo_bastidor = Column(String(255))
-    p_lote = Column(String(100))
-    codigo_parrilla = Column(String(255))
-    codigo_obrero = Column(String(255))
-    guid = Column(String(255))
-
-class LineaTresSalidaORM(_BaseMain):
-    __tablename__ = "reg_linea_tres_salid"
-
-    id = Column(Integer, primary_key=True)
-    fecha_p = Column(Date)
-    fecha = Column(DateTime)
-    peso_kg = Column(Float)
-    codigo_bastidor = Column(String(255))
-    p_lote = Column(String(100))
-    codigo_parrilla = Column(String(255))
-    codigo_obrero = Column(String(255))
-    guid = Column(String(255))
-
-class LineaCuatroSalidaORM(_BaseMain):
-    __tablename__ = "reg_linea_cuatro_salid"
-
-    id = Column(Integer, primary_key=True)
-    fecha_p = Column(Date)
-    fecha = Column(DateTime)
-    peso_kg = Column(Float)
-    codigo_bastidor = Column(String(255))
-    p_lote = Column(String(100))
-    codigo_parrilla = Column(String(255))
-    codigo_obrero = Column(String(255))
-    guid = Column(String(255))
-
-class LineaCincoSalidaORM(_BaseMain):
-    __tablename__ = "reg_linea_cinco_salid"
+from src.shared.config import settings
+from src.shared.database import _BaseAuth, _BaseMain
 
-    id = Column(Integer, primary_key=True)
-    fecha_p = Column(Date)
-    fecha = Column(DateTime)
-    peso_kg = Column(Float)
-    codigo_bastidor = Column(String(255))
-    p_lote = Column(String(100))
-    codigo_parrilla = Column(String(255))
-    codigo_obrero = Column(String(255))
-    guid = Column(String(255))
-
-class LineaSeisSalidaORM(_BaseMain):
-    __tablename__ = "reg_linea_seis_salid"
 
-    id = Column(Integer, primary_key=True)
-    fecha_p = Column(Date)
-    fecha = Column(DateTime)
-    peso_kg = Column(Float)
-    codigo_bastidor = Column(String(255))
-    p_lote = Column(String(100))
-    codigo_parrilla = Column(String(255))
-    codigo_obrero = Column(String(255))
-    guid = Column(String(255))
+# Lineas Entrada / Salida
+# Todas las líneas comparten estructura: las clases se generan desde una sola
+# definición por tipo, una por cada línea de settings.LINEAS_PRODUCCION
+# (tablas reg_linea_<nombre>_entrad / reg_linea_<nombre>_salid).
+def _entrada_columns() -> dict:
+    return {
+        "id": Column(Integer, primary_key=True),
+        "fecha_p": Column(Date),
+        "fecha": Column(DateTime),
+        "peso_kg": Column(Float),
+        "turno": Column(Integer),
+        "codigo_secuencia": Column(String(255)),
+        "codigo_parrilla": Column(String(255)),
+        "p_lote": Column(String(100)),
+        "hora_inicio": Column(Time),
+        "guid": Column(String(255)),
+    }
+
+
+def _salida_columns() -> dict:
+    return {
+        "id": Column(Integer, primary_key=True),
+        "fecha_p": Column(Date),
+        "fecha": Column(DateTime),
+        "peso_kg": Column(Float),
+        "codigo_bastidor": Column(String(255)),
+        "p_lote": Column(String(100)),
+        "codigo_parrilla": Column(String(255)),
+        "codigo_obrero": Column(String(255)),
+        "guid": Column(String(255)),
+    }
+
+
+def _line_model(class_name: str, table_name: str, columns: dict) -> type:
+    return type(class_name, (_BaseMain,), {"__tablename__": table_name, **columns})
+
+
+LINEAS_ENTRADA_ORM: Dict[int, type] = {}
+LINEAS_SALIDA_ORM: Dict[int, type] = {}
+
+for _numero, _nombre in settings.lineas_produccion.items():
+    LINEAS_ENTRADA_ORM[_numero] = _line_model(
+        f"Linea{_nombre.capitalize()}EntradaORM", f"reg_linea_{_nombre}_entrad", _entrada_columns()
+    )
+    LINEAS_SALIDA_ORM[_numero] = _line_model(
+        f"Linea{_nombre.capitalize()}SalidaORM", f"reg_linea_{_nombre}_salid", _salida_columns()
+    )
 
 # Control Tara
 class ControlTaraOrm(_BaseAuth):
@@ -187,3 +75,31 @@ class ControlMigaOrm(_BaseAuth):
     porcentaje = Column(Float, nullable=False)
     created_at = Column(DateTime)
     updated_at = Column(DateTime)
+
+    # Una miga por registro de salida; respalda el MERGE de ControlMigaRepository.upsert
+    __table_args__ = (Index("ux_control_miga_linea_registro", "linea", "registro", unique=True),)
+
+
+# Resumen diario por línea (base de auth): conteo y kg por (linea, tipo, fecha_p,
+# lote), mantenido por el worker de resumen y por los ajustes de la API. Un lote
+# nulo se guarda como "" para que la clave primaria lo incluya.
+class ResumenLineaDiarioOrm(_BaseAuth):
+    __tablename__ = "resumen_linea_diario"
+
+    linea = Column(Integer, primary_key=True, autoincrement=False)
+    tipo = Column(String(10), primary_key=True)
+    fecha_p = Column(Date, primary_key=True)
+    lote = Column(String(100), primary_key=True, default="")
+    registros = Column(Integer, nullable=False, default=0)
+    peso_kg = Column(Float, nullable=False, default=0)
+    updated_at = Column(DateTime)
+
+
+# Último id de cada tabla reg_linea_* ya volcado en resumen_linea_diario
+class ResumenLineaCursorOrm(_BaseAuth):
+    __tablename__ = "resumen_linea_cursor"
+
+    linea = Column(Integer, primary_key=True, autoincrement=False)
+    tipo = Column(String(10), primary_key=True)
+    ultimo_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime)
@@ -1,101 +1,133 @@
-import datetime
+from dataclasses import fields
 from typing import Optional, List
 
 from src.modules.lineas_entrada_salida_service.src.application.ports.control_miga import IControlMigaRepository
+from sqlalchemy import insert, select, text, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 
-from src.modules.lineas_entrada_salida_service.src.domain.entities import ControlMiga
+from src.modules.lineas_entrada_salida_service.src.domain.entities import ControlMiga, ControlMigaUpsert
 from src.modules.lineas_entrada_salida_service.src.infrastructure.db.models import ControlMigaOrm
-from src.shared.exceptions import RepositoryError, NotFoundError
+from src.shared.exceptions import RepositoryError
 from src.shared.common.time_utils import get_ecuador_time
 
+_MIGA_FIELDS = tuple(f.name for f in fields(ControlMiga))
+_MIGA_COLUMNS = tuple(ControlMigaOrm.__table__.c[name] for name in _MIGA_FIELDS)
+
+# Crea o actualiza la miga de (linea, registro) en una sola sentencia. HOLDLOCK
+# mantiene el rango bloqueado entre la búsqueda y el insert, así dos inspectores
+# concurrentes no pueden insertar la misma miga (el índice único
+# ux_control_miga_linea_registro lo garantiza además a nivel de tabla).
+# OUTPUT devuelve la fila anterior (deleted, NULL si se insertó) y la nueva.
+_MERGE_MIGA = text(
+    f"""
+    MERGE control_miga WITH (HOLDLOCK) AS destino
+    USING (SELECT :linea AS linea, :registro AS registro) AS origen
+        ON destino.linea = origen.linea AND destino.registro = origen.registro
+    WHEN MATCHED THEN
+        UPDATE SET p_miga = :p_miga, porcentaje = :porcentaje, updated_at = :ahora
+    WHEN NOT MATCHED THEN
+        INSERT (linea, registro, p_miga, porcentaje, created_at)
+        VALUES (:linea, :registro, :p_miga, :porcentaje, :ahora)
+    OUTPUT {", ".join(f"deleted.{name}" for name in _MIGA_FIELDS)},
+           {", ".join(f"inserted.{name}" for name in _MIGA_FIELDS)};
+    """
+)
+
+
+def _to_domain(row) -> ControlMiga:
+    """Construye la entidad posicionalmente desde una Row o tupla en el orden de _MIGA_FIELDS."""
+    return ControlMiga(*row)
+
+
 class ControlMigaRepository(IControlMigaRepository):
     def __init__(self, db: Session):
         self.db = db
 
-    def _to_domain(self, miga_orm: ControlMigaOrm) -> ControlMiga:
-        """Convierte un objeto ORM de SQLAlchemy a una entidad de dominio."""
-        return ControlMiga(
-            id=miga_orm.id,
-            linea=miga_orm.linea,
-            registro=miga_orm.registro,
-            p_miga=miga_orm.p_miga,
-            porcentaje=miga_orm.porcentaje,
-            created_at=miga_orm.created_at,
-            updated_at=miga_orm.updated_at
-        )
-
-    def create(self, linea_num: int, registro: int, p_miga: float, porcentaje: float) -> ControlMiga:
-
+    def create_many(self, linea_num: int, rows: list[tuple[int, float, float]]) -> List[ControlMiga]:
+        # Una lista de parámetros sobre un insert() de Core se ejecuta como
+        # executemany (fast_executemany con pyodbc). Los ids generados se leen
+        # después en una sola consulta por (linea, registro).
+        created_at = get_ecuador_time()
         try:
-            db_miga = ControlMigaOrm(
-                linea=linea_num,
-                registro=registro,
-                p_miga=p_miga,
-                porcentaje=porcentaje,
-                created_at=get_ecuador_time()
+            self.db.execute(
+                insert(ControlMigaOrm.__table__),
+                [
+                    {"linea": linea_num, "registro": registro, "p_miga": p_miga,
+                     "porcentaje": porcentaje, "created_at": created_at}
+                    for registro, p_miga, porcentaje in rows
+                ],
             )
-
-            self.db.add(db_miga)
-            self.db.commit()
-            self.db.refresh(db_miga)
-
-            return self._to_domain(db_miga)
-
         except SQLAlchemyError as e:
-            self.db.rollback()
-            logging.error("error en repositorio")
-            raise RepositoryError("Error al crear la tara.") from e
+            logging.error(f"FALLO DE DB DETALLADO: {e}")
+            raise RepositoryError("Error al crear las migas.") from e
+
+        return self.get_by_registros_bulk(linea_num, [registro for registro, _, _ in rows])
 
     def get_by_registros_bulk(self, linea_num: int, registros: list[int]) -> List[ControlMiga]:
         try:
-            migas_orm = (
-                self.db.query(ControlMigaOrm)
-                .filter(
-                    ControlMigaOrm.linea == linea_num,
-                    ControlMigaOrm.registro.in_(registros)
-                )
-                .all()
+            table = ControlMigaOrm.__table__
+            stmt = select(*_MIGA_COLUMNS).where(
+                table.c.linea == linea_num,
+                table.c.registro.in_(registros)
             )
-            return [self._to_domain(m) for m in migas_orm]
+            return [_to_domain(row) for row in self.db.execute(stmt)]
         except SQLAlchemyError as e:
             raise RepositoryError("Error al consultar migas en bloque") from e
 
-    def update(self, id: int, p_miga: float, porcentaje: float) -> Optional[ControlMiga]:
-        miga_orm = self.db.query(ControlMigaOrm).get(id)
-
-        if miga_orm is None:
-            raise NotFoundError("Miga no encontrada.")
-
-        miga_orm.p_miga = p_miga
-        miga_orm.porcentaje = porcentaje
-        miga_orm.updated_at = get_ecuador_time()
-
+    def upsert(self, linea_num: int, registro: int, p_miga: float, porcentaje: float) -> ControlMigaUpsert:
+        params = {
+            "linea": linea_num,
+            "registro": registro,
+            "p_miga": p_miga,
+            "porcentaje": porcentaje,
+            "ahora": get_ecuador_time(),
+        }
         try:
-            self.db.commit()
-            self.db.refresh(miga_orm)
-            return self._to_domain(miga_orm)
+            if self.db.get_bind().dialect.name == "mssql":
+                row = self.db.execute(_MERGE_MIGA, params).one()
+                size = len(_MIGA_FIELDS)
+                anterior = _to_domain(row[:size]) if row[0] is not None else None
+                return ControlMigaUpsert(anterior=anterior, actual=_to_domain(row[size:]))
+            return self._upsert_portable(params)
         except SQLAlchemyError as e:
-            self.db.rollback()
-            raise RepositoryError("Error al actualizar la miga.") from e
+            logging.error(f"FALLO DE DB DETALLADO: {e}")
+            raise RepositoryError("Error al registrar la miga.") from e
+
+    def _upsert_portable(self, params: dict) -> ControlMigaUpsert:
+        """Equivalente al MERGE para motores sin él (SQLite de los benchmarks)."""
+        table = ControlMigaOrm.__table__
+        where = (table.c.linea == params["linea"], table.c.registro == params["registro"])
+        existing = self.db.execute(select(*_MIGA_COLUMNS).where(*where).with_for_update()).first()
+
+        if existing is None:
+            self.db.execute(insert(table).values(
+                linea=params["linea"], registro=params["registro"], p_miga=params["p_miga"],
+                porcentaje=params["porcentaje"], created_at=params["ahora"],
+            ))
+        else:
+            self.db.execute(update(table).where(*where).values(
+                p_miga=params["p_miga"], porcentaje=params["porcentaje"], updated_at=params["ahora"],
+            ))
+
+        actual = self.db.execute(select(*_MIGA_COLUMNS).where(*where)).one()
+        return ControlMigaUpsert(
+            anterior=_to_domain(existing) if existing is not None else None,
+            actual=_to_domain(actual),
+        )
 
     def get_by_registro(self, linea_num: int, registro: int) -> Optional[ControlMiga]:
         try:
-            miga_orm = (
-                self.db.query(ControlMigaOrm)
-                .filter(
-                    ControlMigaOrm.linea == linea_num,
-                    ControlMigaOrm.registro == registro
+            table = ControlMigaOrm.__table__
+            row = self.db.execute(
+                select(*_MIGA_COLUMNS).where(
+                    table.c.linea == linea_num,
+                    table.c.registro == registro
                 )
-                .first()
-            )
-
-            if not miga_orm:
-                return None
+            ).first()
 
-            return self._to_domain(miga_orm)
+            return _to_domain(row) if row is not None else None
 
         except SQLAlchemyError as e:
           raise RepositoryError("Error al consultar la miga.") from e
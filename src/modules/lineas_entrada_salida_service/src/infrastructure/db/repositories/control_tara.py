@@ -47,8 +47,7 @@ class ControlTaraRepository(IControlTaraRepository):
             )
 
             self.db.add(db_tara)
-            self.db.commit()
-            self.db.refresh(db_tara)
+            self.db.flush()
             return ControlTara(
                 id=db_tara.id,
                 nombre=db_tara.nombre,
@@ -58,7 +57,6 @@ class ControlTaraRepository(IControlTaraRepository):
                 is_principal=db_tara.is_principal
             )
         except SQLAlchemyError as e:
-            self.db.rollback()
             logging.error(f"FALLO DE DB DETALLADO: {e}")
             raise RepositoryError("Error al crear la tara.") from e
 
@@ -82,6 +80,27 @@ class ControlTaraRepository(IControlTaraRepository):
         except SQLAlchemyError as e:
             raise RepositoryError("Error al consultar la tara.") from e
 
+    def get_by_ids(self, tara_ids: list[int]) -> List[ControlTara]:
+        try:
+            taras_orm = (
+                self.db.query(ControlTaraOrm)
+                .filter(ControlTaraOrm.id.in_(tara_ids))
+                .all()
+            )
+            return [
+                ControlTara(
+                    id=t.id,
+                    nombre=t.nombre,
+                    descripcion=t.descripcion,
+                    peso_kg=t.peso_kg,
+                    is_active=t.is_active,
+                    is_principal=t.is_principal
+                )
+                for t in taras_orm
+            ]
+        except SQLAlchemyError as e:
+            raise RepositoryError("Error al consultar las taras.") from e
+
     def soft_delete(self, tara_id: int) -> bool:
         try:
             tara_orm = (
@@ -94,12 +113,10 @@ class ControlTaraRepository(IControlTaraRepository):
                 raise NotFoundError(f"Tara con id={tara_id} no encontrada.")
 
             tara_orm.is_active = False
-            self.db.commit()
-            self.db.refresh(tara_orm)
+            self.db.flush()
 
             return True
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al eliminar la tara.") from e
 
     def exists_by_nombre_and_peso_kg(self, nombre: str, peso_kg: float) -> bool:
@@ -144,8 +161,7 @@ class ControlTaraRepository(IControlTaraRepository):
 
             tara_orm.is_principal = principal
 
-            self.db.commit()
-            self.db.refresh(tara_orm)
+            self.db.flush()
 
             return ControlTara(
                 id=tara_orm.id,
@@ -1,61 +1,175 @@
+import logging
+from dataclasses import fields
+from datetime import date
+from functools import lru_cache
+from operator import attrgetter
 from typing import List, Tuple, Optional
 
+from sqlalchemy import String, bindparam, cast, func, or_, select, update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
 
 from src.modules.lineas_entrada_salida_service.src.application.ports.lineas_entrada import ILineasEntradaRepository
-from src.modules.lineas_entrada_salida_service.src.domain.entities import LineasEntrada
+from src.modules.lineas_entrada_salida_service.src.domain.entities import LineasEntrada, SecuenciaEntrada
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_entrada import LineasEntradaUpdate
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_shared import \
     LineasFilters
-from src.modules.lineas_entrada_salida_service.src.infrastructure.db.models import LineaUnoEntradaORM, LineaDosEntradaORM, \
-    LineaTresEntradaORM, LineaCuatroEntradaORM, LineaCincoEntradaORM, LineaSeisEntradaORM
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.line_statements import LineStatementCache
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.models import LINEAS_ENTRADA_ORM
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.sql_functions import EnteroSeguro
+from src.shared.count_cache import clave_params, count_cache, invalidar_totales
 from src.shared.exceptions import RepositoryError, NotFoundError
-
-LINEA_ORM_MAPPER = {
-    1: LineaUnoEntradaORM,
-    2: LineaDosEntradaORM,
-    3: LineaTresEntradaORM,
-    4: LineaCuatroEntradaORM,
-    5: LineaCincoEntradaORM,
-    6: LineaSeisEntradaORM
-}
-
+from src.shared.read_replica import lecturas_en_replica
+
+# Columnas de lectura en el orden de los campos de LineasEntrada: los listados usan
+# Core select() y cada Row se mapea posicionalmente a la entidad, sin crear
+# instancias ORM ni pasar por el identity map de la sesión.
+_ENTITY_COLUMNS = tuple(f.name for f in fields(LineasEntrada))
+
+# Las escrituras siguen trabajando sobre instancias ORM (identity map); para
+# devolver la entidad se leen sus atributos como tupla en el mismo orden.
+_orm_values = attrgetter(*_ENTITY_COLUMNS)
+
+
+def _to_domain(row) -> LineasEntrada:
+    """Construye la entidad posicionalmente desde una Row o tupla en el orden de _ENTITY_COLUMNS."""
+    return LineasEntrada(*row)
+
+_STATEMENTS = LineStatementCache(
+    tipo="entrada",
+    models=LINEAS_ENTRADA_ORM,
+    columns=_ENTITY_COLUMNS,
+    filters={
+        "fecha": "fecha_p",
+        "lote": "p_lote",
+        "fecha_desde": ("fecha_p", "ge"),
+        "fecha_hasta": ("fecha_p", "le"),
+        "lotes": ("p_lote", "in"),
+        "peso_min": ("peso_kg", "ge"),
+        "peso_max": ("peso_kg", "le"),
+    },
+    all_order_by=("fecha_p",),
+    page_order_by=("fecha_p", "hora_inicio"),
+)
+
+
+def _where_dia(table, con_lote: bool) -> list:
+    where = [table.c.fecha_p == bindparam("_fecha")]
+    if con_lote:
+        where.append(table.c.p_lote == bindparam("_lote"))
+    return where
+
+
+@lru_cache(maxsize=None)
+def _incidencias_statement(linea_num: int, con_lote: bool):
+    """
+    Secuencia y parrilla de cada pesaje junto a las del anterior y el siguiente
+    (LAG/LEAD) y cuántas veces se repiten en el día (COUNT OVER), en una sola
+    pasada. El orden es (fecha, hora_inicio, id): hora_inicio sola vuelve a
+    00:00 en el turno de noche y marcaría falsos desórdenes.
+    """
+    table = LINEAS_ENTRADA_ORM[linea_num].__table__
+    secuencia = EnteroSeguro(table.c.codigo_secuencia)
+    parrilla = EnteroSeguro(table.c.codigo_parrilla)
+    orden = (table.c.fecha, table.c.hora_inicio, table.c.id)
+    dia = (
+        select(
+            table.c.id, table.c.fecha, table.c.hora_inicio, table.c.p_lote,
+            table.c.codigo_secuencia, table.c.codigo_parrilla,
+            secuencia.label("secuencia"),
+            func.lag(secuencia).over(order_by=orden).label("secuencia_anterior"),
+            func.lead(secuencia).over(order_by=orden).label("secuencia_siguiente"),
+            func.count().over(partition_by=secuencia).label("repeticiones_secuencia"),
+            parrilla.label("parrilla"),
+            func.lag(parrilla).over(order_by=orden).label("parrilla_anterior"),
+            func.lead(parrilla).over(order_by=orden).label("parrilla_siguiente"),
+            func.count().over(partition_by=parrilla).label("repeticiones_parrilla"),
+        )
+        .where(*_where_dia(table, con_lote))
+        .subquery("dia")
+    )
+
+    def incidencia(valor, anterior, repeticiones):
+        return or_(valor.is_(None), repeticiones > 1, valor - anterior > 1, valor < anterior)
+
+    return (
+        select(*dia.c)
+        .where(or_(
+            incidencia(dia.c.secuencia, dia.c.secuencia_anterior, dia.c.repeticiones_secuencia),
+            incidencia(dia.c.parrilla, dia.c.parrilla_anterior, dia.c.repeticiones_parrilla),
+        ))
+        .order_by(dia.c.fecha, dia.c.hora_inicio, dia.c.id)
+    )
+
+
+@lru_cache(maxsize=None)
+def _conflictos_statement(linea_num: int, con_lote: bool):
+    """
+    Secuencias del día fuera de [desde, hasta] que ya ocupan el rango destino
+    [desde + valor, hasta + valor]: renumerar encima de ellas las duplicaría.
+    """
+    table = LINEAS_ENTRADA_ORM[linea_num].__table__
+    secuencia = EnteroSeguro(table.c.codigo_secuencia)
+    destino_desde = bindparam("_desde") + bindparam("_valor")
+    destino_hasta = bindparam("_hasta") + bindparam("_valor")
+    return (
+        select(secuencia)
+        .distinct()
+        .where(
+            *_where_dia(table, con_lote),
+            secuencia.between(destino_desde, destino_hasta),
+            ~secuencia.between(bindparam("_desde"), bindparam("_hasta")),
+        )
+        .order_by(secuencia)
+    )
+
+
+@lru_cache(maxsize=None)
+def _renumerar_statement(linea_num: int, con_lote: bool):
+    """
+    Desplaza secuencia y parrilla de un rango contiguo de secuencias en un solo
+    UPDATE; RETURNING (OUTPUT inserted.* en SQL Server) devuelve lo actualizado.
+    Una parrilla vacía o no numérica se deja como está para que el análisis la
+    siga marcando como inválida.
+    """
+    table = LINEAS_ENTRADA_ORM[linea_num].__table__
+    secuencia = EnteroSeguro(table.c.codigo_secuencia)
+    return (
+        update(table)
+        .where(*_where_dia(table, con_lote), secuencia.between(bindparam("_desde"), bindparam("_hasta")))
+        .values(
+            codigo_secuencia=cast(secuencia + bindparam("_valor"), String(255)),
+            codigo_parrilla=func.coalesce(
+                cast(EnteroSeguro(table.c.codigo_parrilla) + bindparam("_valor"), String(255)),
+                table.c.codigo_parrilla,
+            ),
+        )
+        .returning(table.c.id, table.c.codigo_secuencia, table.c.codigo_parrilla)
+    )
+
+
+@lecturas_en_replica
 class LineasEntradaRepository(ILineasEntradaRepository):
     def __init__(self, db: Session):
         self.db = db
 
     def _get_orm_model(self, linea_num: int):
-        orm_model = LINEA_ORM_MAPPER.get(linea_num)
-        if not orm_model:
-            raise RepositoryError(f"Línea entrada {linea_num} no válida o no implementada.")
-        return orm_model
-
-    def _apply_filters(self, query, filters: LineasFilters, orm_model):
-        conditions = []
+        return _STATEMENTS.model(linea_num)
 
-        if filters.fecha:
-            conditions.append(orm_model.fecha_p == filters.fecha)
-
-        if filters.lote:
-            conditions.append(orm_model.p_lote == filters.lote)
-
-        if conditions:
-            query = query.filter(and_(*conditions))
-
-        return query
+    def _invalidar_totales(self, linea_num: int) -> None:
+        invalidar_totales(self.db, ("entrada", linea_num))
 
     def count_by_filters(self, filters: LineasFilters, linea_num: int) -> int:
-        orm_model = self._get_orm_model(linea_num)
-        try:
-            query = self.db.query(func.count(orm_model.id))
+        stmt, params = _STATEMENTS.count(linea_num, filters)
 
-            query = self._apply_filters(query, filters, orm_model)
+        def contar() -> int:
+            try:
+                return self.db.execute(stmt, params).scalar() or 0
+            except SQLAlchemyError as e:
+                raise RepositoryError(f"Error al contar las lineas entrada {linea_num}.") from e
 
-            return query.scalar() or 0
-        except SQLAlchemyError as e:
-            raise RepositoryError(f"Error al contar las lineas entrada {linea_num}.") from e
+        # Compartido por los listados paginados y /total
+        return count_cache.get_or_compute(("entrada", linea_num), clave_params(params), contar, db=self.db)
 
     def get_by_id(self, linea_id: int, linea_num: int) -> Optional[LineasEntrada]:
         orm_model = self._get_orm_model(linea_num)
@@ -67,24 +181,13 @@ class LineasEntradaRepository(ILineasEntradaRepository):
             )
             if not linea_orm:
                 return None
-            return LineasEntrada(
-                id=linea_orm.id,
-                fecha_p=linea_orm.fecha_p,
-                fecha=linea_orm.fecha,
-                peso_kg=linea_orm.peso_kg,
-                turno=linea_orm.turno,
-                codigo_secuencia=linea_orm.codigo_secuencia,
-                codigo_parrilla=linea_orm.codigo_parrilla,
-                p_lote=linea_orm.p_lote,
-                hora_inicio=linea_orm.hora_inicio,
-                guid=linea_orm.guid
-            )
+            return _to_domain(_orm_values(linea_orm))
         except SQLAlchemyError as e:
             raise RepositoryError("Error al consultar la linea entrada.") from e
 
     def get_paginated_by_filters(self, filters: LineasFilters, page: int, page_size: int, linea_num: int) -> Tuple[
         List[LineasEntrada], int]:
-        orm_model = self._get_orm_model(linea_num)
+        stmt, params = _STATEMENTS.page(linea_num, filters, page, page_size)
 
         try:
             total_records = self.count_by_filters(filters, linea_num)
@@ -92,31 +195,7 @@ class LineasEntradaRepository(ILineasEntradaRepository):
             if total_records == 0:
                 return [], 0
 
-            base_query = self.db.query(orm_model)
-            data_query = self._apply_filters(base_query, filters, orm_model)
-
-            data_query = data_query.order_by(orm_model.fecha_p.desc(), orm_model.hora_inicio.desc())
-
-            offset = (page - 1) * page_size
-            data_query = data_query.limit(page_size).offset(offset)
-
-            lineas_entrada_data = data_query.all()
-
-            domain_entities = [
-                LineasEntrada(
-                    id=linea.id,
-                    fecha_p=linea.fecha_p,
-                    fecha=linea.fecha,
-                    peso_kg=linea.peso_kg,
-                    turno=linea.turno,
-                    codigo_secuencia=linea.codigo_secuencia,
-                    codigo_parrilla=linea.codigo_parrilla,
-                    p_lote=linea.p_lote,
-                    hora_inicio=linea.hora_inicio,
-                    guid=linea.guid
-                )
-                for linea in lineas_entrada_data
-            ]
+            domain_entities = [_to_domain(row) for row in self.db.execute(stmt, params)]
 
             return domain_entities, total_records
         except SQLAlchemyError as e:
@@ -124,34 +203,11 @@ class LineasEntradaRepository(ILineasEntradaRepository):
             raise RepositoryError("Error al obtener todas las líneas entrada.") from e
 
     def get_all_by_filters(self, filters: LineasFilters, linea_num: int) -> List[LineasEntrada]:
-        orm_model = self._get_orm_model(linea_num)
+        stmt, params = _STATEMENTS.all(linea_num, filters)
 
         try:
-            query = self.db.query(orm_model)
-            query = self._apply_filters(query, filters, orm_model)
-
-            query = query.order_by(orm_model.fecha_p.desc())
-
-            lineas_orm = query.all()
-
-            domain_entities = [
-                LineasEntrada(
-                    id=linea.id,
-                    fecha_p=linea.fecha_p,
-                    fecha=linea.fecha,
-                    peso_kg=linea.peso_kg,
-                    turno=linea.turno,
-                    codigo_secuencia=linea.codigo_secuencia,
-                    codigo_parrilla=linea.codigo_parrilla,
-                    p_lote=linea.p_lote,
-                    hora_inicio=linea.hora_inicio,
-                    guid=linea.guid
-                )
-                for linea in lineas_orm
-            ]
-            return domain_entities
+            return [_to_domain(row) for row in self.db.execute(stmt, params)]
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al obtener registros filtrados.") from e
 
     def update(self, linea_id: int, linea_entrada_data: LineasEntradaUpdate, linea_num: int) -> Optional[LineasEntrada]:
@@ -164,22 +220,10 @@ class LineasEntradaRepository(ILineasEntradaRepository):
             setattr(orm_model, key, value)
 
         try:
-            self.db.commit()
-            self.db.refresh(orm_model)
-            return LineasEntrada(
-                id=orm_model.id,
-                fecha_p=orm_model.fecha_p,
-                fecha=orm_model.fecha,
-                peso_kg=orm_model.peso_kg,
-                turno=orm_model.turno,
-                codigo_secuencia=orm_model.codigo_secuencia,
-                codigo_parrilla=orm_model.codigo_parrilla,
-                p_lote=orm_model.p_lote,
-                hora_inicio=orm_model.hora_inicio,
-                guid=orm_model.guid
-            )
+            self.db.flush()
+            self._invalidar_totales(linea_num)
+            return _to_domain(_orm_values(orm_model))
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al actualizar la producción de la linea entrada.") from e
 
     def remove(self, linea_id: int, linea_num: int) -> bool:
@@ -188,10 +232,10 @@ class LineasEntradaRepository(ILineasEntradaRepository):
             if not linea_orm:
                 raise NotFoundError(f"Producción de linea entrada con id={linea_id} no encontrado.")
             self.db.delete(linea_orm)
-            self.db.commit()
+            self.db.flush()
+            self._invalidar_totales(linea_num)
             return True
         except SQLAlchemyError as e:
-            self.db.rollback()
             logging.error(f"FALLO DE DB DETALLADO: {e}")
             raise RepositoryError("Error al elimar linea entrada.") from e
 
@@ -203,23 +247,11 @@ class LineasEntradaRepository(ILineasEntradaRepository):
 
             linea_orm.codigo_parrilla = valor_parrilla
             linea_orm.codigo_secuencia = valor_secuencia
-            self.db.commit()
-            self.db.refresh(linea_orm)
-
-            return LineasEntrada(
-                id=linea_orm.id,
-                fecha_p=linea_orm.fecha_p,
-                fecha=linea_orm.fecha,
-                peso_kg=linea_orm.peso_kg,
-                turno=linea_orm.turno,
-                codigo_secuencia=linea_orm.codigo_secuencia,
-                codigo_parrilla=linea_orm.codigo_parrilla,
-                p_lote=linea_orm.p_lote,
-                hora_inicio=linea_orm.hora_inicio,
-                guid=linea_orm.guid
-            )
+            self.db.flush()
+            self._invalidar_totales(linea_num)
+
+            return _to_domain(_orm_values(linea_orm))
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al actualizar el código de parrilla de la línea entrada.") from e
 
     def agregar_panzas(self, items: list[dict]) -> list[LineasEntrada]:
@@ -242,24 +274,48 @@ class LineasEntradaRepository(ILineasEntradaRepository):
             for r in registros:
                 r.peso_kg = nuevos_pesos[r.id]
 
-            self.db.commit()
-
-            return [
-                LineasEntrada(
-                    id=r.id,
-                    fecha_p=r.fecha_p,
-                    fecha=r.fecha,
-                    peso_kg=r.peso_kg,
-                    turno=r.turno,
-                    codigo_secuencia=r.codigo_secuencia,
-                    codigo_parrilla=r.codigo_parrilla,
-                    p_lote=r.p_lote,
-                    hora_inicio=r.hora_inicio,
-                    guid=r.guid
-                )
-                for r in registros
-            ]
+            self.db.flush()
+            self._invalidar_totales(linea_num)
+
+            return [_to_domain(_orm_values(r)) for r in registros]
 
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al actualizar pesos.") from e
+
+    def get_incidencias_secuencia(self, linea_num: int, fecha: date, lote: Optional[str]) -> List[SecuenciaEntrada]:
+        self._get_orm_model(linea_num)
+        stmt = _incidencias_statement(linea_num, lote is not None)
+        params = {"_fecha": fecha, "_lote": lote} if lote is not None else {"_fecha": fecha}
+        try:
+            return [SecuenciaEntrada(*row) for row in self.db.execute(stmt, params)]
+        except SQLAlchemyError as e:
+            raise RepositoryError("Error al analizar la secuencia de la línea entrada.") from e
+
+    def get_secuencias_en_conflicto(
+            self, linea_num: int, fecha: date, lote: Optional[str], desde: int, hasta: int, valor: int
+    ) -> List[int]:
+        self._get_orm_model(linea_num)
+        stmt = _conflictos_statement(linea_num, lote is not None)
+        params = {"_fecha": fecha, "_desde": desde, "_hasta": hasta, "_valor": valor}
+        if lote is not None:
+            params["_lote"] = lote
+        try:
+            return list(self.db.execute(stmt, params).scalars())
+        except SQLAlchemyError as e:
+            raise RepositoryError("Error al validar la renumeración de la secuencia de la línea entrada.") from e
+
+    def renumerar_secuencia(
+            self, linea_num: int, fecha: date, lote: Optional[str], desde: int, hasta: int, valor: int
+    ) -> List[Tuple[int, str, str]]:
+        self._get_orm_model(linea_num)
+        stmt = _renumerar_statement(linea_num, lote is not None)
+        params = {"_fecha": fecha, "_desde": desde, "_hasta": hasta, "_valor": valor}
+        if lote is not None:
+            params["_lote"] = lote
+        try:
+            actualizados = [tuple(row) for row in self.db.execute(stmt, params)]
+        except SQLAlchemyError as e:
+            logging.error(f"FALLO DE DB DETALLADO: {e}")
+            raise RepositoryError("Error al renumerar la secuencia de la línea entrada.") from e
+        self._invalidar_totales(linea_num)
+        return actualizados
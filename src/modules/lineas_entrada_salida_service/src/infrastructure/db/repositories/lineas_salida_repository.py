@@ -1,6 +1,9 @@
 import logging
-from typing import Tuple, List, Optional
-from sqlalchemy import func, and_
+from dataclasses import fields
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Iterator, Mapping, Tuple, List, Optional
+from sqlalchemy import Float, bindparam, func, select, update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
@@ -8,56 +11,94 @@ from src.modules.lineas_entrada_salida_service.src.application.ports.lineas_sali
 from src.modules.lineas_entrada_salida_service.src.domain.entities import LineasSalida
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_shared import LineasFilters
 from src.modules.lineas_entrada_salida_service.src.infrastructure.api.schemas.lineas_salida import LineasSalidaUpdate
-from src.modules.lineas_entrada_salida_service.src.infrastructure.db.models import LineaUnoSalidaORM, LineaDosSalidaORM, \
-    LineaTresSalidaORM, LineaCuatroSalidaORM, LineaCincoSalidaORM, LineaSeisSalidaORM
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.line_statements import LineStatementCache
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.models import LINEAS_SALIDA_ORM
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.sql_functions import ValorAnterior
+from src.shared.count_cache import clave_params, count_cache, invalidar_totales
 from src.shared.exceptions import RepositoryError, NotFoundError
-
-LINEA_ORM_MAPPER = {
-    1: LineaUnoSalidaORM,
-    2: LineaDosSalidaORM,
-    3: LineaTresSalidaORM,
-    4: LineaCuatroSalidaORM,
-    5: LineaCincoSalidaORM,
-    6: LineaSeisSalidaORM
-}
-
+from src.shared.read_replica import lecturas_en_replica
+
+# Columnas de lectura en el orden de los campos de LineasSalida: los listados usan
+# Core select() y cada Row se mapea posicionalmente a la entidad, sin crear
+# instancias ORM ni pasar por el identity map de la sesión.
+_ENTITY_COLUMNS = tuple(f.name for f in fields(LineasSalida))
+
+# Las escrituras siguen trabajando sobre instancias ORM (identity map); para
+# devolver la entidad se leen sus atributos como tupla en el mismo orden.
+_orm_values = attrgetter(*_ENTITY_COLUMNS)
+
+
+def _to_domain(row) -> LineasSalida:
+    """Construye la entidad posicionalmente desde una Row o tupla en el orden de _ENTITY_COLUMNS."""
+    return LineasSalida(*row)
+
+_STATEMENTS = LineStatementCache(
+    tipo="salida",
+    models=LINEAS_SALIDA_ORM,
+    columns=_ENTITY_COLUMNS,
+    filters={
+        "fecha": "fecha_p",
+        "lote": "p_lote",
+        "codigo_obrero": "codigo_obrero",
+        "fecha_desde": ("fecha_p", "ge"),
+        "fecha_hasta": ("fecha_p", "le"),
+        "lotes": ("p_lote", "in"),
+        "codigos_obrero": ("codigo_obrero", "in"),
+        "peso_min": ("peso_kg", "ge"),
+        "peso_max": ("peso_kg", "le"),
+    },
+    all_order_by=("fecha_p",),
+    page_order_by=("fecha_p",),
+)
+
+
+@lru_cache(maxsize=None)
+def _tara_statement(linea_num: int, por_ids: bool, filtros: Tuple[str, ...]):
+    """
+    UPDATE ... OUTPUT que resta la tara, redondeada a 3 decimales como en
+    agregar_tara, y devuelve cada registro junto a su peso anterior. Los
+    bindparam llevan "_" delante: en un UPDATE el nombre de una columna está
+    reservado para su propio valor.
+    """
+    table = LINEAS_SALIDA_ORM[linea_num].__table__
+    tara = bindparam("_tara", type_=Float)
+    if por_ids:
+        where = [table.c.id.in_(bindparam("_ids", expanding=True))]
+    else:
+        where = [table.c[columna] == bindparam(f"_{columna}") for columna in filtros]
+    return (
+        update(table)
+        .where(*where)
+        .values(peso_kg=func.round(table.c.peso_kg - tara, 3))
+        .returning(
+            *(table.c[name] for name in _ENTITY_COLUMNS),
+            ValorAnterior(table.c.peso_kg, table.c.peso_kg + tara),
+        )
+    )
+
+
+@lecturas_en_replica
 class LineasSalidaRepository(ILineasSalidaRepository):
     def __init__(self, db: Session):
         self.db = db
 
     def _get_orm_model(self, linea_num: int):
-        orm_model = LINEA_ORM_MAPPER.get(linea_num)
-        if not orm_model:
-            raise RepositoryError(f"Línea salida {linea_num} no válida o no implementada.")
-        return orm_model
-
-    def _apply_filters(self, query, filters: LineasFilters, orm_model):
-        conditions = []
-
-        if filters.fecha:
-            conditions.append(orm_model.fecha_p == filters.fecha)
+        return _STATEMENTS.model(linea_num)
 
-        if filters.lote:
-            conditions.append(orm_model.p_lote == filters.lote)
-
-        if filters.codigo_obrero:
-            conditions.append(orm_model.codigo_obrero == filters.codigo_obrero)
-
-        if conditions:
-            query = query.filter(and_(*conditions))
-
-        return query
+    def _invalidar_totales(self, linea_num: int) -> None:
+        invalidar_totales(self.db, ("salida", linea_num))
 
     def count_by_filters(self, filters: LineasFilters, linea_num: int) -> int:
-        orm_model = self._get_orm_model(linea_num)
-        try:
-            query = self.db.query(func.count(orm_model.id))
+        stmt, params = _STATEMENTS.count(linea_num, filters)
 
-            query = self._apply_filters(query, filters, orm_model)
+        def contar() -> int:
+            try:
+                return self.db.execute(stmt, params).scalar() or 0
+            except SQLAlchemyError as e:
+                raise RepositoryError(f"Error al contar las lineas salida {linea_num}.") from e
 
-            return query.scalar() or 0
-        except SQLAlchemyError as e:
-            raise RepositoryError(f"Error al contar las lineas salida {linea_num}.") from e
+        # Compartido por los listados paginados y /total
+        return count_cache.get_or_compute(("salida", linea_num), clave_params(params), contar, db=self.db)
 
     def get_by_id(self, linea_id: int, linea_num: int) -> Optional[LineasSalida]:
         orm_model = self._get_orm_model(linea_num)
@@ -69,54 +110,42 @@ class LineasSalidaRepository(ILineasSalidaRepository):
             )
             if not linea_orm:
                 return None
-            return LineasSalida(
-                id=linea_orm.id,
-                fecha_p=linea_orm.fecha_p,
-                fecha=linea_orm.fecha,
-                peso_kg=linea_orm.peso_kg,
-                codigo_bastidor=linea_orm.codigo_bastidor,
-                p_lote=linea_orm.p_lote,
-                codigo_parrilla=linea_orm.codigo_parrilla,
-                codigo_obrero=linea_orm.codigo_obrero,
-                guid=linea_orm.guid
-            )
+            return _to_domain(_orm_values(linea_orm))
         except SQLAlchemyError as e:
             raise RepositoryError("Error al consultar la linea salida.") from e
 
+    def get_by_ids(self, linea_num: int, ids: list[int]) -> List[LineasSalida]:
+        table = self._get_orm_model(linea_num).__table__
+        stmt = select(*(table.c[name] for name in _ENTITY_COLUMNS)).where(table.c.id.in_(ids))
+        try:
+            return [_to_domain(row) for row in self.db.execute(stmt)]
+        except SQLAlchemyError as e:
+            raise RepositoryError("Error al consultar las lineas salida.") from e
+
     def get_all_by_filters(self, filters: LineasFilters, linea_num: int) -> List[LineasSalida]:
-        orm_model = self._get_orm_model(linea_num)
+        stmt, params = _STATEMENTS.all(linea_num, filters)
 
         try:
-            query = self.db.query(orm_model)
-            query = self._apply_filters(query, filters, orm_model)
-
-            query = query.order_by(orm_model.fecha_p.desc())
-
-            lineas_orm = query.all()
-
-            domain_entities = [
-                LineasSalida(
-                    id=linea.id,
-                    fecha_p=linea.fecha_p,
-                    fecha=linea.fecha,
-                    peso_kg=linea.peso_kg,
-                    codigo_bastidor=linea.codigo_bastidor,
-                    p_lote=linea.p_lote,
-                    codigo_parrilla=linea.codigo_parrilla,
-                    codigo_obrero=linea.codigo_obrero,
-                    guid=linea.guid
-                )
-                for linea in lineas_orm
-            ]
-            return domain_entities
+            return [_to_domain(row) for row in self.db.execute(stmt, params)]
+        except SQLAlchemyError as e:
+            raise RepositoryError("Error al obtener registros filtrados.") from e
+
+    def iter_all_by_filters(self, filters: LineasFilters, linea_num: int,
+                            chunk_size: int) -> Iterator[List[LineasSalida]]:
+        """Como get_all_by_filters, pero leído por bloques de `chunk_size` filas sin cargar todo el resultado."""
+        stmt, params = _STATEMENTS.all(linea_num, filters)
+
+        try:
+            result = self.db.execute(stmt, params, execution_options={"yield_per": chunk_size})
+            for partition in result.partitions():
+                yield [_to_domain(row) for row in partition]
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al obtener registros filtrados.") from e
 
 
     def get_paginated_by_filters(self, filters: LineasFilters, page: int, page_size: int, linea_num: int) -> Tuple[
         List[LineasSalida], int]:
-        orm_model = self._get_orm_model(linea_num)
+        stmt, params = _STATEMENTS.page(linea_num, filters, page, page_size)
 
         try:
             total_records = self.count_by_filters(filters, linea_num)
@@ -124,30 +153,7 @@ class LineasSalidaRepository(ILineasSalidaRepository):
             if total_records == 0:
                 return [], 0
 
-            base_query = self.db.query(orm_model)
-            data_query = self._apply_filters(base_query, filters, orm_model)
-
-            data_query = data_query.order_by(orm_model.fecha_p.desc())
-
-            offset = (page - 1) * page_size
-            data_query = data_query.limit(page_size).offset(offset)
-
-            lineas_entrada_data = data_query.all()
-
-            domain_entities = [
-                LineasSalida(
-                    id=linea.id,
-                    fecha_p=linea.fecha_p,
-                    fecha=linea.fecha,
-                    peso_kg=linea.peso_kg,
-                    codigo_bastidor=linea.codigo_bastidor,
-                    p_lote=linea.p_lote,
-                    codigo_parrilla=linea.codigo_parrilla,
-                    codigo_obrero=linea.codigo_obrero,
-                    guid=linea.guid
-                )
-                for linea in lineas_entrada_data
-            ]
+            domain_entities = [_to_domain(row) for row in self.db.execute(stmt, params)]
             return domain_entities, total_records
         except SQLAlchemyError as e:
             logging.error(f"FALLO DE DB DETALLADO: {e}")
@@ -166,22 +172,11 @@ class LineasSalidaRepository(ILineasSalidaRepository):
 
 
         try:
-            self.db.commit()
-            self.db.refresh(orm_model)
-            return LineasSalida(
-                id=orm_model.id,
-                fecha_p=orm_model.fecha_p,
-                fecha=orm_model.fecha,
-                peso_kg=orm_model.peso_kg,
-                codigo_bastidor=orm_model.codigo_bastidor,
-                p_lote=orm_model.p_lote,
-                codigo_parrilla=orm_model.codigo_parrilla,
-                codigo_obrero=orm_model.codigo_obrero,
-                guid=orm_model.guid
-            )
+            self.db.flush()
+            self._invalidar_totales(linea_num)
+            return _to_domain(_orm_values(orm_model))
 
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al actualizar la producción de la linea salida.") from e
 
     def remove(self, linea_id: int, linea_num: int) -> bool:
@@ -190,10 +185,10 @@ class LineasSalidaRepository(ILineasSalidaRepository):
             if not linea_orm:
                 raise NotFoundError(f"Producción de linea salida con id={linea_id} no encontrado.")
             self.db.delete(linea_orm)
-            self.db.commit()
+            self.db.flush()
+            self._invalidar_totales(linea_num)
             return True
         except SQLAlchemyError as e:
-            self.db.rollback()
             logging.error(f"FALLO DE DB DETALLADO: {e}")
             raise RepositoryError("Error al elimar linea salida.") from e
 
@@ -206,22 +201,11 @@ class LineasSalidaRepository(ILineasSalidaRepository):
                 return None
 
             linea_orm.peso_kg = peso_kg
-            self.db.commit()
-            self.db.refresh(linea_orm)
-
-            return LineasSalida(
-                id=linea_orm.id,
-                fecha_p=linea_orm.fecha_p,
-                fecha=linea_orm.fecha,
-                peso_kg=linea_orm.peso_kg,
-                codigo_bastidor=linea_orm.codigo_bastidor,
-                p_lote=linea_orm.p_lote,
-                codigo_parrilla=linea_orm.codigo_parrilla,
-                codigo_obrero=linea_orm.codigo_obrero,
-                guid=linea_orm.guid
-            )
+            self.db.flush()
+            self._invalidar_totales(linea_num)
+
+            return _to_domain(_orm_values(linea_orm))
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al agregar la tara a la línea salida.") from e
 
 
@@ -232,22 +216,11 @@ class LineasSalidaRepository(ILineasSalidaRepository):
                 raise NotFoundError(f"Producción de linea salida con id={linea_id} no encontrado.")
 
             linea_orm.codigo_parrilla = valor_parrilla
-            self.db.commit()
-            self.db.refresh(linea_orm)
-
-            return LineasSalida(
-                id=linea_orm.id,
-                fecha_p=linea_orm.fecha_p,
-                fecha=linea_orm.fecha,
-                peso_kg=linea_orm.peso_kg,
-                codigo_bastidor=linea_orm.codigo_bastidor,
-                p_lote=linea_orm.p_lote,
-                codigo_parrilla=linea_orm.codigo_parrilla,
-                codigo_obrero=linea_orm.codigo_obrero,
-                guid=linea_orm.guid
-            )
+            self.db.flush()
+            self._invalidar_totales(linea_num)
+
+            return _to_domain(_orm_values(linea_orm))
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al actualizar el código de parrilla de la línea salida.") from e
 
     def agregar_panzas(self, items: list[dict]) -> list[LineasSalida]:
@@ -270,25 +243,12 @@ class LineasSalidaRepository(ILineasSalidaRepository):
             for r in registros:
                 r.peso_kg = nuevos_pesos[r.id]
 
-            self.db.commit()
-
-            return [
-                LineasSalida(
-                    id=r.id,
-                    fecha_p=r.fecha_p,
-                    fecha=r.fecha,
-                    peso_kg=r.peso_kg,
-                    codigo_bastidor=r.codigo_bastidor,
-                    p_lote=r.p_lote,
-                    codigo_parrilla=r.codigo_parrilla,
-                    codigo_obrero=r.codigo_obrero,
-                    guid=r.guid,
-                )
-                for r in registros
-            ]
+            self.db.flush()
+            self._invalidar_totales(linea_num)
+
+            return [_to_domain(_orm_values(r)) for r in registros]
 
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al actualizar pesos.") from e
 
     def update_lote(self, items: list[dict], lote:str) -> list[LineasSalida]:
@@ -311,25 +271,12 @@ class LineasSalidaRepository(ILineasSalidaRepository):
             for r in registros:
                 r.peso_kg = nuevos_pesos[r.id]
 
-            self.db.commit()
-
-            return [
-                LineasSalida(
-                    id=r.id,
-                    fecha_p=r.fecha_p,
-                    fecha=r.fecha,
-                    peso_kg=r.peso_kg,
-                    codigo_bastidor=r.codigo_bastidor,
-                    p_lote=r.p_lote,
-                    codigo_parrilla=r.codigo_parrilla,
-                    codigo_obrero=r.codigo_obrero,
-                    guid=r.guid,
-                )
-                for r in registros
-            ]
+            self.db.flush()
+            self._invalidar_totales(linea_num)
+
+            return [_to_domain(_orm_values(r)) for r in registros]
 
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al actualizar pesos.") from e
 
     def update_lote_by_ids(self, linea_num: int, ids: list[int], lote: str) -> list[LineasSalida]:
@@ -351,23 +298,28 @@ class LineasSalidaRepository(ILineasSalidaRepository):
             for r in registros:
                 r.p_lote = lote
 
-            self.db.commit()
-
-            return [
-                LineasSalida(
-                    id=r.id,
-                    fecha_p=r.fecha_p,
-                    fecha=r.fecha,
-                    peso_kg=r.peso_kg,
-                    codigo_bastidor=r.codigo_bastidor,
-                    p_lote=r.p_lote,
-                    codigo_parrilla=r.codigo_parrilla,
-                    codigo_obrero=r.codigo_obrero,
-                    guid=r.guid,
-                )
-                for r in registros
-            ]
+            self.db.flush()
+            self._invalidar_totales(linea_num)
+
+            return [_to_domain(_orm_values(r)) for r in registros]
 
         except Exception as e:
-            self.db.rollback()
-            raise RepositoryError("Error al actualizar el lote.") from e
\ No newline at end of file
+            raise RepositoryError("Error al actualizar el lote.") from e
+
+    def agregar_tara_batch(
+            self, linea_num: int, tara_kg: float, ids: Optional[list[int]], filtros: Mapping[str, Any]
+    ) -> list[Tuple[LineasSalida, Optional[float]]]:
+        self._get_orm_model(linea_num)
+        stmt = _tara_statement(linea_num, ids is not None, tuple(filtros))
+        params = {"_tara": tara_kg}
+        if ids is not None:
+            params["_ids"] = ids
+        else:
+            params.update({f"_{columna}": valor for columna, valor in filtros.items()})
+        try:
+            actualizados = [(_to_domain(row[:-1]), row[-1]) for row in self.db.execute(stmt, params)]
+        except SQLAlchemyError as e:
+            logging.error(f"FALLO DE DB DETALLADO: {e}")
+            raise RepositoryError("Error al agregar la tara a las líneas salida.") from e
+        self._invalidar_totales(linea_num)
+        return actualizados
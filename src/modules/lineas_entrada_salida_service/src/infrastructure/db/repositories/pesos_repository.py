@@ -0,0 +1,107 @@
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Mapping, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import Float, Integer, bindparam, cast, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from src.modules.lineas_entrada_salida_service.src.application.ports.pesos import IPesosRepository
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.models import (
+    LINEAS_ENTRADA_ORM, LINEAS_SALIDA_ORM,
+)
+from src.shared.exceptions import RepositoryError
+
+_MODELS: Mapping[str, Mapping[int, type]] = {"entrada": LINEAS_ENTRADA_ORM, "salida": LINEAS_SALIDA_ORM}
+
+
+def _where(table, filtros: Tuple[str, ...]) -> list:
+    """Igualdad por cada columna filtrada, con el nombre de la columna como bindparam."""
+    return [table.c[columna] == bindparam(columna) for columna in filtros]
+
+
+@lru_cache(maxsize=None)
+def _pesos_statements(tipo: str, linea_num: int, filtros: Tuple[str, ...]) -> Tuple[Select, Select]:
+    """(versión, valores) de una línea para la combinación de filtros activos."""
+    table = _MODELS[tipo][linea_num].__table__
+    where = _where(table, filtros)
+    version = select(
+        func.max(table.c.id), func.count(table.c.id), func.coalesce(func.sum(table.c.peso_kg), 0)
+    ).where(*where)
+    valores = select(table.c.id, table.c.peso_kg).where(*where, table.c.peso_kg.is_not(None))
+    return version, valores
+
+
+@lru_cache(maxsize=None)
+def _histograma_statements(tipo: str, linea_num: int, filtros: Tuple[str, ...]) -> Tuple[Select, Select]:
+    """
+    (rango, buckets): el rango da registros, mínimo y máximo; los buckets cuentan
+    por CAST((peso - mínimo) / ancho AS INT) en el motor, así solo viajan `bins`
+    filas. El bucket se agrupa desde una tabla derivada porque SQL Server no
+    reconoce como iguales dos expresiones con parámetros en SELECT y GROUP BY.
+    """
+    table = _MODELS[tipo][linea_num].__table__
+    where = [*_where(table, filtros), table.c.peso_kg.is_not(None)]
+    rango = select(func.count(table.c.peso_kg), func.min(table.c.peso_kg), func.max(table.c.peso_kg)).where(*where)
+    bucket = cast(
+        (table.c.peso_kg - bindparam("_minimo", type_=Float)) / bindparam("_ancho", type_=Float), Integer
+    ).label("bucket")
+    derivada = select(bucket).where(*where).subquery("pesos")
+    buckets = select(derivada.c.bucket, func.count()).group_by(derivada.c.bucket)
+    return rango, buckets
+
+
+class PesosRepository(IPesosRepository):
+    def __init__(self, db: Session, tipo: str):
+        self.db = db
+        self.tipo = tipo
+
+    def _check_linea(self, linea_num: int) -> None:
+        if linea_num not in _MODELS[self.tipo]:
+            raise RepositoryError(f"Línea {self.tipo} {linea_num} no válida o no implementada.")
+
+    def _execute(self, linea_num: int, stmt: Select, params: Mapping[str, Any]):
+        try:
+            return self.db.execute(stmt, params)
+        except SQLAlchemyError as e:
+            raise RepositoryError(f"Error al consultar los pesos de la linea {self.tipo} {linea_num}.") from e
+
+    def get_version(self, linea_num: int, filtros: Mapping[str, Any]) -> Tuple[Optional[int], int, float]:
+        self._check_linea(linea_num)
+        version, _ = _pesos_statements(self.tipo, linea_num, tuple(filtros))
+        max_id, registros, peso_total = self._execute(linea_num, version, filtros).one()
+        return max_id, registros, float(peso_total)
+
+    def get_pesos(self, linea_num: int, filtros: Mapping[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        self._check_linea(linea_num)
+        _, valores = _pesos_statements(self.tipo, linea_num, tuple(filtros))
+        try:
+            result = self._execute(linea_num, valores, filtros)
+            # Las filas (id, peso) se aplanan directo al buffer del arreglo, sin entidades
+            plano = np.fromiter(chain.from_iterable(result), dtype=np.float64)
+        except SQLAlchemyError as e:
+            raise RepositoryError(f"Error al consultar los pesos de la linea {self.tipo} {linea_num}.") from e
+        pares = plano.reshape(-1, 2)
+        return pares[:, 0].astype(np.int64), np.ascontiguousarray(pares[:, 1])
+
+    def get_rango(self, linea_num: int, filtros: Mapping[str, Any]) -> Tuple[int, Optional[float], Optional[float]]:
+        self._check_linea(linea_num)
+        rango, _ = _histograma_statements(self.tipo, linea_num, tuple(filtros))
+        registros, minimo, maximo = self._execute(linea_num, rango, filtros).one()
+        return registros, minimo, maximo
+
+    def get_buckets(
+            self, linea_num: int, filtros: Mapping[str, Any], minimo: float, ancho: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        self._check_linea(linea_num)
+        _, buckets = _histograma_statements(self.tipo, linea_num, tuple(filtros))
+        params = {**filtros, "_minimo": minimo, "_ancho": ancho}
+        try:
+            result = self._execute(linea_num, buckets, params)
+            plano = np.fromiter(chain.from_iterable(result), dtype=np.int64)
+        except SQLAlchemyError as e:
+            raise RepositoryError(f"Error al consultar los pesos de la linea {self.tipo} {linea_num}.") from e
+        pares = plano.reshape(-1, 2)
+        return pares[:, 0], pares[:, 1]
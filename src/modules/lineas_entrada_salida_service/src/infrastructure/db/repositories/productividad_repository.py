@@ -0,0 +1,146 @@
+from datetime import date
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from sqlalchemy import bindparam, case, func, select, union_all
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from src.modules.administracion_service.src.infrastructure.db.models import AreaOperariosORM
+from src.modules.auth_service.src.infrastructure.db.models import LineaORM, TurnoORM
+from src.modules.lineas_entrada_salida_service.src.application.ports.productividad import IProductividadRepository
+from src.modules.lineas_entrada_salida_service.src.domain.entities import ProductividadOperario, OperarioAsignacion
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.models import LINEAS_SALIDA_ORM
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.sql_functions import SegundosEntre
+from src.modules.management_service.src.infrastructure.db.models import OperariosORM
+from src.shared.exceptions import RepositoryError
+
+ORDENES = ("peso_kg", "bandejas", "kg_hora")
+
+
+@lru_cache(maxsize=None)
+def _ranking_statement(lineas: tuple[int, ...], orden: str) -> Select:
+    """
+    Ranking de operarios en una sola consulta:
+
+    1. UNION ALL de las tablas de salida elegidas, acotadas por fecha_p.
+    2. Agregado por (operario, fecha_p): bandejas, kg y tiempo activo del día.
+    3. Agregado por operario y kg/hora sobre el tiempo activo total.
+    4. RANK() para el puesto, ROW_NUMBER() para paginar y COUNT(*) OVER ()
+       para el total, así la página y el total salen del mismo recorrido.
+    """
+    pesajes = union_all(*(
+        select(table.c.codigo_obrero, table.c.fecha_p, table.c.fecha, table.c.peso_kg).where(
+            table.c.fecha_p.between(bindparam("fecha_desde"), bindparam("fecha_hasta")),
+            table.c.codigo_obrero.is_not(None),
+        )
+        for table in (LINEAS_SALIDA_ORM[linea_num].__table__ for linea_num in lineas)
+    )).subquery("pesajes")
+
+    por_dia = (
+        select(
+            pesajes.c.codigo_obrero,
+            func.count().label("bandejas"),
+            func.coalesce(func.sum(pesajes.c.peso_kg), 0).label("peso_kg"),
+            func.coalesce(SegundosEntre(func.min(pesajes.c.fecha), func.max(pesajes.c.fecha)), 0).label("segundos"),
+        )
+        .group_by(pesajes.c.codigo_obrero, pesajes.c.fecha_p)
+        .subquery("por_dia")
+    )
+
+    por_operario = (
+        select(
+            por_dia.c.codigo_obrero,
+            func.count().label("dias"),
+            func.sum(por_dia.c.bandejas).label("bandejas"),
+            func.sum(por_dia.c.peso_kg).label("peso_kg"),
+            func.sum(por_dia.c.segundos).label("segundos"),
+        )
+        .group_by(por_dia.c.codigo_obrero)
+        .subquery("por_operario")
+    )
+
+    kg_hora = case(
+        (por_operario.c.segundos > 0, por_operario.c.peso_kg * 3600.0 / por_operario.c.segundos),
+        else_=None,
+    )
+    criterio = {"peso_kg": por_operario.c.peso_kg, "bandejas": por_operario.c.bandejas, "kg_hora": kg_hora}[orden]
+    ranking = select(
+        func.rank().over(order_by=criterio.desc()).label("ranking"),
+        por_operario.c.codigo_obrero,
+        por_operario.c.dias,
+        por_operario.c.bandejas,
+        por_operario.c.peso_kg,
+        por_operario.c.segundos,
+        kg_hora.label("kg_hora"),
+        func.row_number().over(order_by=(criterio.desc(), por_operario.c.codigo_obrero)).label("fila"),
+        func.count().over().label("total"),
+    ).subquery("ranking")
+
+    return (
+        select(*(c for c in ranking.c if c.name != "fila"))
+        .where(ranking.c.fila.between(bindparam("_desde"), bindparam("_hasta")))
+        .order_by(ranking.c.fila)
+    )
+
+
+_OPERARIOS = OperariosORM.__table__
+_TURNOS = TurnoORM.__table__
+_AREAS = AreaOperariosORM.__table__
+_LINEAS = LineaORM.__table__
+_ASIGNACIONES = (
+    select(
+        _OPERARIOS.c.OPER_CODIGO,
+        _OPERARIOS.c.OPER_TURNO, _TURNOS.c.TURN_NOMBRE,
+        _OPERARIOS.c.OPER_AREA, _AREAS.c.AREA_NOMBRE,
+        _OPERARIOS.c.OPER_LINEA, _LINEAS.c.LINE_NOMBRE,
+    )
+    .select_from(
+        _OPERARIOS
+        .outerjoin(_TURNOS, _TURNOS.c.TURN_ID == _OPERARIOS.c.OPER_TURNO)
+        .outerjoin(_AREAS, _AREAS.c.AREA_ID == _OPERARIOS.c.OPER_AREA)
+        .outerjoin(_LINEAS, _LINEAS.c.LINE_ID == _OPERARIOS.c.OPER_LINEA)
+    )
+    .where(_OPERARIOS.c.OPER_CODIGO.in_(bindparam("codigos", expanding=True)))
+    .order_by(_OPERARIOS.c.OPER_ID)
+)
+
+
+class ProductividadRepository(IProductividadRepository):
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_ranking(
+            self, fecha_desde: date, fecha_hasta: date, lineas: list[int], orden: str, page: int, page_size: int
+    ) -> Tuple[List[ProductividadOperario], int]:
+        for linea_num in lineas:
+            if linea_num not in LINEAS_SALIDA_ORM:
+                raise RepositoryError(f"Línea salida {linea_num} no válida o no implementada.")
+        if orden not in ORDENES:
+            raise RepositoryError(f"Orden de ranking '{orden}' no soportado.")
+
+        stmt = _ranking_statement(tuple(sorted(lineas)), orden)
+        params = {"fecha_desde": fecha_desde, "fecha_hasta": fecha_hasta}
+        desde = (page - 1) * page_size + 1
+        try:
+            rows = self.db.execute(stmt, {**params, "_desde": desde, "_hasta": desde + page_size - 1}).all()
+            if not rows and page > 1:
+                # Página fuera de rango: se pide solo la primera fila para conocer el total
+                primera = self.db.execute(stmt, {**params, "_desde": 1, "_hasta": 1}).first()
+                return [], primera.total if primera is not None else 0
+        except SQLAlchemyError as e:
+            raise RepositoryError("Error al calcular la productividad de los operarios.") from e
+
+        total = rows[0].total if rows else 0
+        return [ProductividadOperario(*row[:-1]) for row in rows], total
+
+    def get_asignaciones(self, codigos: list[str]) -> Dict[str, OperarioAsignacion]:
+        if not codigos:
+            return {}
+        try:
+            rows = self.db.execute(_ASIGNACIONES, {"codigos": list(codigos)})
+            # Si un código se repite en fm_gestion_operarios gana el registro más reciente
+            return {row[0]: OperarioAsignacion(*row) for row in rows}
+        except SQLAlchemyError as e:
+            raise RepositoryError("Error al consultar los operarios.") from e
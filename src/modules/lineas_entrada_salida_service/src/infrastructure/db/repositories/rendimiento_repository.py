@@ -0,0 +1,144 @@
+from datetime import date
+from functools import lru_cache
+from typing import List, Mapping, Optional
+
+from sqlalchemy import and_, bindparam, func, literal_column, select, union_all
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from src.modules.administracion_service.src.infrastructure.db.models import DetalleProduccionORM
+from src.modules.lineas_entrada_salida_service.src.application.ports.rendimiento import IRendimientoRepository
+from src.modules.lineas_entrada_salida_service.src.domain.entities import TotalesLote, SubproductosLote, LinajeParrilla
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.models import (
+    LINEAS_ENTRADA_ORM, LINEAS_SALIDA_ORM,
+)
+from src.shared.exceptions import RepositoryError
+
+_MODELS: Mapping[str, Mapping[int, type]] = {"entrada": LINEAS_ENTRADA_ORM, "salida": LINEAS_SALIDA_ORM}
+
+
+@lru_cache(maxsize=None)
+def _totales_statement(tipo: str, lineas: tuple[int, ...]) -> Select:
+    """
+    SUM/COUNT por (fecha_p, p_lote) de cada tabla de línea, unidas con UNION ALL
+    en una sola consulta. Se arma una vez por combinación de líneas.
+    """
+    selects = []
+    for linea_num in lineas:
+        table = _MODELS[tipo][linea_num].__table__
+        selects.append(
+            select(
+                table.c.fecha_p,
+                table.c.p_lote,
+                literal_column(str(int(linea_num))).label("linea"),
+                func.count(table.c.id).label("registros"),
+                func.coalesce(func.sum(table.c.peso_kg), 0).label("peso_kg"),
+            )
+            .where(table.c.fecha_p.between(bindparam("fecha_desde"), bindparam("fecha_hasta")))
+            .group_by(table.c.fecha_p, table.c.p_lote)
+        )
+    return union_all(*selects)
+
+
+def _parrillas_subquery(tipo: str, linea_num: int, con_fecha: bool):
+    table = _MODELS[tipo][linea_num].__table__
+    stmt = (
+        select(
+            table.c.fecha_p,
+            table.c.p_lote,
+            table.c.codigo_parrilla,
+            func.count(table.c.id).label("registros"),
+            func.coalesce(func.sum(table.c.peso_kg), 0).label("peso_kg"),
+        )
+        .where(table.c.p_lote == bindparam("p_lote"))
+        .group_by(table.c.fecha_p, table.c.p_lote, table.c.codigo_parrilla)
+    )
+    if con_fecha:
+        stmt = stmt.where(table.c.fecha_p == bindparam("fecha_p"))
+    return stmt.subquery(tipo)
+
+
+@lru_cache(maxsize=None)
+def _linaje_statement(linea_num: int, con_fecha: bool) -> Select:
+    """
+    Linaje por parrilla de un lote: entrada y salida se agregan por separado por
+    (fecha_p, p_lote, codigo_parrilla) y se cruzan con FULL OUTER JOIN, así las
+    parrillas que solo aparecen de un lado también se devuelven. Ambos lados
+    filtran primero por p_lote (y fecha_p), que es lo que recorre el motor.
+    """
+    entrada = _parrillas_subquery("entrada", linea_num, con_fecha)
+    salida = _parrillas_subquery("salida", linea_num, con_fecha)
+    condicion = and_(
+        entrada.c.fecha_p == salida.c.fecha_p,
+        entrada.c.p_lote == salida.c.p_lote,
+        entrada.c.codigo_parrilla == salida.c.codigo_parrilla,
+    )
+    return select(
+        func.coalesce(entrada.c.fecha_p, salida.c.fecha_p),
+        func.coalesce(entrada.c.p_lote, salida.c.p_lote),
+        func.coalesce(entrada.c.codigo_parrilla, salida.c.codigo_parrilla),
+        func.coalesce(entrada.c.registros, 0),
+        func.coalesce(entrada.c.peso_kg, 0),
+        func.coalesce(salida.c.registros, 0),
+        func.coalesce(salida.c.peso_kg, 0),
+    ).select_from(entrada.join(salida, condicion, full=True))
+
+
+_DETALLE = DetalleProduccionORM.__table__
+_SUBPRODUCTOS = (
+    select(
+        _DETALLE.c.DPRO_FECPROD,
+        _DETALLE.c.DPRO_LOTE,
+        _DETALLE.c.DPRO_LINEA,
+        func.coalesce(func.sum(_DETALLE.c.DPRO_PMIGA), 0),
+        func.coalesce(func.sum(_DETALLE.c.DPRO_PPANZA), 0),
+        func.coalesce(func.sum(_DETALLE.c.DPRO_PDESPERDICIO), 0),
+    )
+    .where(
+        _DETALLE.c.DPRO_FECPROD.between(bindparam("fecha_desde"), bindparam("fecha_hasta")),
+        _DETALLE.c.DPRO_LINEA.in_(bindparam("lineas", expanding=True)),
+    )
+    .group_by(_DETALLE.c.DPRO_FECPROD, _DETALLE.c.DPRO_LOTE, _DETALLE.c.DPRO_LINEA)
+)
+
+
+class RendimientoRepository(IRendimientoRepository):
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _get_totales(self, tipo: str, fecha_desde: date, fecha_hasta: date, lineas: list[int]) -> List[TotalesLote]:
+        for linea_num in lineas:
+            if linea_num not in _MODELS[tipo]:
+                raise RepositoryError(f"Línea {tipo} {linea_num} no válida o no implementada.")
+
+        stmt = _totales_statement(tipo, tuple(sorted(lineas)))
+        try:
+            rows = self.db.execute(stmt, {"fecha_desde": fecha_desde, "fecha_hasta": fecha_hasta})
+            return [TotalesLote(*row) for row in rows]
+        except SQLAlchemyError as e:
+            raise RepositoryError(f"Error al totalizar las lineas {tipo}.") from e
+
+    def get_totales_entrada(self, fecha_desde: date, fecha_hasta: date, lineas: list[int]) -> List[TotalesLote]:
+        return self._get_totales("entrada", fecha_desde, fecha_hasta, lineas)
+
+    def get_totales_salida(self, fecha_desde: date, fecha_hasta: date, lineas: list[int]) -> List[TotalesLote]:
+        return self._get_totales("salida", fecha_desde, fecha_hasta, lineas)
+
+    def get_subproductos(self, fecha_desde: date, fecha_hasta: date, lineas: list[int]) -> List[SubproductosLote]:
+        params = {"fecha_desde": fecha_desde, "fecha_hasta": fecha_hasta, "lineas": list(lineas)}
+        try:
+            return [SubproductosLote(*row) for row in self.db.execute(_SUBPRODUCTOS, params)]
+        except SQLAlchemyError as e:
+            raise RepositoryError("Error al totalizar el detalle de producción.") from e
+
+    def get_linaje_parrillas(self, linea_num: int, p_lote: str, fecha_p: Optional[date]) -> List[LinajeParrilla]:
+        if linea_num not in LINEAS_ENTRADA_ORM or linea_num not in LINEAS_SALIDA_ORM:
+            raise RepositoryError(f"Línea {linea_num} no válida o no implementada.")
+
+        stmt = _linaje_statement(linea_num, fecha_p is not None)
+        params = {"p_lote": p_lote, "fecha_p": fecha_p} if fecha_p is not None else {"p_lote": p_lote}
+        try:
+            return [LinajeParrilla(*row) for row in self.db.execute(stmt, params)]
+        except SQLAlchemyError as e:
+            raise RepositoryError("Error al consultar el linaje por parrilla.") from e
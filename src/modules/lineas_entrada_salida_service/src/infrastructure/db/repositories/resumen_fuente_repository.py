@@ -0,0 +1,130 @@
+from datetime import date
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy import bindparam, func, literal_column, select, union_all
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from src.modules.lineas_entrada_salida_service.src.application.ports.resumen_lineas import IResumenFuenteRepository
+from src.modules.lineas_entrada_salida_service.src.domain.entities import TotalesLote
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.models import (
+    LINEAS_ENTRADA_ORM, LINEAS_SALIDA_ORM,
+)
+from src.shared.exceptions import RepositoryError
+
+_MODELS: Mapping[str, Mapping[int, type]] = {"entrada": LINEAS_ENTRADA_ORM, "salida": LINEAS_SALIDA_ORM}
+
+
+def _agrupado(tipo: str, linea_num: int, *where) -> Select:
+    """COUNT/SUM por (fecha_p, p_lote) de una tabla de línea; las filas sin fecha_p no entran al resumen."""
+    table = _MODELS[tipo][linea_num].__table__
+    return (
+        select(
+            table.c.fecha_p,
+            table.c.p_lote,
+            literal_column(str(int(linea_num))).label("linea"),
+            func.count(table.c.id).label("registros"),
+            func.coalesce(func.sum(table.c.peso_kg), 0).label("peso_kg"),
+        )
+        .where(table.c.fecha_p.is_not(None), *where)
+        .group_by(table.c.fecha_p, table.c.p_lote)
+    )
+
+
+@lru_cache(maxsize=None)
+def _fuente_statements(tipo: str, linea_num: int) -> Tuple[Select, Select, Select]:
+    """(max id, agregado de un tramo de ids, agregado desde una fecha) de una tabla de línea."""
+    table = _MODELS[tipo][linea_num].__table__
+    max_id = select(func.coalesce(func.max(table.c.id), 0))
+    # El tramo por id recorre la clave primaria: cada pasada solo lee lo nuevo
+    por_ids = _agrupado(
+        tipo, linea_num, table.c.id > bindparam("desde_id"), table.c.id <= bindparam("hasta_id"),
+    )
+    desde_fecha = _agrupado(
+        tipo, linea_num, table.c.fecha_p >= bindparam("fecha_desde"), table.c.id <= bindparam("hasta_id"),
+    )
+    return max_id, por_ids, desde_fecha
+
+
+@lru_cache(maxsize=None)
+def _contar_nuevos_statement(tipo: str, linea_num: int, con_lotes: bool) -> Select:
+    table = _MODELS[tipo][linea_num].__table__
+    stmt = select(func.count(table.c.id)).where(
+        table.c.id > bindparam("desde_id"),
+        table.c.fecha_p.between(bindparam("fecha_desde"), bindparam("fecha_hasta")),
+    )
+    if con_lotes:
+        stmt = stmt.where(table.c.p_lote.in_(bindparam("lotes", expanding=True)))
+    return stmt
+
+
+@lru_cache(maxsize=None)
+def _totales_nuevos_statement(tipo: str, lineas: tuple[int, ...]) -> Select:
+    """Agregado de lo posterior al cursor de cada línea, con UNION ALL; un bindparam desde_<n> por línea."""
+    selects = []
+    for linea_num in lineas:
+        table = _MODELS[tipo][linea_num].__table__
+        selects.append(_agrupado(
+            tipo, linea_num,
+            table.c.id > bindparam(f"desde_{linea_num}"),
+            table.c.fecha_p.between(bindparam("fecha_desde"), bindparam("fecha_hasta")),
+        ))
+    return union_all(*selects)
+
+
+class ResumenFuenteRepository(IResumenFuenteRepository):
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _validar(self, tipo: str, linea_num: int) -> None:
+        if linea_num not in _MODELS[tipo]:
+            raise RepositoryError(f"Línea {tipo} {linea_num} no válida o no implementada.")
+
+    def _totales(self, tipo: str, stmt: Select, params: dict) -> List[TotalesLote]:
+        try:
+            return [TotalesLote(*row) for row in self.db.execute(stmt, params)]
+        except SQLAlchemyError as e:
+            raise RepositoryError(f"Error al totalizar las lineas {tipo}.") from e
+
+    def get_max_id(self, tipo: str, linea_num: int) -> int:
+        self._validar(tipo, linea_num)
+        max_id, _, _ = _fuente_statements(tipo, linea_num)
+        try:
+            return self.db.execute(max_id).scalar()
+        except SQLAlchemyError as e:
+            raise RepositoryError(f"Error al consultar la linea {tipo} {linea_num}.") from e
+
+    def get_totales_por_ids(self, tipo: str, linea_num: int, desde_id: int, hasta_id: int) -> List[TotalesLote]:
+        self._validar(tipo, linea_num)
+        _, stmt, _ = _fuente_statements(tipo, linea_num)
+        return self._totales(tipo, stmt, {"desde_id": desde_id, "hasta_id": hasta_id})
+
+    def get_totales_desde_fecha(self, tipo: str, linea_num: int, fecha_desde: date,
+                                hasta_id: int) -> List[TotalesLote]:
+        self._validar(tipo, linea_num)
+        _, _, stmt = _fuente_statements(tipo, linea_num)
+        return self._totales(tipo, stmt, {"fecha_desde": fecha_desde, "hasta_id": hasta_id})
+
+    def contar_nuevos(self, tipo: str, linea_num: int, desde_id: int, fecha_desde: date, fecha_hasta: date,
+                      lotes: Optional[List[str]]) -> int:
+        self._validar(tipo, linea_num)
+        stmt = _contar_nuevos_statement(tipo, linea_num, lotes is not None)
+        params = {"desde_id": desde_id, "fecha_desde": fecha_desde, "fecha_hasta": fecha_hasta}
+        if lotes is not None:
+            params["lotes"] = list(lotes)
+        try:
+            return self.db.execute(stmt, params).scalar() or 0
+        except SQLAlchemyError as e:
+            raise RepositoryError(f"Error al contar las lineas {tipo} {linea_num}.") from e
+
+    def get_totales_nuevos(self, tipo: str, desde_ids: Dict[int, int], fecha_desde: date,
+                           fecha_hasta: date) -> List[TotalesLote]:
+        for linea_num in desde_ids:
+            self._validar(tipo, linea_num)
+
+        stmt = _totales_nuevos_statement(tipo, tuple(sorted(desde_ids)))
+        params = {f"desde_{linea_num}": desde_id for linea_num, desde_id in desde_ids.items()}
+        params.update(fecha_desde=fecha_desde, fecha_hasta=fecha_hasta)
+        return self._totales(tipo, stmt, params)
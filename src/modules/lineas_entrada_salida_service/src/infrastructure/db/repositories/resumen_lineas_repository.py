@@ -0,0 +1,179 @@
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import bindparam, delete, func, insert, select, text, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.modules.lineas_entrada_salida_service.src.application.ports.resumen_lineas import IResumenLineasRepository
+from src.modules.lineas_entrada_salida_service.src.domain.entities import TotalesLote
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.models import (
+    ResumenLineaCursorOrm, ResumenLineaDiarioOrm,
+)
+from src.shared.common.time_utils import get_ecuador_time
+from src.shared.exceptions import RepositoryError
+
+_RESUMEN = ResumenLineaDiarioOrm.__table__
+_CURSOR = ResumenLineaCursorOrm.__table__
+
+# Suma un delta (con signo) a la fila de (linea, tipo, fecha_p, lote) o la crea.
+# HOLDLOCK evita que el worker y una petición de la API inserten la misma clave
+# a la vez. Se ejecuta como executemany, una fila de parámetros por clave.
+_MERGE_RESUMEN = text(
+    """
+    MERGE resumen_linea_diario WITH (HOLDLOCK) AS destino
+    USING (SELECT :_linea AS linea, :_tipo AS tipo, :_fecha_p AS fecha_p, :_lote AS lote) AS origen
+        ON destino.linea = origen.linea AND destino.tipo = origen.tipo
+       AND destino.fecha_p = origen.fecha_p AND destino.lote = origen.lote
+    WHEN MATCHED THEN
+        UPDATE SET registros = destino.registros + :_registros,
+                   peso_kg = ROUND(destino.peso_kg + :_peso_kg, 3),
+                   updated_at = :_ahora
+    WHEN NOT MATCHED THEN
+        INSERT (linea, tipo, fecha_p, lote, registros, peso_kg, updated_at)
+        VALUES (:_linea, :_tipo, :_fecha_p, :_lote, :_registros, ROUND(:_peso_kg, 3), :_ahora);
+    """
+)
+
+# Los bindparam llevan "_" porque los nombres de columna quedan reservados en UPDATE
+_SUMAR = update(_RESUMEN).where(
+    _RESUMEN.c.linea == bindparam("_linea"),
+    _RESUMEN.c.tipo == bindparam("_tipo"),
+    _RESUMEN.c.fecha_p == bindparam("_fecha_p"),
+    _RESUMEN.c.lote == bindparam("_lote"),
+).values(
+    registros=_RESUMEN.c.registros + bindparam("_registros"),
+    peso_kg=func.round(_RESUMEN.c.peso_kg + bindparam("_peso_kg"), 3),
+    updated_at=bindparam("_ahora"),
+)
+
+_GET_CURSOR = select(_CURSOR.c.ultimo_id).where(
+    _CURSOR.c.tipo == bindparam("tipo"), _CURSOR.c.linea == bindparam("linea"),
+)
+_GET_CURSORES = select(_CURSOR.c.linea, _CURSOR.c.ultimo_id).where(
+    _CURSOR.c.tipo == bindparam("tipo"), _CURSOR.c.linea.in_(bindparam("lineas", expanding=True)),
+)
+# Compare-and-swap: solo avanza si nadie lo movió desde que se leyó
+_AVANZAR_CURSOR = update(_CURSOR).where(
+    _CURSOR.c.tipo == bindparam("_tipo"),
+    _CURSOR.c.linea == bindparam("_linea"),
+    _CURSOR.c.ultimo_id == bindparam("_anterior"),
+).values(ultimo_id=bindparam("_nuevo"), updated_at=bindparam("_ahora"))
+
+_RANGO = (
+    _RESUMEN.c.tipo == bindparam("tipo"),
+    _RESUMEN.c.fecha_p.between(bindparam("fecha_desde"), bindparam("fecha_hasta")),
+)
+_CONTAR = select(func.coalesce(func.sum(_RESUMEN.c.registros), 0)).where(
+    *_RANGO, _RESUMEN.c.linea == bindparam("linea"),
+)
+_CONTAR_LOTES = _CONTAR.where(_RESUMEN.c.lote.in_(bindparam("lotes", expanding=True)))
+_TOTALES = select(
+    _RESUMEN.c.fecha_p, _RESUMEN.c.lote, _RESUMEN.c.linea, _RESUMEN.c.registros, _RESUMEN.c.peso_kg,
+).where(
+    *_RANGO,
+    _RESUMEN.c.linea.in_(bindparam("lineas", expanding=True)),
+    # Claves cuyos registros se borraron o cambiaron de lote quedan en cero
+    _RESUMEN.c.registros > 0,
+)
+
+
+def _fila(tipo: str, total: TotalesLote) -> dict:
+    """Fila de resumen_linea_diario; un lote nulo se guarda como ""."""
+    return {
+        "linea": total.linea,
+        "tipo": tipo,
+        "fecha_p": total.fecha_p,
+        "lote": total.p_lote or "",
+        "registros": total.registros,
+        "peso_kg": round(float(total.peso_kg), 3),
+    }
+
+
+def _params(fila: dict, ahora) -> dict:
+    return {f"_{name}": value for name, value in fila.items()} | {"_ahora": ahora}
+
+
+class ResumenLineasRepository(IResumenLineasRepository):
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_cursor(self, tipo: str, linea_num: int) -> Optional[int]:
+        try:
+            return self.db.execute(_GET_CURSOR, {"tipo": tipo, "linea": linea_num}).scalar()
+        except SQLAlchemyError as e:
+            raise RepositoryError("Error al consultar el cursor del resumen de líneas.") from e
+
+    def get_cursores(self, tipo: str, lineas: list[int]) -> Dict[int, int]:
+        try:
+            return dict(self.db.execute(_GET_CURSORES, {"tipo": tipo, "lineas": list(lineas)}).all())
+        except SQLAlchemyError as e:
+            raise RepositoryError("Error al consultar el cursor del resumen de líneas.") from e
+
+    def avanzar_cursor(self, tipo: str, linea_num: int, anterior: Optional[int], nuevo: int) -> bool:
+        ahora = get_ecuador_time()
+        try:
+            if anterior is None:
+                self.db.execute(insert(_CURSOR).values(linea=linea_num, tipo=tipo, ultimo_id=nuevo, updated_at=ahora))
+                return True
+            result = self.db.execute(
+                _AVANZAR_CURSOR,
+                {"_tipo": tipo, "_linea": linea_num, "_anterior": anterior, "_nuevo": nuevo, "_ahora": ahora},
+            )
+            return result.rowcount == 1
+        except SQLAlchemyError as e:
+            raise RepositoryError("Error al avanzar el cursor del resumen de líneas.") from e
+
+    def sumar(self, tipo: str, totales: Sequence[TotalesLote]) -> None:
+        if not totales:
+            return
+        ahora = get_ecuador_time()
+        filas = [_fila(tipo, total) for total in totales]
+        try:
+            if self.db.get_bind().dialect.name == "mssql":
+                self.db.execute(_MERGE_RESUMEN, [_params(fila, ahora) for fila in filas])
+                return
+            self._sumar_portable(filas, ahora)
+        except SQLAlchemyError as e:
+            raise RepositoryError("Error al actualizar el resumen de líneas.") from e
+
+    def _sumar_portable(self, filas: List[dict], ahora) -> None:
+        """Equivalente al MERGE para motores sin él (SQLite de los benchmarks)."""
+        for fila in filas:
+            if self.db.execute(_SUMAR, _params(fila, ahora)).rowcount == 0:
+                self.db.execute(insert(_RESUMEN).values(**fila, updated_at=ahora))
+
+    def reemplazar_desde(self, tipo: str, linea_num: int, fecha_desde: date, totales: Sequence[TotalesLote]) -> None:
+        ahora = get_ecuador_time()
+        try:
+            self.db.execute(delete(_RESUMEN).where(
+                _RESUMEN.c.linea == linea_num,
+                _RESUMEN.c.tipo == tipo,
+                _RESUMEN.c.fecha_p >= fecha_desde,
+            ))
+            if totales:
+                self.db.execute(insert(_RESUMEN), [_fila(tipo, total) | {"updated_at": ahora} for total in totales])
+        except SQLAlchemyError as e:
+            raise RepositoryError("Error al recalcular el resumen de líneas.") from e
+
+    def contar(self, tipo: str, linea_num: int, fecha_desde: date, fecha_hasta: date,
+               lotes: Optional[List[str]]) -> int:
+        params = {"tipo": tipo, "linea": linea_num, "fecha_desde": fecha_desde, "fecha_hasta": fecha_hasta}
+        stmt = _CONTAR
+        if lotes is not None:
+            stmt = _CONTAR_LOTES
+            params["lotes"] = list(lotes)
+        try:
+            return int(self.db.execute(stmt, params).scalar() or 0)
+        except SQLAlchemyError as e:
+            raise RepositoryError("Error al contar desde el resumen de líneas.") from e
+
+    def get_totales(self, tipo: str, lineas: list[int], fecha_desde: date, fecha_hasta: date) -> List[TotalesLote]:
+        params = {"tipo": tipo, "lineas": list(lineas), "fecha_desde": fecha_desde, "fecha_hasta": fecha_hasta}
+        try:
+            return [
+                TotalesLote(fecha_p, lote or None, linea, registros, peso_kg)
+                for fecha_p, lote, linea, registros, peso_kg in self.db.execute(_TOTALES, params)
+            ]
+        except SQLAlchemyError as e:
+            raise RepositoryError("Error al consultar el resumen de líneas.") from e
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Mapping, Tuple
+
+import numpy as np
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from src.modules.lineas_entrada_salida_service.src.application.ports.throughput import IThroughputRepository
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.models import (
+    LINEAS_ENTRADA_ORM, LINEAS_SALIDA_ORM,
+)
+from src.shared.exceptions import RepositoryError
+
+_MODELS: Mapping[str, Mapping[int, type]] = {"entrada": LINEAS_ENTRADA_ORM, "salida": LINEAS_SALIDA_ORM}
+
+
+@lru_cache(maxsize=None)
+def _throughput_statements(tipo: str, linea_num: int) -> Tuple[Select, Select, Select]:
+    """(max id, ventana para resincronizar, cola por id) de una tabla de línea."""
+    table = _MODELS[tipo][linea_num].__table__
+    columnas = (table.c.id, table.c.fecha, table.c.peso_kg)
+    max_id = select(func.coalesce(func.max(table.c.id), 0))
+    # fecha_p acota el recorrido al índice por fecha; fecha filtra la ventana exacta
+    desde = (
+        select(*columnas)
+        .where(
+            table.c.fecha_p >= bindparam("dia_desde"),
+            table.c.fecha >= bindparam("desde"),
+            table.c.id <= bindparam("hasta_id"),
+            table.c.peso_kg.is_not(None),
+        )
+        .order_by(table.c.id)
+    )
+    nuevos = (
+        select(*columnas)
+        .where(table.c.id > bindparam("ultimo_id"))
+        .order_by(table.c.id)
+        .limit(bindparam("limite"))
+    )
+    return max_id, desde, nuevos
+
+
+def _to_arrays(rows) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if not rows:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float64)
+    ids, fechas, pesos = zip(*rows)
+    fechas = np.array(fechas, dtype="datetime64[m]")
+    minutos = fechas.astype(np.int64)
+    pesos = np.array(pesos, dtype=np.float64)
+    # Filas sin peso o sin fecha (solo en la cola) avanzan el id pero quedan
+    # fuera de cualquier ventana, igual que en la resincronización
+    minutos[np.isnan(pesos) | np.isnat(fechas)] = -1
+    return np.array(ids, dtype=np.int64), minutos, np.nan_to_num(pesos)
+
+
+class ThroughputRepository(IThroughputRepository):
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _statements(self, tipo: str, linea_num: int) -> Tuple[Select, Select, Select]:
+        if linea_num not in _MODELS[tipo]:
+            raise RepositoryError(f"Línea {tipo} {linea_num} no válida o no implementada.")
+        return _throughput_statements(tipo, linea_num)
+
+    def get_max_id(self, tipo: str, linea_num: int) -> int:
+        max_id, _, _ = self._statements(tipo, linea_num)
+        try:
+            return self.db.execute(max_id).scalar()
+        except SQLAlchemyError as e:
+            raise RepositoryError(f"Error al consultar la linea {tipo} {linea_num}.") from e
+
+    def get_desde(
+            self, tipo: str, linea_num: int, desde: datetime, hasta_id: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        _, stmt, _ = self._statements(tipo, linea_num)
+        # Un día de margen para turnos nocturnos con fecha_p del día anterior
+        params = {"dia_desde": desde.date() - timedelta(days=1), "desde": desde, "hasta_id": hasta_id}
+        try:
+            return _to_arrays(self.db.execute(stmt, params).all())
+        except SQLAlchemyError as e:
+            raise RepositoryError(f"Error al consultar la linea {tipo} {linea_num}.") from e
+
+    def get_nuevos(
+            self, tipo: str, linea_num: int, ultimo_id: int, limite: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        _, _, stmt = self._statements(tipo, linea_num)
+        try:
+            return _to_arrays(self.db.execute(stmt, {"ultimo_id": ultimo_id, "limite": limite}).all())
+        except SQLAlchemyError as e:
+            raise RepositoryError(f"Error al consultar la linea {tipo} {linea_num}.") from e
@@ -0,0 +1,91 @@
+"""
+Expresiones SQL que cada motor escribe distinto, compiladas por dialecto.
+
+SQL Server es el motor de producción; SQLite es el de los benchmarks.
+"""
+from sqlalchemy import Float, Integer
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class SegundosEntre(FunctionElement):
+    """Segundos entre dos DATETIME: segundos_entre(inicio, fin)."""
+    type = Float()
+    name = "segundos_entre"
+    inherit_cache = True
+
+
+@compiles(SegundosEntre)
+def _segundos_entre(element, compiler, **kw):
+    inicio, fin = (compiler.process(c, **kw) for c in element.clauses)
+    return f"EXTRACT(EPOCH FROM ({fin} - {inicio}))"
+
+
+@compiles(SegundosEntre, "mssql")
+def _segundos_entre_mssql(element, compiler, **kw):
+    inicio, fin = (compiler.process(c, **kw) for c in element.clauses)
+    return f"DATEDIFF(second, {inicio}, {fin})"
+
+
+@compiles(SegundosEntre, "sqlite")
+def _segundos_entre_sqlite(element, compiler, **kw):
+    inicio, fin = (compiler.process(c, **kw) for c in element.clauses)
+    return f"((julianday({fin}) - julianday({inicio})) * 86400.0)"
+
+
+class EnteroSeguro(FunctionElement):
+    """
+    Código de texto (codigo_secuencia, codigo_parrilla) como entero, o NULL si
+    no es numérico, sin que un valor inválido haga fallar toda la consulta.
+    """
+    type = Integer()
+    name = "entero_seguro"
+    inherit_cache = True
+
+
+@compiles(EnteroSeguro)
+def _entero_seguro(element, compiler, **kw):
+    (valor,) = (compiler.process(c, **kw) for c in element.clauses)
+    return f"CAST({valor} AS INTEGER)"
+
+
+@compiles(EnteroSeguro, "mssql")
+def _entero_seguro_mssql(element, compiler, **kw):
+    (valor,) = (compiler.process(c, **kw) for c in element.clauses)
+    return f"TRY_CAST({valor} AS INT)"
+
+
+@compiles(EnteroSeguro, "sqlite")
+def _entero_seguro_sqlite(element, compiler, **kw):
+    (valor,) = (compiler.process(c, **kw) for c in element.clauses)
+    return (
+        f"(CASE WHEN {valor} GLOB '[0-9]*' AND NOT {valor} GLOB '*[^0-9]*' "
+        f"THEN CAST({valor} AS INTEGER) END)"
+    )
+
+
+class ValorAnterior(FunctionElement):
+    """
+    Valor previo de una columna dentro del RETURNING de un UPDATE:
+    valor_anterior(columna, reconstruccion). SQL Server lo lee de
+    deleted.<columna> en el OUTPUT; los motores cuyo RETURNING solo ve el valor
+    nuevo evalúan `reconstruccion`, una expresión que lo deshace.
+    """
+    name = "valor_anterior"
+    inherit_cache = True
+
+    def __init__(self, columna, reconstruccion):
+        super().__init__(columna, reconstruccion)
+        self.type = columna.type
+
+
+@compiles(ValorAnterior)
+def _valor_anterior(element, compiler, **kw):
+    _, reconstruccion = element.clauses
+    return compiler.process(reconstruccion, **kw)
+
+
+@compiles(ValorAnterior, "mssql")
+def _valor_anterior_mssql(element, compiler, **kw):
+    columna, _ = element.clauses
+    return f"deleted.{compiler.preparer.quote(columna.name)}"
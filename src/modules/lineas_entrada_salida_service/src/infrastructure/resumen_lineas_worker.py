@@ -0,0 +1,144 @@
+"""
+Hilo de fondo que mantiene el resumen diario por línea (resumen_linea_diario).
+
+Cada `RESUMEN_LINEAS_INTERVAL_SECONDS` vuelca, por cada tabla reg_linea_*, el
+tramo de ids posterior a su cursor (hasta `RESUMEN_LINEAS_BATCH_SIZE` ids por
+pasada; si alguna tabla quedó atrasada la siguiente pasada no espera). Cada
+`RESUMEN_LINEAS_RESYNC_MINUTES` recalcula los últimos `RESUMEN_LINEAS_RESYNC_DIAS`
+días desde las tablas: recoge lo que los equipos de planta editan directo en
+la base y los ids que se confirmaron después de uno mayor ya volcado.
+
+El resumen vive en la base de auth y lo comparten todos los procesos: cada
+tramo avanza el cursor con compare-and-swap, así dos workers de uvicorn no
+vuelcan el mismo tramo dos veces.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import Optional
+
+from fastapi import Depends, FastAPI
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.modules.lineas_entrada_salida_service.src.application.use_cases.resumen_lineas_use_case import \
+    ResumenLineasUseCase
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.repositories.resumen_fuente_repository import \
+    ResumenFuenteRepository
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.repositories.resumen_lineas_repository import \
+    ResumenLineasRepository
+from src.shared.base import get_auth_db, get_db, get_report_db, unit_of_work
+from src.shared.common.time_utils import get_ecuador_time
+from src.shared.config import settings
+from src.shared.database import SessionLocalAuth, SessionLocalMain
+
+logger = logging.getLogger(__name__)
+
+TIPOS = ("entrada", "salida")
+
+
+def _resumen_lineas_use_case(db_externa: Session, db_auth: Session) -> Optional[ResumenLineasUseCase]:
+    if not settings.RESUMEN_LINEAS_ENABLED:
+        return None
+    return ResumenLineasUseCase(
+        resumen_repository=ResumenLineasRepository(db_auth),
+        fuente_repository=ResumenFuenteRepository(db_externa),
+    )
+
+
+def get_resumen_lineas_use_case(
+        db_externa: Session = Depends(get_db),
+        db_auth: Session = Depends(get_auth_db),
+) -> Optional[ResumenLineasUseCase]:
+    """Dependencia para los casos de uso de líneas; None si el resumen está desactivado."""
+    return _resumen_lineas_use_case(db_externa, db_auth)
+
+
+def get_resumen_lineas_report_use_case(
+        db_report: Session = Depends(get_report_db),
+        db_auth: Session = Depends(get_auth_db),
+) -> Optional[ResumenLineasUseCase]:
+    """Igual que get_resumen_lineas_use_case, leyendo las tablas de línea por el engine de reportes."""
+    return _resumen_lineas_use_case(db_report, db_auth)
+
+
+class ResumenLineasWorker:
+    def __init__(
+            self,
+            session_main: sessionmaker,
+            session_auth: sessionmaker,
+            lineas: list[int],
+            interval_seconds: float,
+            batch_size: int,
+            resync_minutes: float,
+            resync_dias: int,
+    ):
+        self.session_main = session_main
+        self.session_auth = session_auth
+        self.lineas = lineas
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.resync_seconds = resync_minutes * 60
+        self.resync_dias = resync_dias
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="resumen-lineas", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_seconds + 5)
+            self._thread = None
+
+    def pasada(self, resincronizar: bool) -> bool:
+        """Una pasada sobre todas las tablas; devuelve True si todas quedaron al día."""
+        al_dia = True
+        fecha_desde = get_ecuador_time().date() - timedelta(days=self.resync_dias - 1)
+        for tipo in TIPOS:
+            for linea_num in self.lineas:
+                # Una transacción por tabla: un fallo o un tramo ya tomado por
+                # otro proceso no revierte lo volcado en las demás
+                try:
+                    with unit_of_work(self.session_auth) as db_auth, unit_of_work(self.session_main) as db_main:
+                        use_case = ResumenLineasUseCase(ResumenLineasRepository(db_auth), ResumenFuenteRepository(db_main))
+                        if resincronizar:
+                            use_case.resincronizar(tipo, linea_num, fecha_desde)
+                        al_dia = use_case.sincronizar(tipo, linea_num, self.batch_size) and al_dia
+                except Exception:
+                    # Un fallo de la base no detiene el hilo: se reintenta en la próxima pasada
+                    logger.exception(f"Error al actualizar el resumen de la linea {tipo} {linea_num}")
+        return al_dia
+
+    def _run(self) -> None:
+        ultimo_resync: Optional[float] = None
+        while not self._stop.is_set():
+            resincronizar = ultimo_resync is None or time.monotonic() - ultimo_resync >= self.resync_seconds
+            al_dia = self.pasada(resincronizar)
+            if resincronizar:
+                ultimo_resync = time.monotonic()
+            if al_dia:
+                self._stop.wait(self.interval_seconds)
+
+
+def configure_resumen_lineas(app: FastAPI) -> None:
+    """Arranca el worker del resumen con la aplicación y lo detiene al apagarla."""
+    if not settings.RESUMEN_LINEAS_ENABLED:
+        return
+
+    worker = ResumenLineasWorker(
+        session_main=SessionLocalMain,
+        session_auth=SessionLocalAuth,
+        lineas=list(settings.lineas_produccion),
+        interval_seconds=settings.RESUMEN_LINEAS_INTERVAL_SECONDS,
+        batch_size=settings.RESUMEN_LINEAS_BATCH_SIZE,
+        resync_minutes=settings.RESUMEN_LINEAS_RESYNC_MINUTES,
+        resync_dias=settings.RESUMEN_LINEAS_RESYNC_DIAS,
+    )
+    app.add_event_handler("startup", worker.start)
+    app.add_event_handler("shutdown", worker.stop)
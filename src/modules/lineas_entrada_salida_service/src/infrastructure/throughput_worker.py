@@ -0,0 +1,99 @@
+"""
+Hilo de fondo que alimenta el ThroughputAggregator.
+
+Cada `THROUGHPUT_INTERVAL_SECONDS` lee solo los pesajes nuevos (id > último
+visto) de las tablas de línea; cada `THROUGHPUT_RESYNC_MINUTES` reconstruye la
+ventana completa, lo que además recoge ediciones y bajas sobre filas ya leídas.
+Cada proceso (worker de uvicorn) mantiene su propio agregador.
+"""
+import logging
+import threading
+import time
+from typing import Optional
+
+from fastapi import FastAPI
+from sqlalchemy.orm import sessionmaker
+
+from src.modules.lineas_entrada_salida_service.src.application.use_cases.throughput_use_case import \
+    ThroughputAggregator
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.repositories.throughput_repository import \
+    ThroughputRepository
+from src.shared.base import unit_of_work
+from src.shared.common.time_utils import get_ecuador_time
+from src.shared.config import settings
+from src.shared.database import SessionLocalMain
+
+logger = logging.getLogger(__name__)
+
+
+class ThroughputWorker:
+    def __init__(
+            self,
+            aggregator: ThroughputAggregator,
+            session_factory: sessionmaker,
+            interval_seconds: float,
+            resync_minutes: float,
+    ):
+        self.aggregator = aggregator
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.resync_seconds = resync_minutes * 60
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="throughput-aggregator", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_seconds + 5)
+            self._thread = None
+
+    def _run(self) -> None:
+        ultimo_resync: Optional[float] = None
+        while not self._stop.is_set():
+            try:
+                with unit_of_work(self.session_factory) as db:
+                    repository = ThroughputRepository(db)
+                    if ultimo_resync is None or time.monotonic() - ultimo_resync >= self.resync_seconds:
+                        self.aggregator.resync(repository)
+                        ultimo_resync = time.monotonic()
+                    else:
+                        self.aggregator.sync(repository)
+            except Exception:
+                # Un fallo de la base no detiene el hilo: se reintenta en la próxima pasada
+                logger.exception("Error al actualizar el throughput de las líneas")
+            self._stop.wait(self.interval_seconds)
+
+
+_worker: Optional[ThroughputWorker] = None
+
+
+def get_throughput_aggregator() -> Optional[ThroughputAggregator]:
+    return _worker.aggregator if _worker is not None else None
+
+
+def configure_throughput(app: FastAPI) -> None:
+    """Arranca el agregador con la aplicación y lo detiene al apagarla."""
+    global _worker
+    if not settings.THROUGHPUT_ENABLED:
+        return
+
+    _worker = ThroughputWorker(
+        aggregator=ThroughputAggregator(
+            lineas=settings.lineas_produccion,
+            ventana_horas=settings.THROUGHPUT_WINDOW_HOURS,
+            batch_size=settings.THROUGHPUT_BATCH_SIZE,
+            reloj=get_ecuador_time,
+        ),
+        session_factory=SessionLocalMain,
+        interval_seconds=settings.THROUGHPUT_INTERVAL_SECONDS,
+        resync_minutes=settings.THROUGHPUT_RESYNC_MINUTES,
+    )
+    app.add_event_handler("startup", _worker.start)
+    app.add_event_handler("shutdown", _worker.stop)
@@ -12,7 +12,7 @@ class EstadoEnum(Enum):
     INACTIVO = "INACTIVO"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WorkerMovement:
     """Entidad para representar un movimiento de operario (cambio de línea, puesto, etc.)"""
     
@@ -3,8 +3,8 @@ from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 from src.shared.base import get_db
 from math import ceil
-from src.shared.common.responses import success_response, error_response
-from src.shared.exceptions import RepositoryError, NotFoundError
+from src.shared.common.responses import success_response, error_response, validate_many
+from src.shared.exceptions import RepositoryError
 from src.shared.security import get_current_user_data
 # Importar el repositorio y casos de uso del movimiento
 from src.modules.management_service.src.infrastructure.db.repositories.movimientos_operario import (
@@ -86,20 +86,11 @@ def update_movement_controller(
     use_cases: WorkerMovementUseCases = Depends(get_movement_use_cases),
     user_data: Dict[str, Any] = Depends(get_current_user_data)
 ):
-    try:
-        updated_data = use_cases.update_movement(movement_id, movement_data, user_data)
-        return success_response(
-            data=WorkerMovementResponse.model_validate(updated_data).model_dump(mode="json"),
-            message="Movimiento actualizado",
-        )
-    except NotFoundError as e:
-        return error_response(
-            message=str(e), status_code=status.HTTP_404_NOT_FOUND
-        )
-    except RepositoryError as e:
-        return error_response(
-            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    updated_data = use_cases.update_movement(movement_id, movement_data, user_data)
+    return success_response(
+        data=WorkerMovementResponse.model_validate(updated_data).model_dump(mode="json"),
+        message="Movimiento actualizado",
+    )
 
 
 # 2. Controlador para ELIMINAR (DELETE - Hard Delete)
@@ -108,23 +99,13 @@ def delete_movement_controller(
     movement_id: int, use_cases: WorkerMovementUseCases = Depends(get_movement_use_cases),
     user_data: Dict[str, Any] = Depends(get_current_user_data)
 ):
-    try:
-        use_cases.delete_movement(movement_id, user_data)
-        # El código 204 indica que la petición fue exitosa y no hay contenido a retornar
-        return success_response(
-            data=None,
-            message="Movimiento eliminado permanentemente",
-            status_code=status.HTTP_204_NO_CONTENT,
-        )
-    except NotFoundError as e:
-        # Aquí puedes decidir si 404 o 500, pero 404 es común para indicar que el recurso no existe
-        return error_response(
-            message=str(e), status_code=status.HTTP_404_NOT_FOUND
-        )
-    except RepositoryError as e:
-        return error_response(
-            message=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    use_cases.delete_movement(movement_id, user_data)
+    # El código 204 indica que la petición fue exitosa y no hay contenido a retornar
+    return success_response(
+        data=None,
+        message="Movimiento eliminado permanentemente",
+        status_code=status.HTTP_204_NO_CONTENT,
+    )
 
 
 # 3. Controlador para OBTENER EL TOTAL DE REGISTROS POR FILTROS (POST)
@@ -174,10 +155,7 @@ def get_movements_paginated(
         )
         
         # Mapeamos las entidades de dominio ('data') a los schemas de respuesta
-        response_data = [
-            WorkerMovementResponse.model_validate(d).model_dump(mode="json")
-            for d in pagination_result["data"]
-        ]
+        response_data = validate_many(WorkerMovementResponse, pagination_result["data"])
         
         # Construimos la respuesta final, incluyendo los metadatos de paginación
         response_data_with_meta = {
@@ -232,10 +210,7 @@ def get_active_motives_paginated(
         total_records = use_cases.count_active_motives(pagination_params)
         
         # 3. Mapeo y Respuesta
-        response_data = [
-            RefMotivoResponse.model_validate(d).model_dump(mode="json")
-            for d in data_entities
-        ]
+        response_data = validate_many(RefMotivoResponse, data_entities)
         
         total_pages = ceil(total_records / pagination_params.page_size) if total_records > 0 else 0
 
@@ -293,10 +268,7 @@ def get_destinos_by_motivo_paginated(
         total_records = use_cases.count_destinations_by_motivo(pagination_params) # Reutiliza los filtros
         
         # 3. Mapeo y Respuesta
-        response_data = [
-            RefDestinoMotivoResponse.model_validate(d).model_dump(mode="json")
-            for d in data_entities
-        ]
+        response_data = validate_many(RefDestinoMotivoResponse, data_entities)
 
         total_pages = ceil(total_records / pagination_params.page_size) if total_records > 0 else 0
 
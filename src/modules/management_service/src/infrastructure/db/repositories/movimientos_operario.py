@@ -1,8 +1,10 @@
 # repositories.py
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, select
+from dataclasses import fields
 from datetime import date, datetime
+from operator import attrgetter
 from typing import List, Optional, Tuple
 
 # Importaciones de los modelos, entidades, schemas y puertos
@@ -18,26 +20,34 @@ from src.modules.management_service.src.application.ports.movimientos_operario i
 )
 
 # Importar las excepciones de tu capa de aplicación
+from src.shared.count_cache import clave_filtros, count_cache, invalidar_totales
 from src.shared.exceptions import AlreadyExistsError, NotFoundError, RepositoryError
+from src.shared.read_replica import lecturas_en_replica
 
 
+# Columnas en el orden de los campos de WorkerMovement: los listados leen filas
+# con Core select() y las mapean posicionalmente, sin instancias ORM.
+_MOVEMENT_FIELDS = tuple(f.name for f in fields(WorkerMovement))
+_MOVEMENT_COLUMNS = tuple(WorkerMovementORM.__table__.c[name] for name in _MOVEMENT_FIELDS)
+_orm_values = attrgetter(*_MOVEMENT_FIELDS)
+
+
+def _to_domain(row) -> WorkerMovement:
+    """Construye la entidad posicionalmente desde una Row o tupla en el orden de _MOVEMENT_FIELDS."""
+    return WorkerMovement(*row)
+
+
+_SCOPE = ("movimientos",)
+
+
+@lecturas_en_replica
 class WorkerMovementRepository(IWorkerMovementRepository):
     def __init__(self, db: Session):
         self.db = db
 
     def _to_domain_entity(self, orm_model: WorkerMovementORM) -> WorkerMovement:
         """Mapea un objeto ORM a una entidad de Dominio."""
-        return WorkerMovement(
-            id=orm_model.id,
-            linea=orm_model.linea,
-            fecha_p=orm_model.fecha_p,
-            tipo_movimiento=orm_model.tipo_movimiento,
-            motivo=orm_model.motivo,
-            codigo_operario=orm_model.codigo_operario,
-            destino=orm_model.destino,
-            hora=orm_model.hora,
-            observacion=orm_model.observacion,
-        )
+        return _to_domain(_orm_values(orm_model))
 
     def get_by_id(self, movement_id: int) -> Optional[WorkerMovement]:
         # ESTA CONSULTA NO ESTÁ RESTRINGIDA POR LÍNEAS.
@@ -58,16 +68,15 @@ class WorkerMovementRepository(IWorkerMovementRepository):
         # ESTA CONSULTA NO ESTÁ RESTRINGIDA POR LÍNEAS.
         # Si se requiere, se debe pasar 'allowed_lines' aquí también.
         try:
-            orm_list = (
-                self.db.query(WorkerMovementORM)
-                .filter(
+            stmt = (
+                select(*_MOVEMENT_COLUMNS)
+                .where(
                     WorkerMovementORM.fecha_p >= start_date,
                     WorkerMovementORM.fecha_p <= end_date,
                 )
                 .order_by(WorkerMovementORM.fecha_p.desc())
-                .all()
             )
-            return [self._to_domain_entity(orm) for orm in orm_list]
+            return [_to_domain(row) for row in self.db.execute(stmt)]
         except SQLAlchemyError as e:
             raise RepositoryError("Error al obtener los movimientos.") from e
 
@@ -76,14 +85,12 @@ class WorkerMovementRepository(IWorkerMovementRepository):
             # Pydantic V2: usa model_dump()
             new_movement_orm = WorkerMovementORM(**movement_data.model_dump())
             self.db.add(new_movement_orm)
-            self.db.commit()
-            self.db.refresh(new_movement_orm)
+            self.db.flush()
+            invalidar_totales(self.db, _SCOPE)
             return self._to_domain_entity(new_movement_orm)
         except IntegrityError as e:
-            self.db.rollback()
             raise RepositoryError("Ya existe un movimiento con esas características.") from e
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error en la base de datos al crear el movimiento.") from e
 
     def update(
@@ -98,11 +105,10 @@ class WorkerMovementRepository(IWorkerMovementRepository):
             setattr(movement_orm, key, value)
             
         try:
-            self.db.commit()
-            self.db.refresh(movement_orm)
+            self.db.flush()
+            invalidar_totales(self.db, _SCOPE)
             return self._to_domain_entity(movement_orm)
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("Error al actualizar el movimiento.") from e
 
     def delete(self, movement_id: int) -> bool:
@@ -112,10 +118,10 @@ class WorkerMovementRepository(IWorkerMovementRepository):
         
         try:
             self.db.delete(movement_orm)
-            self.db.commit()
+            self.db.flush()
+            invalidar_totales(self.db, _SCOPE)
             return True
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise RepositoryError("No se pudo eliminar el movimiento.") from e
 
     # +++ INICIO DE CAMBIOS +++
@@ -166,16 +172,26 @@ class WorkerMovementRepository(IWorkerMovementRepository):
 
     def count_by_filters(self, filters: WorkerMovementFilters, allowed_lines: List[str], allowed_turnos: List[int]) -> int:
         """Cuenta movimientos aplicando filtros de seguridad y de usuario."""
-        try:
-            # Query base para contar (más eficiente que query(WorkerMovementORM))
-            query = self.db.query(func.count(WorkerMovementORM.id))
-            
-            # Aplicar TODOS los filtros
-            query = self._apply_filters(query, filters, allowed_lines, allowed_turnos)
-            
-            return query.scalar() or 0 # Usar scalar() para count
-        except SQLAlchemyError as e:
-            raise RepositoryError("Error al contar los movimientos por filtros.") from e
+        def contar() -> int:
+            try:
+                # Query base para contar (más eficiente que query(WorkerMovementORM))
+                query = self.db.query(func.count(WorkerMovementORM.id))
+
+                # Aplicar TODOS los filtros
+                query = self._apply_filters(query, filters, allowed_lines, allowed_turnos)
+
+                return query.scalar() or 0 # Usar scalar() para count
+            except SQLAlchemyError as e:
+                raise RepositoryError("Error al contar los movimientos por filtros.") from e
+
+        # Las líneas y turnos permitidos son parte de la clave: dos usuarios con
+        # el mismo filtro pueden ver totales distintos
+        clave = (
+            clave_filtros(filters, WorkerMovementFilters.model_fields),
+            tuple(sorted(allowed_lines)),
+            tuple(sorted(allowed_turnos)),
+        )
+        return count_cache.get_or_compute(_SCOPE, clave, contar, db=self.db)
 
     def get_paginated_by_filters(
         self, filters: WorkerMovementFilters, page: int, page_size: int, allowed_lines: List[str], allowed_turnos: List[int]
@@ -190,7 +206,7 @@ class WorkerMovementRepository(IWorkerMovementRepository):
                 return [], 0
             
             # 2. Aplicar filtros, paginación y ordenamiento para los datos
-            base_query = self.db.query(WorkerMovementORM)
+            base_query = select(*_MOVEMENT_COLUMNS)
             data_query = self._apply_filters(base_query, filters, allowed_lines, allowed_turnos)
             
             # Ordenar por hora/fecha para paginación consistente
@@ -200,9 +216,7 @@ class WorkerMovementRepository(IWorkerMovementRepository):
             offset = (page - 1) * page_size
             data_query = data_query.limit(page_size).offset(offset)
             
-            orm_list = data_query.all()
-            
-            domain_entities = [self._to_domain_entity(orm) for orm in orm_list]
+            domain_entities = [_to_domain(row) for row in self.db.execute(data_query)]
             
             return domain_entities, total_records
         except SQLAlchemyError as e:
@@ -214,6 +228,7 @@ class WorkerMovementRepository(IWorkerMovementRepository):
 # --- El resto de las clases (RefMotivoRepository, RefDestinoMotivoRepository) ---
 # --- permanecen sin cambios ya que no filtran por línea. ---
 
+@lecturas_en_replica
 class RefMotivoRepository(IRefMotivoRepository):
     def __init__(self, db: Session):
         self.db = db
@@ -263,6 +278,7 @@ class RefMotivoRepository(IRefMotivoRepository):
             raise RepositoryError("Error al obtener motivos activos paginados.") from e
 
 
+@lecturas_en_replica
 class RefDestinoMotivoRepository(IRefDestinoMotivoRepository):
     def __init__(self, db: Session):
         self.db = db
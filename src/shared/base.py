@@ -1,15 +1,62 @@
-from .database import SessionLocalMain, SessionLocalAuth
+from contextlib import contextmanager
+from typing import Iterator
 
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
 
-def get_db():
-    db = SessionLocalMain()
+from .database import SessionLocalMain, SessionLocalAuth, SessionLocalReport
+from .exceptions import RepositoryError
+
+
+@contextmanager
+def unit_of_work(session_factory: sessionmaker) -> Iterator[Session]:
+    """
+    Unidad de trabajo: los repositorios solo hacen flush() y aquí se
+    confirma una única vez al final, o se revierte si hubo una excepción.
+    Es el único lugar que confirma o revierte: los repositorios no llaman a
+    rollback() y las rutas que escriben dejan pasar los errores de dominio
+    (los responde el manejador global) para que no se confirme lo ya hecho.
+    """
+    db = session_factory()
     try:
         yield db
+        try:
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise RepositoryError("Error al confirmar la transacción.") from e
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
-def get_auth_db():
-    db = SessionLocalAuth()
+
+
+@contextmanager
+def read_only_session(session_factory: sessionmaker) -> Iterator[Session]:
+    """Sesión de solo lectura: nunca confirma, al terminar se revierte y se cierra."""
+    db = session_factory()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.rollback()
+        db.close()
+
+
+def get_db():
+    with unit_of_work(SessionLocalMain) as db:
+        yield db
+
+
+def get_auth_db():
+    with unit_of_work(SessionLocalAuth) as db:
+        yield db
+
+
+def get_report_db():
+    """
+    Sesión del engine de reportes para endpoints de solo lectura. Nunca
+    confirma: al terminar se revierte, así nada escrito por error persiste.
+    """
+    with read_only_session(SessionLocalReport) as db:
+        yield db
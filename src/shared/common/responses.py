@@ -1,9 +1,15 @@
 from fastapi import status
 from fastapi.responses import JSONResponse
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, Type, TypeVar
 from decimal import Decimal
 from datetime import datetime, date
 
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
 
 def convert_decimals(obj):
     if isinstance(obj, Decimal):
@@ -34,16 +40,48 @@ def convert_non_serializable(obj):
         return obj
 
 
+def _json_fallback(obj):
+    # Tipos que pydantic_core no sabe serializar: objetos con __dict__
+    # (mismo criterio que convert_non_serializable)
+    if hasattr(obj, '__dict__'):
+        return vars(obj)
+    raise TypeError(f"Tipo no serializable a JSON: {type(obj).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse que serializa el contenido en una sola pasada con
+    pydantic_core (Rust). Acepta directamente modelos Pydantic, dataclasses,
+    datetime/date/time, dicts y listas, sin convertirlos antes a tipos nativos.
+    Los Decimal sueltos (fuera de un modelo) salen como string, igual que en
+    `model_dump(mode="json")`.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content, fallback=_json_fallback)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[ModelT]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def validate_many(model: Type[ModelT], items: Iterable[Any]) -> List[ModelT]:
+    """
+    Convierte entidades de dominio (u objetos ORM) al schema de respuesta en
+    una sola llamada, equivalente a `[model.model_validate(i) for i in items]`.
+    El resultado se puede pasar tal cual a `success_response`.
+    """
+    return _list_adapter(model).validate_python(list(items), from_attributes=True)
+
+
 def success_response(data: Any, message: str, status_code: int = 200) -> JSONResponse:
     """
     Genera una respuesta JSON exitosa.
     """
-    # Convierte todos los Decimal a float antes de serializar
-    cleaned_data = convert_non_serializable(data)
-
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status_code,
-        content={"success": True, "message": message, "data": cleaned_data},
+        content={"success": True, "message": message, "data": data},
     )
 
 
@@ -1,6 +1,8 @@
 # src/shared/config.py
+import os
+import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -46,6 +48,76 @@ class Settings(BaseSettings):
     AUTH_DB_TRUST_CERTIFICATE: str 
     AUTH_DATABASE_URL: Optional[str] = None
 
+    # --- Pool de conexiones (aplica a ambos engines) ---
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    # Si es False se usa recycle + ping solo a conexiones ociosas (con reintento)
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_IDLE_PING_SECONDS: int = 300
+    DB_FAST_EXECUTEMANY: bool = True
+
+    # --- Engine de reportes (misma base que DATABASE_URL, pool aparte) ---
+    # SNAPSHOT requiere ALLOW_SNAPSHOT_ISOLATION ON en la base; READ UNCOMMITTED
+    # no bloquea ni espera a las balanzas, pero puede leer filas sin confirmar
+    REPORT_DB_ISOLATION: Literal["SNAPSHOT", "READ UNCOMMITTED", "READ COMMITTED"] = "SNAPSHOT"
+    # Tiempo máximo por consulta de reporte (0 = sin límite)
+    REPORT_DB_QUERY_TIMEOUT_SECONDS: int = 120
+    REPORT_DB_POOL_SIZE: int = 3
+    REPORT_DB_MAX_OVERFLOW: int = 5
+
+    # --- Réplica de lectura de la base principal (opcional) ---
+    # get_*/count_* de los repositorios leen de aquí; sin URL todo va a la primaria
+    REPLICA_DATABASE_URL: Optional[str] = None
+    # Tras una escritura, el cliente lee de la primaria durante este tiempo (read-your-writes)
+    REPLICA_STICKY_SECONDS: int = 5
+    # Si la réplica no responde, se reintenta tras este tiempo
+    REPLICA_RETRY_SECONDS: int = 30
+
+    # --- Trabajos en segundo plano (reportes pesados) ---
+    # Directorio de resultados; por defecto <tmp>/idrixfix_jobs
+    JOBS_DIR: Optional[str] = None
+    JOBS_MAX_WORKERS: int = 2
+    # Trabajos sin terminar admitidos; por encima se rechazan los envíos nuevos
+    JOBS_MAX_PENDIENTES: int = 20
+    JOBS_RESULT_TTL_SECONDS: int = 3600
+
+    # --- Instrumentación SQL por petición ---
+    SQL_INSTRUMENTATION_ENABLED: bool = True
+    SQL_QUERY_BUDGET: int = 25
+    SQL_NPLUSONE_THRESHOLD: int = 5
+    SQL_SLOW_QUERY_MS: int = 500
+
+    # --- Líneas de producción ---
+    # numero:nombre; el nombre arma las tablas reg_linea_<nombre>_entrad/_salid.
+    # Agregar una línea es agregar su par aquí (ej. ",7:siete").
+    LINEAS_PRODUCCION: str = "1:uno,2:dos,3:tres,4:cuatro,5:cinco,6:seis"
+
+    # --- Throughput en vivo (kg/hora por línea, en memoria) ---
+    THROUGHPUT_ENABLED: bool = True
+    THROUGHPUT_INTERVAL_SECONDS: int = 5
+    # Horas retenidas en el buffer por minuto y releídas al arrancar
+    THROUGHPUT_WINDOW_HOURS: int = 6
+    THROUGHPUT_BATCH_SIZE: int = 5000
+    # Reconstrucción completa periódica: recoge taras, panzas y bajas sobre filas ya leídas
+    THROUGHPUT_RESYNC_MINUTES: int = 60
+
+    # --- Caché de totales de los listados paginados y /total ---
+    # TTL corto: solo cubre a la UI pasando páginas del mismo filtro. 0 la desactiva.
+    COUNT_CACHE_TTL_SECONDS: int = 15
+    COUNT_CACHE_MAX_ENTRIES: int = 1024
+
+    # --- Resumen diario por línea (resumen_linea_diario en la base de auth) ---
+    # Requiere la migración e3f7b2a91c54. Desactivado, /total y rendimiento leen las tablas de línea
+    RESUMEN_LINEAS_ENABLED: bool = False
+    RESUMEN_LINEAS_INTERVAL_SECONDS: int = 10
+    # Ids por tabla y pasada; la carga inicial avanza de a este tramo
+    RESUMEN_LINEAS_BATCH_SIZE: int = 50000
+    # Recalculo periódico de los últimos días: recoge ediciones hechas fuera de la API
+    RESUMEN_LINEAS_RESYNC_MINUTES: int = 30
+    RESUMEN_LINEAS_RESYNC_DIAS: int = 2
+
     # Servicios
     MANAGEMENT_SERVICE_HOST: str = "localhost"
     MANAGEMENT_SERVICE_PORT: int = 8021
@@ -100,6 +172,10 @@ class Settings(BaseSettings):
             f"?driver={self.AUTH_DB_DRIVER}&TrustServerCertificate={self.AUTH_DB_TRUST_CERTIFICATE}"
         )
 
+    @property
+    def jobs_dir(self) -> str:
+        return self.JOBS_DIR or os.path.join(tempfile.gettempdir(), "idrixfix_jobs")
+
     @property
     def management_service_url(self) -> str:
         return f"http://{self.MANAGEMENT_SERVICE_HOST}:{self.MANAGEMENT_SERVICE_PORT}"
@@ -111,6 +187,17 @@ class Settings(BaseSettings):
         return f"http://{self.LINEAS_ENTRADA_SALIDA_SERVICE_HOST}:{self.LINEAS_ENTRADA_SALIDA_SERVICE_PORT}"
 
 
+    @property
+    def lineas_produccion(self) -> dict[int, str]:
+        """Convierte LINEAS_PRODUCCION en {numero: nombre}, ordenado por número"""
+        lineas = {}
+        for item in self.LINEAS_PRODUCCION.split(","):
+            if not item.strip():
+                continue
+            numero, nombre = item.split(":", 1)
+            lineas[int(numero)] = nombre.strip().lower()
+        return dict(sorted(lineas.items()))
+
     @property
     def cors_methods_list(self) -> list[str]:
         """Convierte la cadena de métodos CORS separada por comas en una lista"""
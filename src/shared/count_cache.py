@@ -0,0 +1,120 @@
+"""
+Caché de totales (COUNT) para los listados paginados y los endpoints /total.
+
+La UI recorre varias páginas del mismo filtro en pocos segundos y cada página
+recalculaba el COUNT completo. Aquí se guarda cada total por (ámbito, filtros)
+con LRU y un TTL corto. El ámbito es la tabla consultada, p. ej.
+("salida", 3), ("auditoria",) o ("movimientos",).
+
+Las escrituras de los repositorios invalidan su ámbito en el momento y otra vez
+al confirmar la transacción: un COUNT hecho por otra petición entre el flush y
+el commit todavía ve los datos viejos y no debe sobrevivir en la caché. Lo que
+insertan los equipos de planta directo en la base no pasa por aquí; eso lo
+cubre el TTL.
+
+Solo se guardan totales contados en la primaria: un COUNT que iría a la
+réplica de lectura se calcula sin pasar por la caché, porque la réplica puede
+ir atrasada y ese total quedaría servido también a quien lee de la primaria.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Mapping, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.shared.config import settings
+from src.shared.read_replica import lee_de_replica
+
+_PENDIENTES = "count_cache_scopes"
+
+
+def _hashable(value: Any) -> Hashable:
+    return tuple(value) if isinstance(value, (list, tuple, set)) else value
+
+
+def clave_params(params: Mapping[str, Any]) -> Tuple:
+    """Clave desde los parámetros ya normalizados de una sentencia (solo filtros activos, en orden fijo)."""
+    return tuple((name, _hashable(value)) for name, value in params.items())
+
+
+def clave_filtros(filters: Any, campos: Iterable[str]) -> Tuple:
+    """Clave desde un schema de filtros: solo los `campos` con valor, así la paginación no la altera."""
+    clave = []
+    for campo in campos:
+        value = getattr(filters, campo, None)
+        if value is not None and value != "" and value != []:
+            clave.append((campo, _hashable(value)))
+    return tuple(clave)
+
+
+class CountCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, reloj: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.reloj = reloj
+        self._entries: "OrderedDict[Tuple[Hashable, Hashable], Tuple[float, int]]" = OrderedDict()
+        # Generación por ámbito: si cambia mientras se cuenta, el total calculado no se guarda
+        self._generaciones: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get_or_compute(
+            self, scope: Hashable, key: Hashable, compute: Callable[[], int], db: Optional[Session] = None
+    ) -> int:
+        if not self.enabled or (db is not None and lee_de_replica(db)):
+            return compute()
+
+        entry_key = (scope, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None and entry[0] > self.reloj():
+                self._entries.move_to_end(entry_key)
+                return entry[1]
+            generacion = self._generaciones.get(scope, 0)
+
+        total = compute()
+
+        with self._lock:
+            if self._generaciones.get(scope, 0) == generacion:
+                self._entries[entry_key] = (self.reloj() + self.ttl_seconds, total)
+                self._entries.move_to_end(entry_key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return total
+
+    def invalidate(self, scope: Hashable) -> None:
+        with self._lock:
+            self._generaciones[scope] = self._generaciones.get(scope, 0) + 1
+            for entry_key in [k for k in self._entries if k[0] == scope]:
+                del self._entries[entry_key]
+
+    def clear(self) -> None:
+        with self._lock:
+            for scope in self._generaciones:
+                self._generaciones[scope] += 1
+            self._entries.clear()
+
+
+count_cache = CountCache(settings.COUNT_CACHE_MAX_ENTRIES, settings.COUNT_CACHE_TTL_SECONDS)
+
+
+def invalidar_totales(db: Session, scope: Hashable) -> None:
+    """Invalida el ámbito ya y lo vuelve a invalidar cuando `db` confirme su transacción."""
+    count_cache.invalidate(scope)
+    db.info.setdefault(_PENDIENTES, set()).add(scope)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_al_confirmar(session: Session) -> None:
+    for scope in session.info.pop(_PENDIENTES, ()):
+        count_cache.invalidate(scope)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_pendientes(session: Session) -> None:
+    session.info.pop(_PENDIENTES, None)
@@ -3,17 +3,47 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.sql import func
 from .config import settings
+from .db_pool import engine_options, is_memory_sqlite, register_idle_ping, register_report_connection, \
+    report_engine_options
+from .read_replica import RoutingSession
 
 # Configuración específica para SQL Server
-engine_main = create_engine(settings.database_url, pool_pre_ping=True)
-SessionLocalMain = sessionmaker(autocommit=False, autoflush=False, bind=engine_main)
+engine_main = create_engine(settings.database_url, **engine_options(settings.database_url))
+
+# --- Réplica de lectura de la base principal (opcional) ---
+engine_replica = None
+if settings.REPLICA_DATABASE_URL:
+    engine_replica = create_engine(settings.REPLICA_DATABASE_URL, **engine_options(settings.REPLICA_DATABASE_URL))
+SessionLocalMain = sessionmaker(
+    class_=RoutingSession, replica=engine_replica,
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine_main,
+)
 BaseMain = declarative_base()
 
 # --- Conexión a la Base de Datos de Autenticación (NUEVO) ---
-engine_auth = create_engine(settings.auth_database_url, pool_pre_ping=True)
-SessionLocalAuth = sessionmaker(autocommit=False, autoflush=False, bind=engine_auth)
+engine_auth = create_engine(settings.auth_database_url, **engine_options(settings.auth_database_url))
+SessionLocalAuth = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine_auth)
 BaseAuth = declarative_base()
 
+# --- Engine de reportes: la base principal con su propio pool y aislamiento ---
+# Los escaneos largos de reportes no bloquean ni esperan a las balanzas que
+# insertan en reg_linea_*. Una base SQLite en memoria solo existe en su
+# conexión, así que ahí los reportes usan el engine principal.
+if is_memory_sqlite(settings.database_url):
+    engine_report = engine_main
+else:
+    engine_report = create_engine(settings.database_url, **report_engine_options(settings.database_url))
+    register_report_connection(engine_report)
+SessionLocalReport = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine_report)
+
+if not settings.DB_POOL_PRE_PING:
+    register_idle_ping(engine_main)
+    register_idle_ping(engine_auth)
+    if engine_report is not engine_main:
+        register_idle_ping(engine_report)
+    if engine_replica is not None:
+        register_idle_ping(engine_replica)
+
 # Clase base declarativa
 _BaseMain = BaseMain
 _BaseAuth = BaseAuth
\ No newline at end of file
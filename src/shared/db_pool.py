@@ -0,0 +1,167 @@
+"""
+Configuración e instrumentación del pool de conexiones de SQLAlchemy.
+
+- `engine_options()` arma los kwargs de `create_engine` desde `Settings`.
+- `InstrumentedQueuePool` mide cuánto espera cada checkout por una conexión.
+- `pool_status()` expone esas métricas para `/metrics/db-pool`.
+- `report_engine_options()` / `register_report_connection()` configuran el
+  engine de reportes: aislamiento propio, timeout por consulta y NOCOUNT.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from .config import settings
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que acumula checkouts, tiempo de espera y timeouts."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def recreate(self):
+        # dispose() recrea el pool: se conservan las métricas acumuladas
+        new_pool = super().recreate()
+        new_pool.checkouts = self.checkouts
+        new_pool.timeouts = self.timeouts
+        new_pool.wait_total = self.wait_total
+        new_pool.wait_max = self.wait_max
+        return new_pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_total += waited
+                if waited > self.wait_max:
+                    self.wait_max = waited
+
+
+def is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def engine_options(url: str, pool_size: Optional[int] = None, max_overflow: Optional[int] = None) -> Dict[str, Any]:
+    """kwargs de `create_engine` para la URL dada según la configuración del pool."""
+    parsed = make_url(url)
+    if is_memory_sqlite(url):
+        # SQLite en memoria (benchmarks): una única conexión compartida entre hilos
+        return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+
+    options: Dict[str, Any] = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE if pool_size is None else pool_size,
+        "max_overflow": settings.DB_MAX_OVERFLOW if max_overflow is None else max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if parsed.get_backend_name() == "mssql" and parsed.get_driver_name() == "pyodbc":
+        # executemany en un solo round trip (inserts/updates masivos)
+        options["fast_executemany"] = settings.DB_FAST_EXECUTEMANY
+    return options
+
+
+def report_engine_options(url: str) -> Dict[str, Any]:
+    """kwargs del engine de reportes: pool propio y el aislamiento de REPORT_DB_ISOLATION en SQL Server."""
+    options = engine_options(url, settings.REPORT_DB_POOL_SIZE, settings.REPORT_DB_MAX_OVERFLOW)
+    if make_url(url).get_backend_name() == "mssql":
+        options["isolation_level"] = settings.REPORT_DB_ISOLATION
+    return options
+
+
+def register_report_connection(engine: Engine) -> None:
+    """
+    Cada conexión nueva del engine de reportes recibe SET NOCOUNT ON (sin los
+    mensajes de filas afectadas por sentencia) y el timeout de consulta de
+    pyodbc, que cancela la consulta en el servidor al vencer.
+    """
+    if engine.dialect.name != "mssql":
+        return
+    timeout = settings.REPORT_DB_QUERY_TIMEOUT_SECONDS
+
+    @event.listens_for(engine, "connect")
+    def _configurar_reporte(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SET NOCOUNT ON")
+        finally:
+            cursor.close()
+        if hasattr(dbapi_connection, "timeout"):
+            dbapi_connection.timeout = timeout
+
+
+def register_idle_ping(engine: Engine) -> None:
+    """
+    Alternativa a `pool_pre_ping`: solo se hace ping a las conexiones que
+    estuvieron ociosas más de DB_POOL_IDLE_PING_SECONDS. Si el ping falla se
+    lanza DisconnectionError y el pool descarta la conexión y reintenta el
+    checkout con una nueva.
+    """
+    idle_limit = settings.DB_POOL_IDLE_PING_SECONDS
+
+    @event.listens_for(engine, "checkin")
+    def _mark_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_limit:
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception as e:
+            raise exc.DisconnectionError("Conexión inválida tras inactividad.") from e
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    """Estado actual y métricas acumuladas del pool de un engine."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool_class": type(pool).__name__}
+
+    status: Dict[str, Any] = {
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "timeout_seconds": pool._timeout,
+    }
+    if isinstance(pool, InstrumentedQueuePool):
+        checkouts = pool.checkouts
+        status.update({
+            "checkouts_total": checkouts,
+            "checkout_timeouts_total": pool.timeouts,
+            "wait_seconds_total": round(pool.wait_total, 6),
+            "wait_seconds_avg": round(pool.wait_total / checkouts, 6) if checkouts else 0.0,
+            "wait_seconds_max": round(pool.wait_max, 6),
+        })
+    return status
@@ -0,0 +1,138 @@
+"""
+Métricas HTTP en formato de exposición de Prometheus.
+
+Un middleware ASGI registra por (ruta, método, status) el total de peticiones
+y un histograma de latencia; además lleva un gauge de peticiones en curso.
+La ruta se etiqueta con su plantilla (`/api/lineas-salida/{linea_num}/paginated`)
+y no con el path crudo, para mantener acotada la cardinalidad.
+
+Cada serie guarda sus buckets en una lista preasignada: registrar una petición
+es un `bisect` y tres sumas, sin crear diccionarios de etiquetas. El
+middleware corre en el hilo del event loop, por lo que no necesita locks.
+"""
+import time
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+UNMATCHED_ROUTE = "__unmatched__"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Series:
+    __slots__ = ("count", "total", "buckets")
+
+    def __init__(self, bucket_count: int):
+        self.count = 0
+        self.total = 0.0
+        # Un contador por bucket + el bucket +Inf
+        self.buckets: List[int] = [0] * (bucket_count + 1)
+
+
+class HttpMetricsRegistry:
+    """Contadores e histogramas de latencia por (ruta, método, status)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bucket_bounds = buckets
+        self.series: Dict[Tuple[str, str, int], _Series] = {}
+        self.in_flight = 0
+
+    def observe(self, route: str, method: str, status: int, elapsed: float) -> None:
+        key = (route, method, status)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = _Series(len(self.bucket_bounds))
+        series.count += 1
+        series.total += elapsed
+        series.buckets[bisect_left(self.bucket_bounds, elapsed)] += 1
+
+    def render(self) -> str:
+        """Serializa las métricas en formato de texto de Prometheus."""
+        bounds = [_format_float(b) for b in self.bucket_bounds] + ["+Inf"]
+        lines = [
+            "# HELP http_requests_in_flight Peticiones HTTP en curso.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_requests_total Total de peticiones HTTP por ruta, método y status.",
+            "# TYPE http_requests_total counter",
+        ]
+        items = sorted(self.series.items())
+        for (route, method, status), series in items:
+            lines.append(f"http_requests_total{{{_labels(route, method, status)}}} {series.count}")
+
+        lines.append("# HELP http_request_duration_seconds Latencia de las peticiones HTTP.")
+        lines.append("# TYPE http_request_duration_seconds histogram")
+        for (route, method, status), series in items:
+            labels = _labels(route, method, status)
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, series.buckets):
+                cumulative += bucket_count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {series.total:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {series.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(route: str, method: str, status: int) -> str:
+    return f'route="{_escape(route)}",method="{method}",status="{status}"'
+
+
+registry = HttpMetricsRegistry()
+
+
+class HttpMetricsMiddleware:
+    """Middleware ASGI que alimenta el registro de métricas HTTP."""
+
+    def __init__(self, app, metrics: HttpMetricsRegistry = registry):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        status_code = 500
+        start = time.perf_counter()
+        metrics.in_flight += 1
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.in_flight -= 1
+            route = scope.get("route")
+            metrics.observe(
+                route.path if route is not None else UNMATCHED_ROUTE,
+                scope["method"],
+                status_code,
+                time.perf_counter() - start,
+            )
+
+
+def configure_http_metrics(app: FastAPI, path: str = "/metrics") -> None:
+    """Instala el middleware y expone las métricas en `path`."""
+    app.add_middleware(HttpMetricsMiddleware)
+
+    @app.get(path, include_in_schema=False)
+    async def metrics_endpoint():
+        return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,399 @@
+"""
+Trabajos en segundo plano para reportes pesados.
+
+Un endpoint de reporte encola el trabajo y devuelve su id; el cliente consulta
+`GET /api/jobs/{id}`, descarga el resultado en `GET /api/jobs/{id}/resultado`
+cuando está completado, o lo cancela con `DELETE /api/jobs/{id}`.
+
+- Un ThreadPoolExecutor de `JOBS_MAX_WORKERS` hilos ejecuta los trabajos; con
+  `JOBS_MAX_PENDIENTES` trabajos sin terminar se rechazan los envíos nuevos.
+- Un trabajo es una función que devuelve un iterable de filas JSON: se
+  escriben a disco a medida que llegan (`<id>.json`) y el estado va en
+  `<id>.meta.json`, así otro proceso del mismo host también puede informar el
+  estado, servir la descarga o pedir la cancelación (`<id>.cancel`).
+- Un envío idéntico (mismo tipo y parámetros) a uno pendiente, en curso o
+  completado y vigente devuelve ese mismo trabajo.
+- Los archivos se borran `JOBS_RESULT_TTL_SECONDS` después de terminar. Un
+  trabajo sin terminar solo se da por abandonado (su proceso se detuvo)
+  cuando su `<id>.meta.json` deja de recibir el latido que el proceso dueño
+  le da cada `_LATIDO_SEGUNDOS`.
+- La cancelación es cooperativa: se revisa entre filas, y un trabajo
+  pendiente ya no empieza.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional
+
+from fastapi import APIRouter, FastAPI, status
+from fastapi.responses import FileResponse
+
+from .common.responses import error_response, success_response
+from .common.time_utils import get_ecuador_time
+from .config import settings
+from .exceptions import DomainError
+
+logger = logging.getLogger(__name__)
+
+_JOB_ID_RE = re.compile(r"[0-9a-f]{32}")
+# Cada cuántas filas se revisa el archivo de cancelación de otro proceso
+_REVISAR_ARCHIVO_CADA = 1000
+_PURGA_SEGUNDOS = 60
+# El dueño refresca el mtime de <id>.meta.json de sus trabajos sin terminar;
+# sin latido durante _ABANDONO_SEGUNDOS el trabajo se considera abandonado
+_LATIDO_SEGUNDOS = 30
+_ABANDONO_SEGUNDOS = 10 * _LATIDO_SEGUNDOS
+
+
+class EstadoJob(str, Enum):
+    PENDIENTE = "pendiente"
+    EN_CURSO = "en_curso"
+    COMPLETADO = "completado"
+    FALLIDO = "fallido"
+    CANCELADO = "cancelado"
+
+
+_TERMINALES = {EstadoJob.COMPLETADO, EstadoJob.FALLIDO, EstadoJob.CANCELADO}
+
+
+class ColaLlena(Exception):
+    """Se alcanzó JOBS_MAX_PENDIENTES trabajos sin terminar."""
+
+
+class _Cancelado(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    id: str
+    tipo: str
+    clave: str
+    estado: EstadoJob
+    creado: datetime
+    iniciado: Optional[datetime] = None
+    terminado: Optional[datetime] = None
+    filas: int = 0
+    error: Optional[str] = None
+    cancelar: threading.Event = field(default_factory=threading.Event, repr=False, compare=False)
+
+    @property
+    def terminal(self) -> bool:
+        return self.estado in _TERMINALES
+
+    def to_meta(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "tipo": self.tipo,
+            "clave": self.clave,
+            "estado": self.estado.value,
+            "creado": self.creado.isoformat(),
+            "iniciado": self.iniciado.isoformat() if self.iniciado else None,
+            "terminado": self.terminado.isoformat() if self.terminado else None,
+            "filas": self.filas,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_meta(cls, meta: Mapping[str, Any]) -> "Job":
+        def fecha(value: Optional[str]) -> Optional[datetime]:
+            return datetime.fromisoformat(value) if value else None
+
+        return cls(
+            id=meta["id"],
+            tipo=meta["tipo"],
+            clave=meta["clave"],
+            estado=EstadoJob(meta["estado"]),
+            creado=fecha(meta["creado"]),
+            iniciado=fecha(meta["iniciado"]),
+            terminado=fecha(meta["terminado"]),
+            filas=meta["filas"],
+            error=meta["error"],
+        )
+
+
+def _clave(tipo: str, params: Mapping[str, Any]) -> str:
+    contenido = json.dumps({"tipo": tipo, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(contenido.encode()).hexdigest()
+
+
+class JobRunner:
+    def __init__(self, directorio: str, max_workers: int, max_pendientes: int, ttl_seconds: int):
+        self.directorio = Path(directorio)
+        self.max_pendientes = max_pendientes
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="jobs")
+        self._lock = threading.RLock()
+        self._jobs: Dict[str, Job] = {}
+        self._futures: Dict[str, Future] = {}
+        self._ultima_purga = 0.0
+        self._detener = threading.Event()
+        self._latido: Optional[threading.Thread] = None
+
+    # --- Archivos ---
+
+    def _ruta(self, job_id: str, sufijo: str) -> Path:
+        return self.directorio / f"{job_id}{sufijo}"
+
+    def _guardar(self, job: Job) -> None:
+        with self._lock:
+            self.directorio.mkdir(parents=True, exist_ok=True)
+            tmp = self._ruta(job.id, ".meta.tmp")
+            tmp.write_text(json.dumps(job.to_meta()), encoding="utf-8")
+            os.replace(tmp, self._ruta(job.id, ".meta.json"))
+
+    def _leer(self, job_id: str) -> Optional[Job]:
+        try:
+            return Job.from_meta(json.loads(self._ruta(job_id, ".meta.json").read_text(encoding="utf-8")))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _borrar(self, job_id: str) -> None:
+        for sufijo in (".json", ".meta.json", ".cancel", ".tmp"):
+            self._ruta(job_id, sufijo).unlink(missing_ok=True)
+
+    def _abandonado(self, job_id: str) -> bool:
+        try:
+            latido = self._ruta(job_id, ".meta.json").stat().st_mtime
+        except OSError:
+            return True
+        return time.time() - latido > _ABANDONO_SEGUNDOS
+
+    def _expirado(self, job: Job, ahora: datetime) -> bool:
+        if job.terminal:
+            return job.terminado + self.ttl < ahora
+        # Sin terminar: solo si no es de este proceso y su dueño dejó de dar el latido
+        return job.id not in self._jobs and self._abandonado(job.id)
+
+    def _latir(self) -> None:
+        while not self._detener.wait(_LATIDO_SEGUNDOS):
+            with self._lock:
+                ids = [job_id for job_id, job in self._jobs.items() if not job.terminal]
+            for job_id in ids:
+                try:
+                    os.utime(self._ruta(job_id, ".meta.json"))
+                except OSError:
+                    pass
+
+    def _iniciar_latido(self) -> None:
+        if self._latido is None or not self._latido.is_alive():
+            self._latido = threading.Thread(target=self._latir, name="jobs-latido", daemon=True)
+            self._latido.start()
+
+    def purgar(self, forzar: bool = False) -> None:
+        """Borra los trabajos terminados hace más de JOBS_RESULT_TTL_SECONDS."""
+        if not forzar and time.monotonic() - self._ultima_purga < _PURGA_SEGUNDOS:
+            return
+        self._ultima_purga = time.monotonic()
+        ahora = get_ecuador_time()
+        with self._lock:
+            for job_id, job in list(self._jobs.items()):
+                if job.terminal and self._expirado(job, ahora):
+                    del self._jobs[job_id]
+                    self._borrar(job_id)
+            # También los que dejaron otros procesos o una ejecución anterior
+            for meta in self.directorio.glob("*.meta.json"):
+                job_id = meta.name[:-len(".meta.json")]
+                if job_id in self._jobs:
+                    continue
+                job = self._leer(job_id)
+                if job is None or self._expirado(job, ahora):
+                    self._borrar(job_id)
+
+    # --- API ---
+
+    def submit(self, tipo: str, params: Mapping[str, Any], fn: Callable[[], Iterable[Any]]) -> Job:
+        """
+        Encola `fn`, que devuelve las filas del resultado. Si ya hay un
+        trabajo igual sin fallar ni cancelar, devuelve ese.
+        """
+        clave = _clave(tipo, params)
+        self.purgar()
+        ahora = get_ecuador_time()
+        with self._lock:
+            for job_id, job in list(self._jobs.items()):
+                # La purga corre como mucho una vez por minuto: un completado ya vencido no se reutiliza
+                if job.terminal and self._expirado(job, ahora):
+                    del self._jobs[job_id]
+                    self._borrar(job_id)
+                    continue
+                if job.clave == clave and job.estado not in (EstadoJob.FALLIDO, EstadoJob.CANCELADO):
+                    return job
+            if sum(1 for job in self._jobs.values() if not job.terminal) >= self.max_pendientes:
+                raise ColaLlena("Hay demasiados trabajos en cola, intente más tarde.")
+
+            job = Job(id=uuid.uuid4().hex, tipo=tipo, clave=clave, estado=EstadoJob.PENDIENTE,
+                      creado=get_ecuador_time())
+            self._jobs[job.id] = job
+            self._guardar(job)
+            self._iniciar_latido()
+            self._futures[job.id] = self._executor.submit(self._ejecutar, job, fn)
+            return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        if not _JOB_ID_RE.fullmatch(job_id):
+            return None
+        self.purgar()
+        with self._lock:
+            job = self._jobs.get(job_id) or self._leer(job_id)
+        if job is None or self._expirado(job, get_ecuador_time()):
+            return None
+        return job
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.get(job_id)
+        if job is None or job.terminal:
+            return job
+        with self._lock:
+            if job_id not in self._jobs:
+                # Lo ejecuta otro proceso: lo verá al revisar el archivo
+                self._ruta(job_id, ".cancel").touch()
+                return job
+            job.cancelar.set()
+            future = self._futures.get(job_id)
+            if job.estado is EstadoJob.PENDIENTE and future is not None and future.cancel():
+                self._terminar(job, EstadoJob.CANCELADO)
+            return job
+
+    def resultado(self, job: Job) -> Optional[Path]:
+        ruta = self._ruta(job.id, ".json")
+        if job.estado is not EstadoJob.COMPLETADO or not ruta.exists():
+            return None
+        return ruta
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for job_id, job in self._jobs.items():
+                if job.terminal:
+                    continue
+                job.cancelar.set()
+                future = self._futures.get(job_id)
+                if future is not None and future.cancel():
+                    self._terminar(job, EstadoJob.CANCELADO)
+        self._detener.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # --- Ejecución ---
+
+    def _terminar(self, job: Job, estado: EstadoJob, error: Optional[str] = None) -> None:
+        with self._lock:
+            job.estado = estado
+            job.error = error
+            job.terminado = get_ecuador_time()
+            self._futures.pop(job.id, None)
+            self._guardar(job)
+
+    def _revisar(self, job: Job, archivo: bool) -> None:
+        if job.cancelar.is_set() or (archivo and self._ruta(job.id, ".cancel").exists()):
+            raise _Cancelado()
+
+    def _ejecutar(self, job: Job, fn: Callable[[], Iterable[Any]]) -> None:
+        with self._lock:
+            if job.terminal:
+                return
+            job.estado = EstadoJob.EN_CURSO
+            job.iniciado = get_ecuador_time()
+            self._guardar(job)
+
+        tmp = self._ruta(job.id, ".tmp")
+        filas = None
+        try:
+            self._revisar(job, archivo=True)
+            filas = iter(fn())
+            with open(tmp, "w", encoding="utf-8") as salida:
+                salida.write('{"data": [')
+                for n, fila in enumerate(filas):
+                    self._revisar(job, archivo=n % _REVISAR_ARCHIVO_CADA == 0)
+                    if n:
+                        salida.write(",")
+                    json.dump(fila, salida, ensure_ascii=False, default=str)
+                    job.filas = n + 1
+                salida.write(f'], "total_records": {job.filas}}}')
+            self._revisar(job, archivo=True)
+            os.replace(tmp, self._ruta(job.id, ".json"))
+            self._terminar(job, EstadoJob.COMPLETADO)
+        except _Cancelado:
+            self._terminar(job, EstadoJob.CANCELADO)
+        except DomainError as e:
+            self._terminar(job, EstadoJob.FALLIDO, str(e))
+        except Exception:
+            logger.exception(f"Error en el trabajo {job.tipo} {job.id}")
+            self._terminar(job, EstadoJob.FALLIDO, "Error interno al generar el resultado")
+        finally:
+            # Cierra el generador: libera las sesiones que tenga abiertas
+            close = getattr(filas, "close", None)
+            if close is not None:
+                close()
+            tmp.unlink(missing_ok=True)
+
+
+job_runner = JobRunner(
+    settings.jobs_dir, settings.JOBS_MAX_WORKERS, settings.JOBS_MAX_PENDIENTES, settings.JOBS_RESULT_TTL_SECONDS,
+)
+
+
+def job_data(job: Job) -> Dict[str, Any]:
+    """Representación pública de un trabajo."""
+    return {
+        "id": job.id,
+        "tipo": job.tipo,
+        "estado": job.estado.value,
+        "creado": job.creado,
+        "iniciado": job.iniciado,
+        "terminado": job.terminado,
+        "filas": job.filas,
+        "error": job.error,
+        "expira": job.terminado + job_runner.ttl if job.terminado else None,
+        "resultado_url": f"/api/jobs/{job.id}/resultado" if job.estado is EstadoJob.COMPLETADO else None,
+    }
+
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", status_code=status.HTTP_200_OK)
+def get_job(job_id: str):
+    job = job_runner.get(job_id)
+    if job is None:
+        return error_response(message="Trabajo no encontrado o expirado", status_code=status.HTTP_404_NOT_FOUND)
+    return success_response(data=job_data(job), message="Estado del trabajo obtenido correctamente")
+
+
+@router.get("/{job_id}/resultado", status_code=status.HTTP_200_OK)
+def descargar_resultado(job_id: str):
+    job = job_runner.get(job_id)
+    if job is None:
+        return error_response(message="Trabajo no encontrado o expirado", status_code=status.HTTP_404_NOT_FOUND)
+    ruta = job_runner.resultado(job)
+    if ruta is None:
+        return error_response(
+            message=f"El trabajo no tiene resultado: estado {job.estado.value}",
+            status_code=status.HTTP_409_CONFLICT,
+        )
+    return FileResponse(ruta, media_type="application/json", filename=f"{job.tipo}_{job.id}.json")
+
+
+@router.delete("/{job_id}", status_code=status.HTTP_200_OK)
+def cancelar_job(job_id: str):
+    job = job_runner.cancel(job_id)
+    if job is None:
+        return error_response(message="Trabajo no encontrado o expirado", status_code=status.HTTP_404_NOT_FOUND)
+    message = "Cancelación solicitada" if not job.terminal else f"El trabajo ya está {job.estado.value}"
+    return success_response(data=job_data(job), message=message)
+
+
+def configure_jobs(app: FastAPI) -> None:
+    """Expone /api/jobs, purga resultados vencidos al arrancar y detiene el pool al apagar."""
+    app.include_router(router, prefix="/api/jobs", tags=["Trabajos"])
+    app.add_event_handler("startup", lambda: job_runner.purgar(forzar=True))
+    app.add_event_handler("shutdown", job_runner.shutdown)
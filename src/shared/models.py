@@ -16,7 +16,8 @@ from src.modules.auth_service.src.infrastructure.db.models import (
 )
 
 #Modelo de Control Tara
-from src.modules.lineas_entrada_salida_service.src.infrastructure.db.models import ControlTaraOrm, ControlMigaOrm
+from src.modules.lineas_entrada_salida_service.src.infrastructure.db.models import ControlTaraOrm, ControlMigaOrm, \
+    ResumenLineaDiarioOrm, ResumenLineaCursorOrm
 
 # Este archivo solo importa para registrar los modelos
 # Los microservicios NO deben importar desde aquí
@@ -0,0 +1,215 @@
+"""
+Enrutamiento de lecturas de la base principal hacia la réplica.
+
+- `RoutingSession` elige el engine de cada sentencia en `get_bind`: los SELECT
+  hechos dentro de un método de lectura (`get_*`/`count_*`) de un repositorio
+  marcado con `lecturas_en_replica` van a la réplica; flush, INSERT/UPDATE/DELETE
+  y todo lo demás van a la primaria.
+- Read-your-writes: la primera escritura de la sesión la fija a la primaria
+  por el resto de la petición, y `ReadReplicaMiddleware` deja una cookie para
+  que las peticiones del mismo cliente en los siguientes
+  `REPLICA_STICKY_SECONDS` también lean de la primaria. Las peticiones
+  PUT/PATCH/DELETE leen siempre de la primaria: lo que leen alimenta la
+  escritura (valores previos para auditoría y el resumen de líneas).
+- Si la réplica no acepta la conexión se marca caída por
+  `REPLICA_RETRY_SECONDS` y las lecturas vuelven a la primaria.
+- La caché de totales (`count_cache`) solo guarda COUNT hechos en la
+  primaria: con `lee_de_replica` los que irían a la réplica se calculan sin
+  pasar por ella, así un total atrasado no se sirve a quien acaba de escribir.
+"""
+import functools
+import inspect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import Iterator, Optional
+
+from fastapi import FastAPI
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_COOKIE = "leer_primaria"
+_METODOS_PRIMARIA = {"PUT", "PATCH", "DELETE"}
+_PREFIJOS_LECTURA = ("get_", "count_")
+
+# Claves en Session.info
+_MODO = "replica_modo"
+_ESCRIBIO = "replica_escribio"
+_CONECTADA = "replica_conectada"
+
+
+class _EstadoPeticion:
+    """Estado de read-your-writes de la petición; lo comparten los hilos de sus dependencias."""
+
+    __slots__ = ("leer_primaria", "escribio")
+
+    def __init__(self, leer_primaria: bool):
+        self.leer_primaria = leer_primaria
+        self.escribio = False
+
+
+_peticion: ContextVar[Optional[_EstadoPeticion]] = ContextVar("replica_peticion", default=None)
+
+
+class _SaludReplica:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._caida_hasta = 0.0
+
+    def disponible(self) -> bool:
+        return time.monotonic() >= self._caida_hasta
+
+    def marcar_caida(self) -> None:
+        with self._lock:
+            self._caida_hasta = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+
+
+_salud = _SaludReplica()
+
+
+class RoutingSession(Session):
+    """Sesión de la base principal que envía a la réplica las lecturas de repositorio."""
+
+    def __init__(self, *args, replica: Optional[Engine] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        primaria = super().get_bind(mapper, clause=clause, **kwargs)
+        if self.replica is None:
+            return primaria
+        if self._flushing or getattr(clause, "is_dml", False):
+            self._marcar_escritura()
+            return primaria
+        if getattr(clause, "is_select", False) and self._leer_replica():
+            return self.replica
+        return primaria
+
+    def _marcar_escritura(self) -> None:
+        self.info[_ESCRIBIO] = True
+        estado = _peticion.get()
+        if estado is not None:
+            estado.escribio = True
+
+    def _leer_replica(self) -> bool:
+        if self.info.get(_MODO) != "replica" or self.info.get(_ESCRIBIO):
+            return False
+        estado = _peticion.get()
+        if estado is not None and estado.leer_primaria:
+            return False
+        return self._replica_disponible()
+
+    def _replica_disponible(self) -> bool:
+        if self.info.get(_CONECTADA):
+            return True
+        if not _salud.disponible():
+            return False
+        try:
+            # Abre la conexión de la réplica dentro de la transacción de la sesión
+            self.connection(bind_arguments={"bind": self.replica})
+        except SQLAlchemyError:
+            _salud.marcar_caida()
+            logger.warning("Réplica de lectura no disponible; se lee de la primaria", exc_info=True)
+            return False
+        self.info[_CONECTADA] = True
+        return True
+
+
+def lee_de_replica(db: Session) -> bool:
+    """Indica si un SELECT hecho ahora con `db` iría a la réplica."""
+    return isinstance(db, RoutingSession) and db.replica is not None and db._leer_replica()
+
+
+@contextmanager
+def _modo(db: Session, modo: str) -> Iterator[None]:
+    # Decide el método más externo: un get_by_id llamado desde update lee de la primaria
+    if not isinstance(db, RoutingSession) or db.info.get(_MODO) is not None:
+        yield
+        return
+    db.info[_MODO] = modo
+    try:
+        yield
+    finally:
+        db.info.pop(_MODO, None)
+
+
+def _enrutar(metodo, modo: str):
+    @functools.wraps(metodo)
+    def wrapper(self, *args, **kwargs):
+        with _modo(self.db, modo):
+            return metodo(self, *args, **kwargs)
+    return wrapper
+
+
+def lecturas_en_replica(cls):
+    """
+    Decorador de repositorios de la base principal (sesión en `self.db`): sus
+    métodos get_*/count_* leen de la réplica y el resto de la primaria.
+    """
+    for name, metodo in inspect.getmembers(cls, inspect.isfunction):
+        if name.startswith("_"):
+            continue
+        modo = "replica" if name.startswith(_PREFIJOS_LECTURA) else "primaria"
+        setattr(cls, name, _enrutar(metodo, modo))
+    return cls
+
+
+class ReadReplicaMiddleware:
+    """Middleware ASGI de read-your-writes entre peticiones (cookie `leer_primaria`)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        estado = _EstadoPeticion(scope["method"] in _METODOS_PRIMARIA or _cookie_vigente(scope))
+        token = _peticion.set(estado)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and estado.escribio:
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", _set_cookie().encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _peticion.reset(token)
+
+
+def _cookie_vigente(scope) -> bool:
+    for name, value in scope.get("headers", []):
+        if name != b"cookie":
+            continue
+        morsel = SimpleCookie(value.decode("latin-1")).get(_COOKIE)
+        if morsel is None:
+            return False
+        try:
+            return float(morsel.value) > time.time()
+        except ValueError:
+            return False
+    return False
+
+
+def _set_cookie() -> str:
+    sticky = settings.REPLICA_STICKY_SECONDS
+    return f"{_COOKIE}={time.time() + sticky:.0f}; Max-Age={sticky}; Path=/; HttpOnly; SameSite=Lax"
+
+
+def configure_read_replica(app: FastAPI, replica: Optional[Engine]) -> None:
+    """Registra el middleware de read-your-writes cuando hay réplica configurada."""
+    if replica is None:
+        return
+    app.add_middleware(ReadReplicaMiddleware)
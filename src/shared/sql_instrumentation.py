@@ -0,0 +1,168 @@
+"""
+Instrumentación SQL por petición.
+
+Los hooks `before_cursor_execute`/`after_cursor_execute` de cada engine
+acumulan, para la petición en curso, el número de consultas, el tiempo total
+en BD y la sentencia más lenta. Un middleware ASGI abre el contexto de la
+petición, agrega el header `Server-Timing` y registra advertencias cuando se
+supera el presupuesto de consultas o una misma sentencia se repite demasiado
+(patrón N+1).
+"""
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+
+logger = logging.getLogger("sql.instrumentation")
+slow_query_logger = logging.getLogger("sql.slow_query")
+
+_PARAM_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class RequestSqlStats:
+    """Estadísticas SQL acumuladas durante una petición."""
+
+    __slots__ = ("query_count", "db_time", "per_engine", "slowest_time", "slowest_statement", "statements")
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.per_engine: Dict[str, list] = {}
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: Counter = Counter()
+
+    def record(self, engine_name: str, statement: str, elapsed: float) -> None:
+        self.query_count += 1
+        self.db_time += elapsed
+        engine_stats = self.per_engine.get(engine_name)
+        if engine_stats is None:
+            self.per_engine[engine_name] = [1, elapsed]
+        else:
+            engine_stats[0] += 1
+            engine_stats[1] += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+        self.statements[statement] += 1
+
+    def repeated_shapes(self, threshold: int) -> Dict[str, int]:
+        """Sentencias (normalizadas) ejecutadas más de `threshold` veces."""
+        shapes: Counter = Counter()
+        for statement, count in self.statements.items():
+            shapes[statement_shape(statement)] += count
+        return {shape: count for shape, count in shapes.items() if count > threshold}
+
+
+_current_stats: ContextVar[Optional[RequestSqlStats]] = ContextVar("request_sql_stats", default=None)
+
+
+def current_sql_stats() -> Optional[RequestSqlStats]:
+    return _current_stats.get()
+
+
+def statement_shape(statement: str) -> str:
+    """Normaliza una sentencia: colapsa listas de parámetros (?, ?, ...) y espacios."""
+    shape = _PARAM_LIST_RE.sub("(?)", statement)
+    return _WHITESPACE_RE.sub(" ", shape).strip()
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Registra los hooks de cursor sobre un engine."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_stats.get() is not None:
+            conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current_stats.get()
+        if stats is None:
+            return
+        start_times = conn.info.get("query_start_time")
+        if not start_times:
+            return
+        elapsed = time.perf_counter() - start_times.pop()
+        stats.record(name, statement, elapsed)
+
+        if elapsed * 1000 >= settings.SQL_SLOW_QUERY_MS:
+            slow_query_logger.warning(json.dumps({
+                "event": "slow_query",
+                "engine": name,
+                "duration_ms": round(elapsed * 1000, 2),
+                "statement": statement_shape(statement),
+                "executemany": executemany,
+            }, ensure_ascii=False))
+
+
+class SqlInstrumentationMiddleware:
+    """Middleware ASGI que abre el contexto SQL de la petición y agrega `Server-Timing`."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSqlStats()
+        token = _current_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and stats.query_count:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(stats).encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
+            _report(scope, stats)
+
+
+def _server_timing(stats: RequestSqlStats) -> str:
+    parts = [f'db;dur={stats.db_time * 1000:.2f};desc="{stats.query_count} queries"']
+    for name, (count, elapsed) in stats.per_engine.items():
+        parts.append(f'db-{name};dur={elapsed * 1000:.2f};desc="{count} queries"')
+    if stats.slowest_statement is not None:
+        parts.append(f"db-slowest;dur={stats.slowest_time * 1000:.2f}")
+    return ", ".join(parts)
+
+
+def _report(scope, stats: RequestSqlStats) -> None:
+    if not stats.query_count:
+        return
+    route = scope.get("route")
+    endpoint = f"{scope.get('method')} {getattr(route, 'path', scope.get('path'))}"
+
+    if stats.query_count > settings.SQL_QUERY_BUDGET:
+        logger.warning(
+            "%s ejecutó %d consultas (presupuesto %d, %.2f ms en BD)",
+            endpoint, stats.query_count, settings.SQL_QUERY_BUDGET, stats.db_time * 1000,
+        )
+
+    for shape, count in stats.repeated_shapes(settings.SQL_NPLUSONE_THRESHOLD).items():
+        logger.warning("Posible N+1 en %s: %d ejecuciones de %s", endpoint, count, shape)
+
+
+def configure_sql_instrumentation(app: FastAPI, engines: Dict[str, Engine]) -> None:
+    """Instala los hooks en los engines y el middleware en la aplicación."""
+    if not settings.SQL_INSTRUMENTATION_ENABLED:
+        return
+    for name, engine in engines.items():
+        instrument_engine(engine, name)
+    app.add_middleware(SqlInstrumentationMiddleware)